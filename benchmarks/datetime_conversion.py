@@ -0,0 +1,82 @@
+"""Benchmark the conversion of date-time strings to MySQL literals.
+
+Compares the path before `DatetimeConverter`, where the SDK parses each
+value with dateutil and the datetime is formatted when the batch is
+written, with the converter, cached and uncached. Values are drawn from
+a pool of distinct timestamps, so the smaller the pool, the more they
+repeat, as with daily partitions or `updated_at` buckets.
+
+Usage:
+    python benchmarks/datetime_conversion.py [--values N] [--distinct N ...]
+        [--time-zone ZONE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import random
+import time
+import typing as t
+
+from dateutil import parser
+
+from target_mysql.datetimes import DEFAULT_DATETIME_CACHE_SIZE, DatetimeConverter, get_time_zone
+from target_mysql.load_data import format_field
+
+
+def make_values(count: int, distinct: int) -> t.List[str]:
+    """Return `count` ISO-8601 strings drawn from `distinct` timestamps."""
+    started_at = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+    pool = [
+        (started_at + datetime.timedelta(seconds=17 * i)).isoformat().replace("+00:00", "Z")
+        for i in range(distinct)
+    ]
+    random.seed(0)
+    return [random.choice(pool) for _ in range(count)]
+
+
+def dateutil_path(values: t.List[str]) -> t.List[str]:
+    return [format_field(parser.parse(value)) for value in values]
+
+
+def converter_path(converter: DatetimeConverter) -> t.Callable[[t.List[str]], t.List[str]]:
+    def convert(values: t.List[str]) -> t.List[str]:
+        return [converter.to_literal("date-time", value) for value in values]
+    return convert
+
+
+def measure(function: t.Callable[[t.List[str]], t.List[str]], values: t.List[str]) -> float:
+    """Return the values converted per second."""
+    started_at = time.perf_counter()
+    function(values)
+    return len(values) / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--values", type=int, default=200000, help="Values converted per run")
+    arg_parser.add_argument(
+        "--distinct", type=int, nargs="+", default=[24, 1000, 200000],
+        help="Distinct timestamps among the values, one run each",
+    )
+    arg_parser.add_argument("--time-zone", help="Zone to convert to, as datetime_time_zone")
+    args = arg_parser.parse_args()
+    zone = get_time_zone(args.time_zone)
+
+    print(f"{'distinct':>10}{'dateutil/s':>14}{'uncached/s':>14}{'cached/s':>14}{'speedup':>10}")
+    for distinct in args.distinct:
+        values = make_values(args.values, distinct)
+        baseline = measure(dateutil_path, values)
+        uncached = measure(converter_path(DatetimeConverter(zone, cache_size=0)), values)
+        cached = measure(
+            converter_path(DatetimeConverter(zone, DEFAULT_DATETIME_CACHE_SIZE)), values
+        )
+        print(
+            f"{distinct:>10}{baseline:>14.0f}{uncached:>14.0f}{cached:>14.0f}"
+            f"{cached / baseline:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
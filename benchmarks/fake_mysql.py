@@ -0,0 +1,301 @@
+"""In-process stand-in for a MySQL server, exposed as a DBAPI module.
+
+Registers the ``mysql+fake`` SQLAlchemy dialect. The fake answers the
+queries the target makes (server variables, information_schema), keeps
+the tables it creates and alters, and counts the statements and rows it
+receives. Parameters are not formatted into the statements and nothing is
+stored, so a benchmark spends its time in the target rather than in here.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import typing as t
+
+from sqlalchemy.dialects import registry
+from sqlalchemy.dialects.mysql.mysqldb import MySQLDialect_mysqldb
+
+apilevel = "2.0"
+threadsafety = 1
+paramstyle = "format"
+
+
+class Error(Exception):
+    pass
+
+
+class Warning(Exception):  # noqa: A001
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE (?:IF NOT EXISTS )?(\S+)\s*(.*)$", re.S | re.I)
+_ALTER_TABLE = re.compile(r"ALTER TABLE (\S+)\s+(.*)$", re.S | re.I)
+_INTO_TABLE = re.compile(r"(?:INTO|INTO TABLE)\s+(\S+)", re.I)
+
+
+class FakeServer:
+    """Tables, server variables and statement counts of the fake server."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.variables: t.Dict[str, t.Any] = {
+            "version": "8.0.34",
+            "sql_mode": "",
+            "lower_case_table_names": 0,
+            "transaction_isolation": "REPEATABLE-READ",
+            "max_allowed_packet": 67108864,
+            "local_infile": 1,
+        }
+        # Table name -> column name -> column type.
+        self.tables: t.Dict[str, t.Dict[str, str]] = {}
+        # Tables with a primary or unique key.
+        self.keyed_tables: t.Set[str] = set()
+        self.statements = 0
+        self.rows = 0
+        self.commits = 0
+
+    def reset(self) -> None:
+        """Drop all tables and zero the counters."""
+        self.__init__()
+
+
+server = FakeServer()
+
+
+def _table_key(name: str) -> str:
+    return name.split(".")[-1].strip("`").lower()
+
+
+def _split_top_level(text: str) -> t.List[str]:
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _column_type(definition: str) -> str:
+    for word in (" NOT NULL", " NULL", " AUTO_INCREMENT"):
+        definition = definition.split(word)[0]
+    return definition.strip().lower()
+
+
+class Cursor:
+    def __init__(self, connection: "Connection") -> None:
+        self.connection = connection
+        self.description: t.Optional[list] = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self.arraysize = 1
+        self._rows: t.List[tuple] = []
+
+    def close(self) -> None:
+        pass
+
+    def _result(self, names: t.List[str], rows: t.List[tuple]) -> None:
+        self.description = [(name, 253, None, None, None, None, True) for name in names]
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+
+    def execute(self, statement: str, parameters: t.Any = None) -> int:
+        return self._run(statement, parameters, 1)
+
+    def executemany(self, statement: str, seq_of_parameters: t.Sequence[t.Any]) -> int:
+        return self._run(statement, None, len(seq_of_parameters))
+
+    def fetchone(self) -> t.Optional[tuple]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> t.List[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size: t.Optional[int] = None) -> t.List[tuple]:
+        size = size or self.arraysize
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def _run(self, statement: str, parameters: t.Any, row_count: int) -> int:  # noqa: C901
+        srv = server
+        sql = statement.strip()
+        head = sql[:30].upper()
+        self.description = None
+        self._rows = []
+        self.rowcount = 0
+        with srv.lock:
+            srv.statements += 1
+
+        if head.startswith(("INSERT", "REPLACE")):
+            if row_count == 1 and parameters is None and " VALUES " in sql.upper():
+                # A multi-row INSERT: count its value groups roughly.
+                row_count = sql.count("),(") + 1
+            with srv.lock:
+                srv.rows += row_count
+            self.rowcount = row_count
+        elif head.startswith("LOAD DATA"):
+            if not int(srv.variables.get("local_infile") or 0):
+                raise OperationalError(3948, "Loading local data is disabled")
+            path = re.search(r"INFILE '([^']*)'", sql).group(1)
+            with open(path, encoding="utf-8") as f:
+                row_count = sum(1 for _ in f)
+            with srv.lock:
+                srv.rows += row_count
+            self.rowcount = row_count
+        elif head.startswith("SELECT @@"):
+            names = [name.strip() for name in sql[7:].split(",")]
+            values = tuple(
+                srv.variables.get(name.lstrip("@").split(".")[-1].lower()) for name in names
+            )
+            self._result(names, [values])
+        elif head.startswith("SELECT VERSION()"):
+            self._result(["v"], [(srv.variables["version"],)])
+        elif head.startswith("SELECT DATABASE()"):
+            self._result(["d"], [(self.connection.db,)])
+        elif head.startswith("SHOW COLLATION"):
+            self._result(["Collation", "Charset"], [("utf8mb4_bin", "utf8mb4")])
+        elif "INFORMATION_SCHEMA.TABLES" in sql.upper():
+            table_name = _table_key(parameters[-1]) if parameters else None
+            self._result(["c"], [(int(table_name in srv.tables),)])
+        elif "INFORMATION_SCHEMA.STATISTICS" in sql.upper():
+            table_name = _table_key(parameters[-1]) if parameters else None
+            self._result(["c"], [(int(table_name in srv.keyed_tables),)])
+        elif "INFORMATION_SCHEMA.COLUMNS" in sql.upper():
+            table_name = _table_key(parameters[-1]) if parameters else None
+            columns = srv.tables.get(table_name, {})
+            self._result(
+                ["TABLE_NAME", "COLUMN_NAME", "COLUMN_TYPE", "IS_NULLABLE"],
+                [(table_name, name, column_type, "YES") for name, column_type in columns.items()],
+            )
+        elif head.startswith("CREATE TABLE"):
+            match = _CREATE_TABLE.match(sql)
+            key, body = _table_key(match.group(1)), match.group(2)
+            keyed = False
+            if body.upper().startswith("LIKE"):
+                like = _table_key(body.split()[1])
+                columns = dict(srv.tables[like])
+                keyed = like in srv.keyed_tables
+            else:
+                columns = {}
+                for part in _split_top_level(body[body.index("(") + 1: body.rindex(")")]):
+                    if part.upper().startswith(("PRIMARY KEY", "UNIQUE")):
+                        keyed = True
+                    if part.upper().startswith(("PRIMARY KEY", "UNIQUE", "KEY", "INDEX")):
+                        continue
+                    name, _, definition = part.partition(" ")
+                    columns[name.strip("`")] = _column_type(definition)
+            with srv.lock:
+                if key not in srv.tables and keyed:
+                    srv.keyed_tables.add(key)
+                srv.tables.setdefault(key, columns)
+        elif head.startswith("DROP TABLE"):
+            with srv.lock:
+                srv.tables.pop(_table_key(sql.split()[-1]), None)
+                srv.keyed_tables.discard(_table_key(sql.split()[-1]))
+        elif head.startswith("ALTER TABLE"):
+            match = _ALTER_TABLE.match(sql)
+            columns = srv.tables[_table_key(match.group(1))]
+            for clause in _split_top_level(match.group(2)):
+                words = clause.split()
+                if words[0].upper() in ("ADD", "MODIFY"):
+                    if words[1].upper() == "COLUMN":
+                        words = words[1:]
+                    columns[words[1].strip("`")] = _column_type(" ".join(words[2:]))
+        elif head.startswith("COMMIT"):
+            with srv.lock:
+                srv.commits += 1
+        # SET, ROLLBACK, SAVEPOINT and anything else are accepted silently.
+        return self.rowcount
+
+
+class Connection:
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        self.db = kwargs.get("db") or kwargs.get("database")
+
+    def cursor(self, *args: t.Any, **kwargs: t.Any) -> Cursor:
+        return Cursor(self)
+
+    def commit(self) -> None:
+        with server.lock:
+            server.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def ping(self, *args: t.Any) -> bool:
+        return True
+
+    def autocommit(self, value: bool) -> None:
+        pass
+
+    def character_set_name(self) -> str:
+        return "utf8mb4"
+
+    def get_server_info(self) -> str:
+        return server.variables["version"]
+
+
+def connect(*args: t.Any, **kwargs: t.Any) -> Connection:
+    return Connection(*args, **kwargs)
+
+
+class FakeMySQLDialect(MySQLDialect_mysqldb):
+    """SQLAlchemy dialect that talks to the in-process fake server."""
+
+    driver = "fake"
+    supports_statement_cache = True
+    supports_server_side_cursors = False
+
+    @classmethod
+    def dbapi(cls):
+        return sys.modules[__name__]
+
+    def _found_rows_client_flag(self):
+        return None
+
+
+registry.register("mysql.fake", __name__, "FakeMySQLDialect")
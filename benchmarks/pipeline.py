@@ -0,0 +1,80 @@
+"""Benchmark the overlap gained by prefetching statement batches.
+
+Builds rows for a wide, JSON-heavy schema with the real record projection and
+"executes" each batch with a sleep proportional to its size, standing in for
+the time the connection waits on MySQL (the driver releases the GIL there).
+Compares the serial loop with `prefetch` at a few depths.
+
+Usage:
+    python benchmarks/pipeline.py [--records N] [--columns N] [--batch-size N]
+"""
+
+import argparse
+import time
+
+from target_mysql.json_engine import get_json_engine
+from target_mysql.pipeline import prefetch
+from target_mysql.projection import RecordProjection
+
+
+def make_records(count: int, columns: int) -> list:
+    """Return records with `columns` properties, half of them nested objects."""
+    records = []
+    for i in range(count):
+        record = {}
+        for c in range(columns):
+            if c % 2:
+                record[f"col_{c}"] = {"id": i, "tags": ["a", "b", str(c)], "meta": {"n": c}}
+            else:
+                record[f"col_{c}"] = f"value {i} {c}"
+        records.append(record)
+    return records
+
+
+def make_projection(columns: int) -> RecordProjection:
+    names = [f"col_{c}" for c in range(columns)]
+    encode_json = get_json_engine("stdlib").encode_json
+    converters = [(c, encode_json) for c in range(1, columns, 2)]
+    return RecordProjection(names, names, converters)
+
+
+def batches(projection: RecordProjection, records: list, batch_size: int):
+    for i in range(0, len(records), batch_size):
+        yield projection.project_all(records[i:i + batch_size])
+
+
+def run(statements, seconds_per_row: float) -> float:
+    started_at = time.perf_counter()
+    for rows in statements:
+        time.sleep(len(rows) * seconds_per_row)
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=60)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    records = make_records(args.records, args.columns)
+    projection = make_projection(args.columns)
+
+    started_at = time.perf_counter()
+    for _ in batches(projection, records, args.batch_size):
+        pass
+    build_time = time.perf_counter() - started_at
+    # Make the simulated database time comparable to the serialization time.
+    seconds_per_row = build_time / args.records
+
+    print(f"{args.records} records x {args.columns} columns, batches of {args.batch_size}")
+    print(f"serialization only: {build_time:.3f}s")
+    serial = run(batches(projection, records, args.batch_size), seconds_per_row)
+    print(f"serial:             {serial:.3f}s")
+    for depth in (1, 2, 4):
+        elapsed = run(prefetch(batches(projection, records, args.batch_size), depth), seconds_per_row)
+        print(f"prefetch depth {depth}:   {elapsed:.3f}s ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
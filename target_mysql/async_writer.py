@@ -0,0 +1,311 @@
+"""INSERT batches written on an asyncio event loop through an async MySQL driver."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import threading
+import time
+import typing as t
+
+from sqlalchemy.engine import make_url
+
+from target_mysql.metrics import StreamMetrics
+from target_mysql.retry import TRANSIENT_ERRORS, RetryPolicy
+
+try:
+    import asyncmy
+except ImportError:  # pragma: no cover - depends on the environment
+    asyncmy = None
+
+try:
+    import aiomysql
+except ImportError:  # pragma: no cover - depends on the environment
+    aiomysql = None
+
+WRITE_ENGINES = ("sync", "async")
+ASYNC_DRIVERS = ("auto", "asyncmy", "aiomysql")
+DEFAULT_ASYNC_POOL_SIZE = 4
+DEFAULT_ASYNC_MAX_IN_FLIGHT = 8
+
+
+def is_transient_driver_error(error: BaseException) -> bool:
+    """Return True if an error of an async driver may go away when the write is retried."""
+    if isinstance(error, (ConnectionError, asyncio.TimeoutError)):
+        return True
+    args = getattr(error, "args", ())
+    return bool(args) and args[0] in TRANSIENT_ERRORS
+
+
+class WriteJob(t.NamedTuple):
+    """The statement batches of one drain of a table, written in one transaction."""
+
+    table: str
+    batches: t.List[t.Any]  # StatementBatch, with a tuple or a list of tuples as params.
+    metrics: StreamMetrics
+    # Writes the batches with the synchronous engine, which isolates
+    # rejected rows, and returns the number of records committed.
+    fallback: t.Callable[[], int]
+
+
+class AsyncWriter:
+    """Keeps several drains' writes in flight over a small async connection pool.
+
+    The event loop runs on a thread of its own, so sinks submit jobs from
+    the threads that drain them and carry on reading input. Jobs of the
+    same table run one after another, in the order they were submitted;
+    jobs of different tables run concurrently, up to the pool size.
+    `submit` blocks while `max_in_flight` jobs are not finished.
+
+    A job is retried after transient errors, with the backoff of the retry
+    policy. After any other error its transaction is rolled back and it is
+    written again with the synchronous engine, which isolates the rows at
+    fault or raises. A job whose earlier job on the same table failed is
+    not run.
+    """
+
+    def __init__(
+            self,
+            connect_kwargs: t.Dict[str, t.Any],
+            driver: str = "auto",
+            pool_size: int = DEFAULT_ASYNC_POOL_SIZE,
+            max_in_flight: int = DEFAULT_ASYNC_MAX_IN_FLIGHT,
+            retry_policy: t.Optional[RetryPolicy] = None,
+            logger: t.Optional[logging.Logger] = None,
+            create_pool: t.Optional[t.Callable[..., t.Awaitable[t.Any]]] = None,
+    ) -> None:
+        """Start the event loop. The pool is opened by the first job.
+
+        Args:
+            connect_kwargs: Connection arguments of the pool: host, port,
+                user, password, database and optionally init_command.
+            driver: ``auto`` (asyncmy if installed, else aiomysql),
+                ``asyncmy`` or ``aiomysql``.
+            pool_size: Connections of the pool.
+            max_in_flight: Jobs submitted and not finished, at most.
+            retry_policy: Retries of transient errors.
+            logger: Where commits and retries are logged.
+            create_pool: Coroutine function that opens the pool, instead of
+                the driver's.
+
+        Raises:
+            ValueError: If the driver is unknown or not installed.
+        """
+        self.driver = self._resolve_driver(driver) if create_pool is None else "custom"
+        self.connect_kwargs = dict(connect_kwargs)
+        self.pool_size = max(1, pool_size)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.logger = logger or logging.getLogger(__name__)
+        self._create_pool = create_pool or self._create_driver_pool
+        self._pool: t.Any = None
+        self._pool_lock: t.Optional[asyncio.Lock] = None
+        self._in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+        # Futures of the jobs not waited for yet, per table.
+        self._futures: t.Dict[str, t.List[concurrent.futures.Future]] = {}
+        self._futures_lock = threading.Lock()
+        # Last job of each table; only used on the event loop thread.
+        self._tails: t.Dict[str, asyncio.Task] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="target-mysql-async-writer", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _resolve_driver(driver: str) -> str:
+        driver = driver or "auto"
+        if driver not in ASYNC_DRIVERS:
+            raise ValueError(f"Unknown async_driver '{driver}', expected one of {ASYNC_DRIVERS}")
+        installed = {"asyncmy": asyncmy is not None, "aiomysql": aiomysql is not None}
+        if driver == "auto":
+            driver = next((name for name, found in installed.items() if found), None)
+            if driver is None:
+                raise ValueError("write_engine 'async' requires the asyncmy or aiomysql package")
+        elif not installed[driver]:
+            raise ValueError(f"async_driver '{driver}' requires the {driver} package")
+        return driver
+
+    async def _create_driver_pool(self, **kwargs: t.Any) -> t.Any:
+        kwargs = dict(kwargs)
+        if self.driver == "asyncmy":
+            return await asyncmy.create_pool(**kwargs)
+        kwargs["db"] = kwargs.pop("database", None)
+        return await aiomysql.create_pool(**kwargs)
+
+    def submit(self, job: WriteJob) -> concurrent.futures.Future:
+        """Queue a job after the earlier jobs of its table.
+
+        Returns:
+            A future of the number of records the job committed.
+        """
+        self._in_flight.acquire()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._futures_lock:
+            self._futures.setdefault(job.table, []).append(future)
+        # Callbacks run in the order they are scheduled, so jobs are chained in submit order.
+        self._loop.call_soon_threadsafe(self._chain, job, future)
+        return future
+
+    def _chain(self, job: WriteJob, future: concurrent.futures.Future) -> None:
+        previous = self._tails.get(job.table)
+        self._tails[job.table] = self._loop.create_task(self._run(job, future, previous))
+
+    async def _run(
+            self,
+            job: WriteJob,
+            future: concurrent.futures.Future,
+            previous: t.Optional[asyncio.Task],
+    ) -> bool:
+        try:
+            if previous is not None and not await previous:
+                raise RuntimeError(f"An earlier write to '{job.table}' failed")
+            future.set_result(await self._write(job))
+            return True
+        except BaseException as e:
+            # Raised to the thread that waits for the job.
+            future.set_exception(e)
+            return False
+        finally:
+            self._in_flight.release()
+
+    async def _open_pool(self) -> None:
+        # Jobs of several tables may start together; one of them opens the pool.
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await self._create_pool(
+                    minsize=1,
+                    maxsize=self.pool_size,
+                    autocommit=False,
+                    charset="utf8mb4",
+                    **self.connect_kwargs,
+                )
+
+    async def _write(self, job: WriteJob) -> int:
+        if self._pool is None:
+            await self._open_pool()
+        attempt = 0
+        while True:
+            try:
+                return await self._write_once(job)
+            except Exception as e:
+                attempt += 1
+                if is_transient_driver_error(e) and attempt <= self.retry_policy.max_retries:
+                    delay = self.retry_policy.delay(attempt)
+                    job.metrics.add_retry()
+                    self.logger.warning(
+                        f"Transient error writing to '{job.table}' ({e}), retrying in "
+                        f"{delay:.1f}s (retry {attempt}/{self.retry_policy.max_retries})"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if is_transient_driver_error(e):
+                    raise
+                self.logger.warning(
+                    f"Async write to '{job.table}' failed ({e}), "
+                    "writing its batches with the synchronous engine"
+                )
+                return await self._loop.run_in_executor(None, job.fallback)
+
+    async def _write_once(self, job: WriteJob) -> int:
+        async with self._pool.acquire() as connection:
+            try:
+                started_at = time.perf_counter()
+                async with connection.cursor() as cursor:
+                    for batch in job.batches:
+                        if isinstance(batch.params, list):
+                            await cursor.executemany(batch.statement, batch.params)
+                        else:
+                            await cursor.execute(batch.statement, batch.params)
+                executed_at = time.perf_counter()
+                await connection.commit()
+            except BaseException:
+                with contextlib.suppress(Exception):
+                    await connection.rollback()
+                raise
+        committed_at = time.perf_counter()
+
+        rows = sum(batch.row_count for batch in job.batches)
+        metrics = job.metrics
+        for batch in job.batches:
+            metrics.add_batch(batch.row_count)
+        metrics.add_time("execute", executed_at - started_at)
+        metrics.add_time("commit", committed_at - executed_at)
+        metrics.add_rows(rows, sum(batch.byte_count for batch in job.batches))
+        self.logger.info(
+            f"Committed {rows} records to '{job.table}' in {committed_at - started_at:.3f}s "
+            f"({self.driver} async write)"
+        )
+        return rows
+
+    def wait(self, table: t.Optional[str] = None) -> int:
+        """Wait for the jobs submitted so far, of one table or of all.
+
+        Returns:
+            The number of records they committed.
+
+        Raises:
+            Exception: The error of the first failed job, once all are done.
+        """
+        with self._futures_lock:
+            tables = [table] if table is not None else list(self._futures)
+            futures = [future for name in tables for future in self._futures.pop(name, [])]
+        concurrent.futures.wait(futures)
+        return sum(future.result() for future in futures)
+
+    def close(self) -> None:
+        """Wait for all jobs, then close the pool and stop the event loop."""
+        try:
+            self.wait()
+        finally:
+            if self._pool is not None:
+                asyncio.run_coroutine_threadsafe(self._close_pool(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    async def _close_pool(self) -> None:
+        self._pool.close()
+        await self._pool.wait_closed()
+
+
+def get_async_writer(
+        config: t.Mapping[str, t.Any],
+        sqlalchemy_url: t.Any,
+        logger: t.Optional[logging.Logger] = None,
+        session_statement: t.Optional[str] = None,
+) -> t.Optional[AsyncWriter]:
+    """Return the async writer of the `write_engine` setting, or None for ``sync``.
+
+    The pool connects to the server of the target's SQLAlchemy URL, and runs
+    `session_statement`, the ``SET SESSION`` statement of the session
+    profile, on each connection it opens.
+    """
+    engine = config.get("write_engine") or "sync"
+    if engine not in WRITE_ENGINES:
+        raise ValueError(f"Unknown write_engine '{engine}', expected one of {WRITE_ENGINES}")
+    if engine == "sync":
+        return None
+    url = make_url(sqlalchemy_url)
+    pool_size = config.get("async_pool_size")
+    max_in_flight = config.get("async_max_in_flight")
+    connect_kwargs = {
+        "host": url.host or "localhost",
+        "port": url.port or 3306,
+        "user": url.username,
+        "password": url.password or "",
+        "database": url.database,
+    }
+    if session_statement:
+        connect_kwargs["init_command"] = session_statement
+    return AsyncWriter(
+        connect_kwargs,
+        config.get("async_driver") or "auto",
+        DEFAULT_ASYNC_POOL_SIZE if pool_size is None else pool_size,
+        DEFAULT_ASYNC_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight,
+        RetryPolicy.from_config(config),
+        logger,
+    )
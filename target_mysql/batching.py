@@ -0,0 +1,81 @@
+"""Adaptive sizing of statement batches."""
+
+from __future__ import annotations
+
+import typing as t
+
+
+class AdaptiveBatchSize:
+    """Chooses the rows per statement batch from measured row width and latency.
+
+    After each executed batch, the smoothed bytes per row and seconds per row
+    give the number of rows that would take `target_seconds` to execute.
+    The size moves toward it by at most a factor of two per batch, and it
+    never exceeds `max_bytes` of row data, whatever the latency says.
+    """
+
+    def __init__(
+            self,
+            initial_size: int,
+            target_seconds: float = 1.0,
+            max_bytes: t.Optional[int] = None,
+            min_size: int = 1,
+            max_size: int = 100000,
+            smoothing: float = 0.5,
+    ) -> None:
+        """Initialize the batch size.
+
+        Args:
+            initial_size: Rows in the first batch, before anything is measured.
+            target_seconds: Execution time aimed at for each batch.
+            max_bytes: Upper bound of the row data in one batch, if any.
+            min_size: Smallest batch size.
+            max_size: Largest batch size.
+            smoothing: Weight of the newest measurement in the moving averages.
+        """
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.smoothing = smoothing
+        self.size = max(min_size, min(max_size, initial_size))
+        self.bytes_per_row: t.Optional[float] = None
+        self.seconds_per_row: t.Optional[float] = None
+
+    def _smooth(self, average: t.Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * average
+
+    def record(self, rows: int, byte_count: int, seconds: float) -> int:
+        """Account for an executed batch and return the next batch size.
+
+        Args:
+            rows: Rows in the batch.
+            byte_count: Estimated bytes of row data in the batch.
+            seconds: Time the batch took to execute.
+        """
+        if rows <= 0:
+            return self.size
+
+        self.bytes_per_row = self._smooth(self.bytes_per_row, byte_count / rows)
+        self.seconds_per_row = self._smooth(self.seconds_per_row, seconds / rows)
+
+        size = float(self.max_size)
+        if self.seconds_per_row > 0:
+            size = self.target_seconds / self.seconds_per_row
+        size = max(self.size / 2, min(self.size * 2, size))
+        if self.max_bytes and self.bytes_per_row > 0:
+            size = min(size, self.max_bytes / self.bytes_per_row)
+
+        self.size = int(max(self.min_size, min(self.max_size, size)))
+        return self.size
+
+    def describe(self) -> str:
+        """Describe the current size and the measurements behind it, for logging."""
+        if self.seconds_per_row is None:
+            return f"{self.size} rows"
+        return (
+            f"{self.size} rows (~{self.bytes_per_row:.0f} bytes/row, "
+            f"{self.seconds_per_row * self.size:.3f}s per batch)"
+        )
@@ -0,0 +1,110 @@
+"""A memory budget shared by all sinks, and compressed spill files."""
+
+from __future__ import annotations
+
+import collections
+import gzip
+import os
+import pickle
+import re
+import tempfile
+import threading
+import typing as t
+
+SPILL_COMPRESS_LEVEL = 1
+
+
+class MemoryBudget:
+    """Bytes of input buffered by each sink, against one limit for all of them.
+
+    Sizes are those of the JSON lines the records were read from. Parsed
+    records take a few times more memory, in proportion.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize an empty budget.
+
+        Args:
+            max_bytes: Limit of the bytes buffered by all sinks together.
+        """
+        self.max_bytes = max_bytes
+        self.total = 0
+        self._buffered: t.Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def exceeded(self) -> bool:
+        """Whether the sinks buffer more than `max_bytes`."""
+        return self.total > self.max_bytes
+
+    def add(self, stream_name: str, byte_count: int) -> None:
+        """Account for a record of `byte_count` bytes buffered by a sink."""
+        with self._lock:
+            self._buffered[stream_name] = self._buffered.get(stream_name, 0) + byte_count
+            self.total += byte_count
+
+    def release(self, stream_name: str) -> None:
+        """Account for a sink whose buffer was emptied."""
+        with self._lock:
+            self.total -= self._buffered.pop(stream_name, 0)
+
+    def largest(self) -> t.Optional[str]:
+        """Return the stream of the largest buffer, or None if nothing is buffered."""
+        with self._lock:
+            if not self._buffered:
+                return None
+            return max(self._buffered, key=self._buffered.__getitem__)
+
+    def buffered(self, stream_name: str) -> int:
+        """Return the bytes buffered by a sink."""
+        with self._lock:
+            return self._buffered.get(stream_name, 0)
+
+
+class SpillFiles:
+    """Batches of records moved out of memory to compressed files, oldest first.
+
+    Records are pickled, so they load back exactly as they were buffered,
+    with their Decimal and datetime values. Only files written by this
+    object are read back.
+    """
+
+    def __init__(self, directory: str, stream_name: str) -> None:
+        """Initialize the spill files of a stream.
+
+        Args:
+            directory: Directory of the files, created if missing.
+            stream_name: The stream, used in the file names.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = re.sub(r"[^\w.-]", "_", stream_name) + "-"
+        self._paths: t.Deque[str] = collections.deque()
+
+    def __len__(self) -> int:
+        """Return the number of batches spilled and not loaded yet."""
+        return len(self._paths)
+
+    def write(self, records: t.List[dict]) -> str:
+        """Write a batch of records to a new file and return its path."""
+        fd, path = tempfile.mkstemp(prefix=self.prefix, suffix=".pickle.gz", dir=self.directory)
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            fileobj=raw, mode="wb", compresslevel=SPILL_COMPRESS_LEVEL
+        ) as f:
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._paths.append(path)
+        return path
+
+    def read_batches(self) -> t.Iterator[t.List[dict]]:
+        """Yield the spilled batches in the order they were written.
+
+        A file is deleted once its batch has been handled, when the next one
+        is read.
+        """
+        while self._paths:
+            path = self._paths[0]
+            with gzip.open(path, "rb") as f:
+                records = pickle.load(f)
+            yield records
+            self._paths.popleft()
+            os.remove(path)
@@ -0,0 +1,150 @@
+"""In-memory catalog of table columns, reflected once per table."""
+
+from __future__ import annotations
+
+import re
+import threading
+import typing as t
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql.base import ischema_names
+
+_COLUMN_TYPE = re.compile(r"^(?P<name>\w+)(?:\((?P<args>.*)\))?(?P<flags>.*)$", re.S)
+_QUOTED_VALUE = re.compile(r"'((?:[^']|'')*)'")
+
+COLUMNS_QUERY = (
+    "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE "
+    "FROM information_schema.COLUMNS "
+    "WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s "
+    "ORDER BY ORDINAL_POSITION"
+)
+
+
+class CatalogColumn(t.NamedTuple):
+    """Name, type and nullability of a table column."""
+
+    name: str
+    type: sqlalchemy.types.TypeEngine
+    nullable: bool = True
+
+
+def parse_column_type(column_type: str) -> sqlalchemy.types.TypeEngine:
+    """Return the SQLAlchemy type of an information_schema COLUMN_TYPE.
+
+    Follows the MySQL dialect's reflection of SHOW CREATE TABLE, so types
+    compare the same as the SQL connector's reflected ones.
+
+    Args:
+        column_type: The column type, like ``varchar(255)`` or ``int unsigned``.
+    """
+    match = _COLUMN_TYPE.match(column_type.strip())
+    if not match:
+        return sqlalchemy.types.NullType()
+
+    type_class = ischema_names.get(match.group("name").lower())
+    if type_class is None:
+        return sqlalchemy.types.NullType()
+
+    args = match.group("args")
+    if not args:
+        type_args: t.List[t.Any] = []
+    elif args.startswith("'"):
+        type_args = [value.replace("''", "'") for value in _QUOTED_VALUE.findall(args)]
+    else:
+        type_args = [int(value) for value in re.findall(r"\d+", args)]
+
+    type_kw: t.Dict[str, t.Any] = {}
+    if issubclass(type_class, (mysql.DATETIME, mysql.TIME, mysql.TIMESTAMP)) and type_args:
+        type_kw["fsp"] = type_args.pop(0)
+    flags = match.group("flags").lower().split()
+    for flag in ("unsigned", "zerofill"):
+        if flag in flags:
+            type_kw[flag] = True
+
+    return type_class(*type_args, **type_kw)
+
+
+class TableCatalog:
+    """Columns of the tables the target writes to, kept in memory.
+
+    Each table is reflected with a single information_schema query the first
+    time it is looked up, missing tables included. The connector records its
+    own DDL in the catalog instead of reflecting again, so DDL issued by
+    other clients while the target runs is not seen.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty catalog."""
+        self._tables: t.Dict[t.Tuple[t.Optional[str], str], t.Optional[t.Dict[str, CatalogColumn]]] = {}
+        self._lock = threading.RLock()
+
+    def get_columns(
+            self,
+            connect: t.Callable[[], t.ContextManager[sqlalchemy.engine.Connection]],
+            schema_name: t.Optional[str],
+            table_name: str,
+    ) -> t.Optional[t.Dict[str, CatalogColumn]]:
+        """Return the columns of a table by name, or None if it doesn't exist.
+
+        Args:
+            connect: Opens a connection, used the first time the table is looked up.
+            schema_name: The database of the table, or None for the default one.
+            table_name: The table name.
+        """
+        key = (schema_name, table_name)
+        with self._lock:
+            if key in self._tables:
+                return self._tables[key]
+        # Tables of other streams are reflected concurrently; two threads may
+        # reflect the same table, and the first result is kept. So is DDL the
+        # connector recorded meanwhile.
+        columns = self._reflect(connect, schema_name, table_name)
+        with self._lock:
+            return self._tables.setdefault(key, columns)
+
+    def _reflect(
+            self,
+            connect: t.Callable[[], t.ContextManager[sqlalchemy.engine.Connection]],
+            schema_name: t.Optional[str],
+            table_name: str,
+    ) -> t.Optional[t.Dict[str, CatalogColumn]]:
+        with connect() as connection:
+            rows = connection.exec_driver_sql(COLUMNS_QUERY, (schema_name, table_name)).fetchall()
+        columns = {
+            column_name: CatalogColumn(
+                column_name,
+                parse_column_type(column_type),
+                is_nullable != "NO",
+            )
+            for found_table, column_name, column_type, is_nullable in rows
+            if found_table == table_name
+        }
+        return columns or None
+
+    def set_table(
+            self,
+            schema_name: t.Optional[str],
+            table_name: str,
+            columns: t.Iterable[CatalogColumn],
+    ) -> None:
+        """Record a table created by the target."""
+        with self._lock:
+            self._tables[(schema_name, table_name)] = {column.name: column for column in columns}
+
+    def set_column(
+            self,
+            schema_name: t.Optional[str],
+            table_name: str,
+            column: CatalogColumn,
+    ) -> None:
+        """Record a column added or altered by the target."""
+        with self._lock:
+            columns = self._tables.get((schema_name, table_name))
+            if columns is not None:
+                columns[column.name] = column
+
+    def forget(self, schema_name: t.Optional[str], table_name: str) -> None:
+        """Drop a table from the catalog, so it is reflected again on next use."""
+        with self._lock:
+            self._tables.pop((schema_name, table_name), None)
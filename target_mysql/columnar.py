@@ -0,0 +1,170 @@
+"""Columnar formatting of LOAD DATA batches, backed by pyarrow when it is installed."""
+
+from __future__ import annotations
+
+import datetime
+import typing as t
+
+import sqlalchemy
+from sqlalchemy.dialects import mysql
+
+from target_mysql.load_data import FIELD_SEPARATOR, LINE_SEPARATOR, NULL_FIELD, format_field
+from target_mysql.projection import RecordProjection
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pc = None
+
+BATCH_FORMATS = ("rows", "arrow")
+
+# Characters escaped in LOAD DATA fields, backslash first.
+_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"), ("\0", "\\0"))
+
+_NO_OFFSET = {None, datetime.timedelta(0)}
+
+
+def check_batch_format(name: t.Optional[str]) -> str:
+    """Return the `batch_format` setting, checked.
+
+    Raises:
+        ValueError: If the name is unknown, or ``arrow`` is requested but
+            pyarrow is not installed.
+    """
+    name = name or "rows"
+    if name not in BATCH_FORMATS:
+        raise ValueError(f"Unknown batch_format '{name}', expected one of {BATCH_FORMATS}")
+    if name == "arrow" and pa is None:
+        raise ValueError("batch_format 'arrow' requires the pyarrow package")
+    return name
+
+
+def _escape(strings: "pa.Array") -> "pa.Array":
+    for character, replacement in _ESCAPES:
+        strings = pc.replace_substring(strings, character, replacement)
+    return strings
+
+
+def _format_datetimes(values: t.List[t.Any]) -> "pa.Array":
+    # Values with a non-UTC offset keep their wall time in `format_field`,
+    # while Arrow would convert them to UTC.
+    if not set(map(datetime.datetime.utcoffset, filter(None, values))) <= _NO_OFFSET:
+        raise TypeError("datetimes with a UTC offset")
+    timestamps = pa.array(values, pa.timestamp("us"))
+    # isoformat leaves out a zero fraction.
+    return pc.replace_substring_regex(
+        pc.cast(timestamps, pa.string()), r"\.000000$", ""
+    )
+
+
+def _format_typed(sql_type: sqlalchemy.types.TypeEngine, values: t.List[t.Any]) -> "pa.Array":
+    """Format a column with Arrow, or raise if its values don't fit its type."""
+    if isinstance(sql_type, sqlalchemy.types.Boolean):
+        return pc.if_else(pa.array(values, pa.bool_()), "1", "0")
+    if isinstance(sql_type, sqlalchemy.types.Integer):
+        return pc.cast(pa.array(values, pa.int64()), pa.string())
+    if isinstance(sql_type, sqlalchemy.types.Float):
+        try:
+            numbers = pa.array(values, pa.float64())
+        except pa.ArrowException:
+            # The JSON reader parses non-integer numbers as Decimal, which
+            # Arrow only converts to its slow decimal type.
+            numbers = pa.array(
+                [None if value is None else float(value) for value in values], pa.float64()
+            )
+        return pc.cast(numbers, pa.string())
+    if isinstance(sql_type, (sqlalchemy.types.DateTime, sqlalchemy.types.Date, sqlalchemy.types.Time)):
+        try:
+            # Literals from the sink's DatetimeConverter.
+            return _escape(pa.array(values, pa.string()))
+        except pa.ArrowException:
+            pass
+    if isinstance(sql_type, sqlalchemy.types.DateTime):
+        return _format_datetimes(values)
+    if isinstance(sql_type, sqlalchemy.types.Date):
+        return pc.cast(pa.array(values, pa.date32()), pa.string())
+    if isinstance(sql_type, sqlalchemy.types.String):
+        return _escape(pa.array(values, pa.string()))
+    raise TypeError(f"no columnar format for {sql_type!r}")
+
+
+def format_column(
+        sql_type: sqlalchemy.types.TypeEngine,
+        values: t.List[t.Any],
+        convert: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+) -> t.Tuple["pa.Array", bool]:
+    """Format the values of a column as LOAD DATA fields.
+
+    Args:
+        sql_type: The column's SQL type, from `MySQLConnector.to_sql_type`.
+        values: The raw values of the column, one per record.
+        convert: The projection's converter of the column, if it has one.
+
+    Returns:
+        The fields as an Arrow string array, and whether it was vectorized.
+        Columns with a converter, of DECIMAL, JSON or BINARY type, or whose
+        values don't all fit their type are formatted cell by cell with
+        `format_field` instead.
+    """
+    if convert is None and not isinstance(sql_type, (mysql.JSON, mysql.BINARY)):
+        try:
+            return pc.fill_null(_format_typed(sql_type, values), NULL_FIELD), True
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            pass
+    if convert is not None:
+        values = [None if value is None else convert(value) for value in values]
+    return pa.array([format_field(value) for value in values], pa.string()), False
+
+
+def write_columns(
+        buffer: t.IO[str],
+        projection: RecordProjection,
+        sql_types: t.Sequence[sqlalchemy.types.TypeEngine],
+        records: t.Sequence[dict],
+) -> t.Tuple[int, int]:
+    """Write records to a tab separated buffer, a column at a time.
+
+    The buffer loads the same values as one written by `load_data.write_rows`
+    from the projected rows, except that values of FLOAT columns are rounded
+    to doubles first, and written as Arrow formats them (``3`` for ``3.0``).
+    DECIMAL columns stay exact.
+
+    Args:
+        buffer: Writable text buffer.
+        projection: The projection of the records onto the table columns.
+        sql_types: The SQL types of the columns, in projection order.
+        records: The raw records.
+
+    Returns:
+        The number of rows written, and of columns that were vectorized.
+
+    Raises:
+        TypeError: If a value can't be converted for its column.
+    """
+    if not records:
+        return 0, 0
+    converters = dict(projection.converters)
+    columns = []
+    vectorized = 0
+    for position, (property_name, sql_type) in enumerate(zip(projection.property_names, sql_types)):
+        values = [record.get(property_name) for record in records]
+        try:
+            fields, is_vectorized = format_column(sql_type, values, converters.get(position))
+        except TypeError as e:
+            raise TypeError(
+                f"Could not convert value for column "
+                f"{projection.column_names[position]}: {e}"
+            ) from e
+        columns.append(fields)
+        vectorized += is_vectorized
+
+    lines = pc.binary_join_element_wise(*columns, FIELD_SEPARATOR).cast(pa.large_string())
+    text = pc.binary_join(
+        pa.LargeListArray.from_arrays([0, len(lines)], lines),
+        pa.scalar(LINE_SEPARATOR, pa.large_string()),
+    )
+    buffer.write(text[0].as_py())
+    buffer.write(LINE_SEPARATOR)
+    return len(records), vectorized
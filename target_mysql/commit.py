@@ -0,0 +1,88 @@
+"""Commit policy for statements executed during a drain."""
+
+from __future__ import annotations
+
+import time
+import typing as t
+
+COMMIT_POLICIES = ("batch", "rows", "bytes", "seconds", "drain")
+
+# Interval used when `commit_interval` is not set, per policy.
+DEFAULT_COMMIT_INTERVALS = {
+    "rows": 10000,
+    "bytes": 16777216,
+    "seconds": 10,
+}
+
+
+class CommitPolicy:
+    """Decides when the rows written so far in a drain should be committed.
+
+    Policies:
+        batch: commit after every statement batch.
+        rows: commit once `interval` rows are pending.
+        bytes: commit once `interval` bytes of row data are pending.
+        seconds: commit once the open transaction is `interval` seconds old.
+        drain: commit once, at the end of the drain.
+    """
+
+    def __init__(self, policy: str = "batch", interval: float | None = None) -> None:
+        """Initialize the policy.
+
+        Args:
+            policy: One of `COMMIT_POLICIES`.
+            interval: The threshold of the `rows`, `bytes` and `seconds` policies.
+
+        Raises:
+            ValueError: If the policy is unknown or the interval is not positive.
+        """
+        if policy not in COMMIT_POLICIES:
+            raise ValueError(
+                f"Unknown commit policy '{policy}', expected one of {COMMIT_POLICIES}"
+            )
+        if interval is None:
+            interval = DEFAULT_COMMIT_INTERVALS.get(policy)
+        if interval is not None and interval <= 0:
+            raise ValueError(f"commit_interval must be positive, got {interval}")
+
+        self.policy = policy
+        self.interval = interval
+        self.pending_rows = 0
+        self.pending_bytes = 0
+        self.started_at = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config: t.Mapping[str, t.Any]) -> "CommitPolicy":
+        """Build the policy from the `commit_policy` and `commit_interval` settings."""
+        return cls(
+            config.get("commit_policy") or "batch",
+            config.get("commit_interval"),
+        )
+
+    @property
+    def tracks_bytes(self) -> bool:
+        """True if the policy needs the byte size of each batch."""
+        return self.policy == "bytes"
+
+    def add(self, rows: int, size: int = 0) -> None:
+        """Account for a batch written in the open transaction."""
+        self.pending_rows += rows
+        self.pending_bytes += size
+
+    def due(self) -> bool:
+        """Return True if the open transaction should be committed now."""
+        if self.policy == "batch":
+            return True
+        if self.policy == "rows":
+            return self.pending_rows >= self.interval
+        if self.policy == "bytes":
+            return self.pending_bytes >= self.interval
+        if self.policy == "seconds":
+            return time.monotonic() - self.started_at >= self.interval
+        return False
+
+    def reset(self) -> None:
+        """Start counting for a new transaction."""
+        self.pending_rows = 0
+        self.pending_bytes = 0
+        self.started_at = time.monotonic()
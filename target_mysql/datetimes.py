@@ -0,0 +1,120 @@
+"""Conversion of ISO-8601 date-time, date and time strings to MySQL literals."""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import sys
+import typing as t
+
+from dateutil import tz
+
+DATELIKE_TYPES = ("date-time", "date", "time")
+DEFAULT_DATETIME_CACHE_SIZE = 4096
+
+# datetime.fromisoformat only reads a "Z" suffix from Python 3.11 on.
+_READS_Z_SUFFIX = sys.version_info >= (3, 11)
+
+
+def _fromisoformat(value: str) -> datetime.datetime:
+    if not _READS_Z_SUFFIX and value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.datetime.fromisoformat(value)
+
+
+def _time_fromisoformat(value: str) -> datetime.time:
+    if not _READS_Z_SUFFIX and value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.time.fromisoformat(value)
+
+
+def get_time_zone(name: t.Optional[str]) -> t.Optional[datetime.tzinfo]:
+    """Return the zone of the `datetime_time_zone` setting, or None if it is unset.
+
+    Raises:
+        ValueError: If the zone is unknown.
+    """
+    if not name:
+        return None
+    zone = tz.UTC if name.upper() == "UTC" else tz.gettz(name)
+    if zone is None:
+        raise ValueError(f"Unknown datetime_time_zone '{name}'")
+    return zone
+
+
+class DatetimeConverter:
+    """Turns date-like strings into the literals MySQL reads for DATETIME, DATE and TIME.
+
+    Strings are parsed with `datetime.fromisoformat`, which reads the
+    ISO-8601 forms taps write. Date-times with a UTC offset are converted
+    to `time_zone` when it is set, and otherwise keep their wall time, as
+    the driver and `load_data.format_field` would write them. Dates and
+    times are never converted.
+
+    The literals of recently seen strings are kept in an LRU cache per
+    type, as the same timestamps tend to repeat within a batch.
+    """
+
+    def __init__(
+            self,
+            time_zone: t.Optional[datetime.tzinfo] = None,
+            cache_size: int = DEFAULT_DATETIME_CACHE_SIZE,
+    ) -> None:
+        """Initialize the converter.
+
+        Args:
+            time_zone: Zone that date-times with an offset are converted to,
+                or None to drop the offset.
+            cache_size: Strings whose literals are cached per type; 0
+                disables the cache.
+        """
+        self.time_zone = time_zone
+        convert = {
+            "date-time": self._datetime_literal,
+            "date": self._date_literal,
+            "time": self._time_literal,
+        }
+        self._converters = {
+            datelike_type: functools.lru_cache(maxsize=max(0, cache_size))(function)
+            for datelike_type, function in convert.items()
+        }
+
+    def to_literal(self, datelike_type: str, value: str) -> str:
+        """Return the MySQL literal of a date-like string.
+
+        Args:
+            datelike_type: ``date-time``, ``date`` or ``time``.
+            value: The ISO-8601 string.
+
+        Raises:
+            ValueError: If the string is not in an ISO-8601 form this reads.
+        """
+        return self._converters[datelike_type](value)
+
+    def format(self, datelike_type: str, value: t.Union[datetime.datetime, datetime.time]) -> str:
+        """Return the MySQL literal of a parsed date-like value."""
+        if datelike_type == "time":
+            if isinstance(value, datetime.datetime):
+                value = value.time()
+            return value.replace(tzinfo=None).isoformat()
+        if datelike_type == "date":
+            return value.date().isoformat()
+        if value.tzinfo is not None and self.time_zone is not None:
+            value = value.astimezone(self.time_zone)
+        return value.replace(tzinfo=None).isoformat(sep=" ")
+
+    def cache_info(self) -> t.Dict[str, t.Any]:
+        """Return the cache statistics of each type."""
+        return {
+            datelike_type: converter.cache_info()
+            for datelike_type, converter in self._converters.items()
+        }
+
+    def _datetime_literal(self, value: str) -> str:
+        return self.format("date-time", _fromisoformat(value))
+
+    def _date_literal(self, value: str) -> str:
+        return self.format("date", _fromisoformat(value))
+
+    def _time_literal(self, value: str) -> str:
+        return self.format("time", _time_fromisoformat(value))
@@ -0,0 +1,84 @@
+"""Consolidated ALTER TABLE statements for schema changes."""
+
+from __future__ import annotations
+
+import typing as t
+
+import sqlalchemy
+
+ALTER_ALGORITHMS = ("INSTANT", "INPLACE", "COPY")
+ALTER_LOCKS = ("NONE", "SHARED", "EXCLUSIVE")
+
+# ALGORITHM/LOCK not supported, with and without a reason.
+ALTER_NOT_SUPPORTED_ERRORS = (1845, 1846)
+
+
+class ColumnChange(t.NamedTuple):
+    """A column to add to a table, or to change the type of."""
+
+    action: str
+    column_name: str
+    sql_type: sqlalchemy.types.TypeEngine
+    current_type: t.Optional[sqlalchemy.types.TypeEngine] = None
+
+    @property
+    def clause(self) -> str:
+        """The clause of the change in an ALTER TABLE statement."""
+        if self.action == "ADD":
+            create_column_clause = sqlalchemy.schema.CreateColumn(
+                sqlalchemy.Column(self.column_name, self.sql_type, quote=False)
+            )
+            return f"ADD COLUMN {str(create_column_clause)}"
+        return f"MODIFY {self.column_name} {str(self.sql_type)}"
+
+    def describe(self) -> str:
+        """Describe the change, for logging and errors."""
+        if self.action == "ADD":
+            return f"add '{self.column_name}' {self.sql_type}"
+        return f"convert '{self.column_name}' from '{self.current_type}' to '{self.sql_type}'"
+
+
+def alter_table_options(
+        algorithm: t.Optional[str] = None,
+        lock: t.Optional[str] = None,
+) -> t.List[str]:
+    """Return the ALGORITHM/LOCK options to try, from the preferred to the fallback.
+
+    ``INSTANT`` falls back to ``INPLACE`` with the requested lock, and every
+    choice falls back to the server's default, no options at all. ``INSTANT``
+    never locks the table, and MySQL only accepts ``LOCK=DEFAULT`` with it,
+    so the lock is left out of that attempt.
+
+    Args:
+        algorithm: ``INSTANT``, ``INPLACE``, ``COPY`` or None for the default.
+        lock: ``NONE``, ``SHARED``, ``EXCLUSIVE`` or None for the default.
+    """
+    algorithm = (algorithm or "").upper()
+    lock = (lock or "").upper()
+    options = []
+    if algorithm == "INSTANT":
+        options.append(", ALGORITHM=INSTANT")
+        algorithm = "INPLACE"
+    if algorithm or lock:
+        options.append(
+            (f", ALGORITHM={algorithm}" if algorithm else "")
+            + (f", LOCK={lock}" if lock else "")
+        )
+    options.append("")
+    return options
+
+
+def build_alter_statement(
+        full_table_name: str,
+        changes: t.Sequence[ColumnChange],
+        options: str = "",
+) -> str:
+    """Return one ALTER TABLE statement applying all `changes`.
+
+    Args:
+        full_table_name: The table to alter.
+        changes: The columns to add or modify.
+        options: ALGORITHM/LOCK options, as returned by `alter_table_options`.
+    """
+    clauses = ",\n    ".join(change.clause for change in changes)
+    return f"ALTER TABLE {full_table_name}\n    {clauses}{options}"
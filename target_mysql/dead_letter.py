@@ -0,0 +1,160 @@
+"""Destinations for rows the database rejected."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import typing as t
+
+import sqlalchemy
+
+if t.TYPE_CHECKING:
+    from target_mysql.sinks import MySQLConnector
+
+
+class RejectedRow(t.NamedTuple):
+    """A row the database refused, with the error it gave."""
+
+    record: dict
+    error: str
+
+
+def _to_json(rejected: RejectedRow, full_table_name: str) -> str:
+    return json.dumps(
+        {
+            "table": full_table_name,
+            "error": rejected.error,
+            "record": rejected.record,
+            "rejected_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        default=str,
+    )
+
+
+class DeadLetterFile:
+    """Appends rejected rows as JSON lines to one file per table."""
+
+    # Rows are written once the transaction they were rejected in commits.
+    in_transaction = False
+    _lock = threading.Lock()
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the destination.
+
+        Args:
+            directory: Directory of the `<table>.jsonl` files, created if missing.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def describe(self, full_table_name: str) -> str:
+        """Return where the rows of `full_table_name` go, for logging."""
+        return os.path.join(self.directory, f"{full_table_name}.jsonl")
+
+    def prepare(self) -> None:
+        """Nothing to prepare; the directory is created up front."""
+
+    def write(
+            self,
+            full_table_name: str,
+            rows: t.Sequence[RejectedRow],
+            connection: t.Optional[sqlalchemy.engine.Connection] = None,
+    ) -> None:
+        """Append `rows` to the file of `full_table_name`. `connection` is not used."""
+        lines = "".join(_to_json(row, full_table_name) + "\n" for row in rows)
+        with self._lock, open(self.describe(full_table_name), "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class DeadLetterTable:
+    """Inserts rejected rows into a table shared by all streams.
+
+    The rows are inserted in the transaction of the batch they were
+    rejected from, on its connection, so they are committed with it and
+    loading doesn't take a second connection from the shared pool.
+    """
+
+    in_transaction = True
+
+    def __init__(self, connector: MySQLConnector, table_name: str) -> None:
+        """Initialize the destination.
+
+        Args:
+            connector: Connector of the target database.
+            table_name: Name of the dead-letter table, created if missing.
+        """
+        self.connector = connector
+        self.table_name = table_name
+        self._created = False
+
+    def describe(self, full_table_name: str) -> str:
+        """Return where the rows of `full_table_name` go, for logging."""
+        return f"table '{self.table_name}'"
+
+    def prepare(self) -> None:
+        """Create the dead-letter table if it is missing.
+
+        Called before loading, since the DDL would implicitly commit the
+        transaction the rows are inserted in.
+        """
+        if not self._created:
+            with self.connector._connect() as connection, connection.begin():
+                connection.exec_driver_sql(
+                    f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                    "id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY, "
+                    "table_name VARCHAR(255) NOT NULL, "
+                    "error TEXT, "
+                    "record JSON, "
+                    "rejected_at DATETIME(6) NOT NULL)"
+                )
+            self._created = True
+
+    def write(
+            self,
+            full_table_name: str,
+            rows: t.Sequence[RejectedRow],
+            connection: t.Optional[sqlalchemy.engine.Connection] = None,
+    ) -> None:
+        """Insert `rows` into the dead-letter table.
+
+        Args:
+            full_table_name: The table the rows were rejected by.
+            rows: The rejected rows.
+            connection: The connection, inside the transaction the rows go
+                in. When None, they are inserted and committed on a
+                connection of their own.
+        """
+        statement = (
+            f"INSERT INTO {self.table_name} (table_name, error, record, rejected_at) "
+            "VALUES (%s, %s, %s, UTC_TIMESTAMP(6))"
+        )
+        params = [
+            (full_table_name, row.error, json.dumps(row.record, default=str))
+            for row in rows
+        ]
+        if connection is not None:
+            connection.exec_driver_sql(statement, params)
+            return
+        self.prepare()
+        with self.connector._connect() as own_connection, own_connection.begin():
+            own_connection.exec_driver_sql(statement, params)
+
+
+DeadLetterQueue = t.Union[DeadLetterFile, DeadLetterTable]
+
+
+def get_dead_letter_queue(
+        config: t.Mapping[str, t.Any],
+        connector: MySQLConnector,
+) -> t.Optional[DeadLetterQueue]:
+    """Return the dead-letter destination from the config, or None if there is none.
+
+    `dead_letter_table` takes precedence over `dead_letter_path`.
+    """
+    if config.get("dead_letter_table"):
+        return DeadLetterTable(connector, config["dead_letter_table"])
+    if config.get("dead_letter_path"):
+        return DeadLetterFile(config["dead_letter_path"])
+    return None
@@ -0,0 +1,101 @@
+"""The MySQL drivers the target can load through, and how each is used."""
+
+from __future__ import annotations
+
+import importlib
+import re
+import typing as t
+
+DEFAULT_DRIVER_NAME = "mysql"
+
+
+class DriverProfile(t.NamedTuple):
+    """How the target uses one DBAPI driver."""
+
+    drivername: str  # The SQLAlchemy dialect+driver, as in a URL.
+    package: str  # The distribution that provides the driver.
+    path: str  # The fast path, as logged at startup.
+    local_infile_args: t.Dict[str, t.Any]  # Connect args that allow LOAD DATA LOCAL.
+    connect_args: t.Dict[str, t.Any] = {}
+    # Module and attribute of the regex the driver rewrites executemany INSERTs with.
+    insert_values_regex: t.Optional[t.Tuple[str, str]] = None
+
+    def rewrites_executemany(self, statement: str) -> t.Optional[bool]:
+        """Return whether the driver turns executemany of `statement` into multi-row INSERTs.
+
+        Returns:
+            None if it can't be told, because the driver isn't installed or
+            has no such rewrite.
+        """
+        if self.insert_values_regex is None:
+            return None
+        module_name, attribute = self.insert_values_regex
+        try:
+            regex = getattr(importlib.import_module(module_name), attribute)
+        except (ImportError, AttributeError):
+            return None
+        return re.search(regex, statement) is not None
+
+
+MYSQLCLIENT = DriverProfile(
+    drivername="mysql+mysqldb",
+    package="mysqlclient",
+    path="mysqlclient (C): executemany rewritten to multi-row INSERT statements",
+    local_infile_args={"local_infile": 1},
+    insert_values_regex=("MySQLdb.cursors", "RE_INSERT_VALUES"),
+)
+
+MYSQL_CONNECTOR = DriverProfile(
+    drivername="mysql+mysqlconnector",
+    package="mysql-connector-python",
+    path="mysql-connector (C extension): executemany rewritten to multi-row INSERT statements",
+    local_infile_args={"allow_local_infile": True},
+    # The C extension, when it is built; the driver falls back to pure Python otherwise.
+    connect_args={"use_pure": False},
+    insert_values_regex=("mysql.connector.cursor", "RE_SQL_INSERT_VALUES"),
+)
+
+PYMYSQL = DriverProfile(
+    drivername="mysql+pymysql",
+    package="PyMySQL",
+    path="PyMySQL (pure Python fallback): executemany rewritten to multi-row INSERT statements",
+    local_infile_args={"local_infile": True},
+    insert_values_regex=("pymysql.cursors", "RE_INSERT_VALUES"),
+)
+
+DRIVER_PROFILES: t.Dict[str, DriverProfile] = {
+    "mysql": MYSQLCLIENT,
+    MYSQLCLIENT.drivername: MYSQLCLIENT,
+    MYSQL_CONNECTOR.drivername: MYSQL_CONNECTOR,
+    PYMYSQL.drivername: PYMYSQL,
+}
+
+
+def describe_driver_path(profile: DriverProfile) -> str:
+    """Return the fast path of a driver, as it will be taken here."""
+    if profile is MYSQL_CONNECTOR:
+        try:
+            from mysql.connector import HAVE_CEXT
+        except ImportError:
+            HAVE_CEXT = False
+        if not HAVE_CEXT:
+            return profile.path.replace("(C extension)", "(pure Python, C extension not built)")
+    return profile.path
+
+
+def get_driver_profile(drivername: str) -> DriverProfile:
+    """Return the profile of a SQLAlchemy dialect+driver name.
+
+    Drivers without a profile of their own are used with the mysqlclient
+    connect arguments, which SQLAlchemy's other MySQL drivers mostly share,
+    and no fast path.
+    """
+    profile = DRIVER_PROFILES.get(drivername)
+    if profile is None:
+        profile = MYSQLCLIENT._replace(
+            drivername=drivername,
+            package=drivername,
+            path=f"{drivername}: generic DBAPI executemany",
+            insert_values_regex=None,
+        )
+    return profile
@@ -0,0 +1,153 @@
+"""Write-ahead journal of input lines, replayed after a crash."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import typing as t
+
+DEFAULT_JOURNAL_SEGMENT_BYTES = 64 * 1024 * 1024
+
+_SEGMENT_NAME = re.compile(r"^segment-(\d+)\.jsonl$")
+
+
+def _is_state(line: str) -> bool:
+    if '"STATE"' not in line:
+        return False
+    try:
+        return json.loads(line).get("type") == "STATE"
+    except (ValueError, AttributeError):
+        return False
+
+
+def _schema_stream(line: str) -> t.Optional[str]:
+    """Return the stream of a SCHEMA message line, or None for other lines."""
+    if '"SCHEMA"' not in line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(message, dict) and message.get("type") == "SCHEMA":
+        return message.get("stream")
+    return None
+
+
+class Journal:
+    """Input lines appended to numbered segment files until they are loaded.
+
+    Lines are journaled before they are processed. `sync` makes them
+    durable, and is called before a STATE message is acknowledged.
+    `mark_applied` removes every segment once the records read so far are
+    committed to MySQL. Segments left behind by a run that didn't finish are
+    replayed by the next one with `replay_lines`.
+
+    The SCHEMA message of a stream is only sent once, so the latest one of
+    each stream is written again at the head of every new segment. The
+    records after a drain can then be replayed without the segments
+    `mark_applied` removed.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            segment_bytes: int = DEFAULT_JOURNAL_SEGMENT_BYTES,
+    ) -> None:
+        """Initialize the journal, finding the segments of an earlier run.
+
+        Args:
+            directory: Directory of the segment files, created if missing.
+            segment_bytes: Size after which a new segment is started.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        found = sorted(
+            (int(match.group(1)), name)
+            for name in os.listdir(directory)
+            if (match := _SEGMENT_NAME.match(name))
+        )
+        # Segments not applied yet, oldest first, including those of earlier runs.
+        self.segments: t.List[str] = [os.path.join(directory, name) for _, name in found]
+        self.unapplied_on_start = list(self.segments)
+        self._next_sequence = found[-1][0] + 1 if found else 0
+        self._file: t.Optional[t.TextIO] = None
+        self._size = 0
+        # Latest SCHEMA line of each stream, journaled or replayed.
+        self._schemas: t.Dict[str, str] = {}
+
+    def replay_lines(self) -> t.Iterator[str]:
+        """Yield the lines an earlier run journaled, up to its last STATE message.
+
+        Lines after it are left out: their STATE was never acknowledged, so
+        the tap sends them again.
+        """
+        last_state = None
+        for segment_index, path in enumerate(self.unapplied_on_start):
+            with open(path, encoding="utf-8") as f:
+                for line_index, line in enumerate(f):
+                    if _is_state(line):
+                        last_state = (segment_index, line_index)
+        if last_state is None:
+            return
+
+        for segment_index, path in enumerate(self.unapplied_on_start[:last_state[0] + 1]):
+            with open(path, encoding="utf-8") as f:
+                for line_index, line in enumerate(f):
+                    self._remember_schema(line)
+                    yield line
+                    if (segment_index, line_index) == last_state:
+                        return
+
+    def append(self, line: str) -> None:
+        """Append an input line to the current segment."""
+        if self._file is None:
+            path = os.path.join(self.directory, f"segment-{self._next_sequence:012d}.jsonl")
+            self._next_sequence += 1
+            self._file = open(path, "a", encoding="utf-8")
+            self.segments.append(path)
+            header = "".join(self._schemas.values())
+            self._file.write(header)
+            self._size = len(header)
+        if not line.endswith("\n"):
+            line += "\n"
+        self._file.write(line)
+        self._size += len(line)
+        self._remember_schema(line)
+        if self._size >= self.segment_bytes:
+            self.sync()
+            self._close()
+
+    def _remember_schema(self, line: str) -> None:
+        stream = _schema_stream(line)
+        if stream is not None:
+            self._schemas[stream] = line if line.endswith("\n") else line + "\n"
+
+    def record(self, lines: t.Iterable[str]) -> t.Iterator[str]:
+        """Yield `lines`, appending each one to the journal first."""
+        for line in lines:
+            self.append(line)
+            yield line
+
+    def sync(self) -> None:
+        """Write the journaled lines through to disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def mark_applied(self) -> None:
+        """Remove all segments, once every line journaled so far is loaded."""
+        self._close()
+        for path in self.segments:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.segments = []
+        self.unapplied_on_start = []
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
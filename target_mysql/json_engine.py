@@ -0,0 +1,127 @@
+"""JSON parsing and encoding, backed by orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+import re
+import typing as t
+from decimal import Decimal
+
+from target_mysql.load_data import DecimalEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSON_ENGINES = ("auto", "orjson", "stdlib")
+
+# A digit followed by a fraction or exponent, or an integer too wide for 64
+# bits, which orjson reads as a float; lines without either can't hold one.
+_MAYBE_FLOAT = re.compile(r"\d[.eE]|\d{19}")
+
+
+def _contains_float(value: t.Any) -> bool:
+    """Return True if a parsed JSON document holds a float anywhere."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            return True
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
+
+def _orjson_default(obj: t.Any) -> t.Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonEngine:
+    """Parses input lines and encodes JSON cells.
+
+    Both engines keep numbers exact: parsed non-integer numbers become
+    Decimal, and Decimal values are encoded as strings, as `DecimalEncoder`
+    does.
+    """
+
+    name = "stdlib"
+
+    def __init__(self) -> None:
+        """Initialize the engine."""
+        self._encoder = DecimalEncoder()
+
+    def loads(self, line: t.Union[str, bytes]) -> t.Any:
+        """Parse a JSON document, reading non-integer numbers as Decimal."""
+        return json.loads(line, parse_float=Decimal)
+
+    def dumps(self, value: t.Any) -> str:
+        """Encode a value as JSON text."""
+        return self._encoder.encode(value)
+
+    def encode_json(self, value: t.Any) -> t.Any:
+        """Encode objects and arrays as JSON text, leaving other values as they are."""
+        if isinstance(value, (dict, list)):
+            return self.dumps(value)
+        return value
+
+
+class OrjsonEngine(JsonEngine):
+    """orjson-backed engine.
+
+    orjson has no hook to read floats as Decimal, so a document that turns
+    out to contain a float is parsed again with the standard library, as is
+    one orjson rejects, such as one with ``NaN`` or ``Infinity``. orjson
+    reads integers wider than 64 bits as floats too, which the standard
+    library keeps exact, and encodes: orjson refuses to. Lines without
+    non-integer or wide numbers, the common case, only pay for orjson.
+    Output is compact (no spaces after separators).
+    """
+
+    name = "orjson"
+
+    def loads(self, line: str) -> t.Any:
+        """Parse a JSON document, reading non-integer numbers as Decimal."""
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            return super().loads(line)
+        if _MAYBE_FLOAT.search(line) and _contains_float(value):
+            return super().loads(line)
+        return value
+
+    def dumps(self, value: t.Any) -> str:
+        """Encode a value as JSON text.
+
+        Values orjson can't encode, such as integers wider than 64 bits, are
+        encoded by the standard library.
+        """
+        try:
+            return orjson.dumps(
+                value, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            return super().dumps(value)
+
+
+def get_json_engine(name: t.Optional[str] = "auto") -> JsonEngine:
+    """Return the JSON engine for the `json_engine` setting.
+
+    Args:
+        name: ``auto`` (orjson if installed, else stdlib), ``orjson`` or ``stdlib``.
+
+    Raises:
+        ValueError: If the name is unknown, or ``orjson`` is requested but not installed.
+    """
+    name = name or "auto"
+    if name not in JSON_ENGINES:
+        raise ValueError(f"Unknown json_engine '{name}', expected one of {JSON_ENGINES}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("json_engine 'orjson' requires the orjson package")
+    if name != "stdlib" and orjson is not None:
+        return OrjsonEngine()
+    return JsonEngine()
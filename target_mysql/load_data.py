@@ -0,0 +1,110 @@
+"""Helpers for loading batches with `LOAD DATA LOCAL INFILE`."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import typing as t
+from decimal import Decimal
+
+# MySQL error codes raised when LOCAL INFILE is disabled on the server or client.
+LOCAL_INFILE_DISABLED_ERRORS = (1148, 2068, 3948)
+
+NULL_FIELD = "\\N"
+FIELD_SEPARATOR = "\t"
+LINE_SEPARATOR = "\n"
+
+_ESCAPE_TABLE = str.maketrans(
+    {
+        "\\": "\\\\",
+        "\t": "\\t",
+        "\n": "\\n",
+        "\r": "\\r",
+        "\0": "\\0",
+    }
+)
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """JSON encoder that writes Decimal values as strings."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+_json_encoder = DecimalEncoder()
+
+
+def format_field(value: t.Any) -> str:
+    """Format a single value as an escaped LOAD DATA field.
+
+    Args:
+        value: The python value of the cell.
+
+    Returns:
+        The field text, with NULL written as ``\\N``.
+    """
+    if value is None:
+        return NULL_FIELD
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    if isinstance(value, datetime.datetime):
+        return value.replace(tzinfo=None).isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        value = _json_encoder.encode(value)
+    return str(value).translate(_ESCAPE_TABLE)
+
+
+def write_rows(buffer: t.IO[str], rows: t.Iterable[t.Sequence[t.Any]]) -> int:
+    """Write rows to a tab separated buffer.
+
+    Args:
+        buffer: Writable text buffer.
+        rows: Rows of values, in column order.
+
+    Returns:
+        The number of rows written.
+    """
+    count = 0
+    for row in rows:
+        buffer.write(FIELD_SEPARATOR.join([format_field(value) for value in row]))
+        buffer.write(LINE_SEPARATOR)
+        count += 1
+    return count
+
+
+def build_load_data_statement(
+        file_path: str,
+        full_table_name: str,
+        column_names: t.Sequence[str],
+        duplicates: str | None = None,
+) -> str:
+    """Build a `LOAD DATA LOCAL INFILE` statement for a file written by `write_rows`.
+
+    Args:
+        file_path: Path of the local file to load.
+        full_table_name: The target table name.
+        column_names: Target columns, in file order.
+        duplicates: ``replace``, ``ignore`` or None for the server default.
+
+    Returns:
+        The statement text.
+    """
+    escaped_path = file_path.replace("\\", "\\\\").replace("'", "\\'")
+    modifier = f"{duplicates.upper()} " if duplicates else ""
+    return (
+        f"LOAD DATA LOCAL INFILE '{escaped_path}' "
+        f"{modifier}INTO TABLE {full_table_name} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+        "LINES TERMINATED BY '\\n' "
+        f"({', '.join(column_names)})"
+    )
@@ -0,0 +1,213 @@
+"""Per-stream load metrics, logged as Singer SDK METRIC lines."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+import typing as t
+
+from singer_sdk.metrics import get_metrics_logger
+
+# Stages of loading a batch: projecting records to rows and building the
+# statements, executing them, and committing the transactions.
+STAGES = ("serialize", "execute", "commit")
+
+# Upper bounds of the batch size histogram buckets, in rows.
+BATCH_SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+PROMETHEUS_PREFIX = "target_mysql"
+
+T = t.TypeVar("T")
+
+
+class StreamMetrics:
+    """Totals of what a stream loaded, and where the time went.
+
+    Updated by the draining thread and the thread building statements
+    ahead of it, so every update holds a lock.
+    """
+
+    def __init__(self, stream_name: str) -> None:
+        """Initialize the metrics at zero.
+
+        Args:
+            stream_name: The stream, used as the `stream` tag.
+        """
+        self.stream_name = stream_name
+        self.started_at = time.time()
+        self.rows = 0
+        self.bytes = 0
+        self.retries = 0
+        self.rejected_rows = 0
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        # One count per bucket of BATCH_SIZE_BUCKETS, and one for larger batches.
+        self.batch_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self.batch_rows = 0
+        self._lock = threading.Lock()
+
+    @property
+    def batches(self) -> int:
+        """The number of statement batches executed."""
+        return sum(self.batch_sizes)
+
+    def add_rows(self, rows: int, byte_count: int = 0) -> None:
+        """Account for committed rows and their estimated bytes."""
+        with self._lock:
+            self.rows += rows
+            self.bytes += byte_count
+
+    def add_batch(self, rows: int) -> None:
+        """Account for an executed statement batch of `rows` rows."""
+        index = next(
+            (i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if rows <= bound),
+            len(BATCH_SIZE_BUCKETS),
+        )
+        with self._lock:
+            self.batch_sizes[index] += 1
+            self.batch_rows += rows
+
+    def add_retry(self) -> None:
+        """Account for a retried transaction."""
+        with self._lock:
+            self.retries += 1
+
+    def add_rejected(self, rows: int) -> None:
+        """Account for rows sent to the dead-letter queue."""
+        with self._lock:
+            self.rejected_rows += rows
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Account for `seconds` spent in `stage`, one of STAGES."""
+        with self._lock:
+            self.seconds[stage] += seconds
+
+    @contextlib.contextmanager
+    def timed(self, stage: str) -> t.Iterator[None]:
+        """Time the body of the `with` statement as `stage`."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started_at)
+
+    def time_iterator(self, stage: str, items: t.Iterable[T]) -> t.Iterator[T]:
+        """Yield `items`, timing the production of each one as `stage`."""
+        iterator = iter(items)
+        while True:
+            started_at = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_time(stage, time.perf_counter() - started_at)
+            yield item
+
+    def points(self) -> t.List[dict]:
+        """Return the metrics as Singer SDK metric points."""
+        tags = {"stream": self.stream_name}
+        with self._lock:
+            points = [
+                {"type": "counter", "metric": "rows_loaded", "value": self.rows},
+                {"type": "counter", "metric": "bytes_loaded", "value": self.bytes},
+                {"type": "counter", "metric": "retry_count", "value": self.retries},
+                {"type": "counter", "metric": "rejected_count", "value": self.rejected_rows},
+            ]
+            points.extend(
+                {"type": "timer", "metric": f"{stage}_duration", "value": round(seconds, 6)}
+                for stage, seconds in self.seconds.items()
+            )
+            points.append(
+                {
+                    "type": "histogram",
+                    "metric": "batch_size",
+                    "value": {
+                        "count": sum(self.batch_sizes),
+                        "sum": self.batch_rows,
+                        "buckets": dict(
+                            zip([*map(str, BATCH_SIZE_BUCKETS), "+Inf"], self.batch_sizes)
+                        ),
+                    },
+                }
+            )
+        for point in points:
+            point["tags"] = tags
+        return points
+
+    def log(self, logger: t.Optional[logging.Logger] = None) -> None:
+        """Log every metric as a `METRIC: {...}` line, like the Singer SDK does."""
+        logger = logger or get_metrics_logger()
+        for point in self.points():
+            logger.info("METRIC: %s", json.dumps(point))
+
+    def prometheus_samples(self) -> t.Dict[str, t.List[t.Tuple[dict, float]]]:
+        """Return the samples of each Prometheus metric, as (labels, value) pairs."""
+        labels = {"stream": self.stream_name}
+        with self._lock:
+            samples: t.Dict[str, t.List[t.Tuple[dict, float]]] = {
+                "rows_loaded_total": [(labels, self.rows)],
+                "bytes_loaded_total": [(labels, self.bytes)],
+                "retries_total": [(labels, self.retries)],
+                "rejected_rows_total": [(labels, self.rejected_rows)],
+                "stage_seconds_total": [
+                    ({**labels, "stage": stage}, seconds) for stage, seconds in self.seconds.items()
+                ],
+            }
+            cumulative = 0
+            buckets = []
+            for bound, count in zip([*map(str, BATCH_SIZE_BUCKETS), "+Inf"], self.batch_sizes):
+                cumulative += count
+                buckets.append(({**labels, "le": bound}, cumulative))
+            samples["batch_size_bucket"] = buckets
+            samples["batch_size_sum"] = [(labels, self.batch_rows)]
+            samples["batch_size_count"] = [(labels, cumulative)]
+        return samples
+
+
+PROMETHEUS_METRICS = (
+    ("rows_loaded_total", "counter", "Rows committed to the stream's table."),
+    ("bytes_loaded_total", "counter", "Estimated bytes of the committed rows."),
+    ("retries_total", "counter", "Transactions retried after transient errors."),
+    ("rejected_rows_total", "counter", "Rows sent to the dead-letter queue."),
+    ("stage_seconds_total", "counter", "Seconds spent serializing, executing and committing."),
+    ("batch_size", "histogram", "Rows per executed statement batch."),
+)
+
+
+def _escape_label(value: t.Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_prometheus(metrics: t.Iterable[StreamMetrics]) -> str:
+    """Return the metrics of all streams in the Prometheus text format."""
+    samples_by_stream = [stream_metrics.prometheus_samples() for stream_metrics in metrics]
+    lines = []
+    for name, metric_type, help_text in PROMETHEUS_METRICS:
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {metric_type}")
+        suffixes = ("_bucket", "_sum", "_count") if metric_type == "histogram" else ("",)
+        for samples in samples_by_stream:
+            for suffix in suffixes:
+                for labels, value in samples[name + suffix]:
+                    label_text = ",".join(
+                        f'{key}="{_escape_label(label)}"' for key, label in labels.items()
+                    )
+                    lines.append(f"{PROMETHEUS_PREFIX}_{name}{suffix}{{{label_text}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, metrics: t.Iterable[StreamMetrics]) -> None:
+    """Replace the Prometheus textfile at `path` with the metrics of all streams.
+
+    The file is written next to `path` and renamed over it, so a collector
+    reading it never sees a partial file.
+    """
+    text = format_prometheus(metrics)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
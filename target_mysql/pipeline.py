@@ -0,0 +1,77 @@
+"""Overlap building statement batches with executing them."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import typing as t
+
+T = t.TypeVar("T")
+
+_DONE = object()
+
+
+class _ProducerError:
+    """Wraps an exception raised by the producer thread."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def prefetch(items: t.Iterable[T], depth: int) -> t.Iterator[T]:
+    """Iterate `items`, computing up to `depth` of them ahead on another thread.
+
+    The producer thread pulls from `items` while the caller works on the
+    previous item, so serializing batch N+1 overlaps with executing batch N.
+    The queue between them is bounded by `depth`, which caps how many built
+    batches are held in memory at once.
+
+    Exceptions raised by `items` are re-raised in the caller. If the caller
+    stops early, the producer is told to stop and its thread is joined.
+
+    Args:
+        items: The iterable to consume, typically a statement batch generator.
+        depth: Maximum number of items computed ahead. 0 disables prefetching.
+
+    Yields:
+        The items of `items`, in order.
+    """
+    if depth <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: t.Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:  # noqa: B902 - re-raised in the consumer
+            put(_ProducerError(e))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, name="batch-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
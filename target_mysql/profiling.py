@@ -0,0 +1,165 @@
+"""Sampled cProfile and tracemalloc profiling of sink drains."""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+import typing as t
+
+PROFILE_MODES = ("cprofile", "tracemalloc", "both")
+DEFAULT_PROFILE_EVERY = 10
+DEFAULT_PROFILE_SAMPLE_RATE = 0.1
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+
+class DrainProfiler:
+    """Profiles a sample of a stream's drains and writes the results to files.
+
+    Each drain is profiled with probability `sample_rate`. The cProfile
+    stats of `batches_per_file` profiled drains are written together to one
+    ``.prof`` file, readable with `pstats` or snakeviz. The tracemalloc
+    report of the same drains, with the peak traced memory of each and the
+    lines that allocated the most memory it still held at its end, goes to
+    a ``.tracemalloc.txt`` file.
+
+    Both profilers are process wide, so one drain is profiled at a time;
+    drains of other streams that are sampled meanwhile are not profiled.
+    cProfile only sees the draining thread, not the thread that builds
+    statements ahead of it.
+    """
+
+    # Held while a drain is profiled, in any stream.
+    _active = threading.Lock()
+
+    def __init__(
+            self,
+            directory: str,
+            stream_name: str,
+            mode: str = "cprofile",
+            batches_per_file: int = DEFAULT_PROFILE_EVERY,
+            sample_rate: float = DEFAULT_PROFILE_SAMPLE_RATE,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory of the result files, created if missing.
+            stream_name: The profiled stream, used in the file names.
+            mode: ``cprofile``, ``tracemalloc`` or ``both``.
+            batches_per_file: Profiled drains per result file.
+            sample_rate: Fraction of the drains that are profiled.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile_mode '{mode}', expected one of {PROFILE_MODES}")
+        self.directory = directory
+        self.stream_name = stream_name
+        self.use_cprofile = mode in ("cprofile", "both")
+        self.use_tracemalloc = mode in ("tracemalloc", "both")
+        self.batches_per_file = max(1, batches_per_file)
+        self.sample_rate = sample_rate
+        self.files_written = 0
+        self._batches = 0
+        self._profile: t.Optional[cProfile.Profile] = None
+        self._reports: t.List[str] = []
+        os.makedirs(directory, exist_ok=True)
+
+    @contextlib.contextmanager
+    def profile(self) -> t.Iterator[None]:
+        """Profile the body of the `with` statement, if it is sampled."""
+        if random.random() >= self.sample_rate or not self._active.acquire(blocking=False):
+            yield
+            return
+
+        try:
+            started_tracing = False
+            if self.use_tracemalloc:
+                started_tracing = not tracemalloc.is_tracing()
+                if started_tracing:
+                    tracemalloc.start(TRACEMALLOC_FRAMES)
+                if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+                    tracemalloc.reset_peak()
+                before = tracemalloc.take_snapshot()
+            if self.use_cprofile:
+                self._profile = self._profile or cProfile.Profile()
+                self._profile.enable()
+            started_at = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - started_at
+                if self.use_cprofile:
+                    self._profile.disable()
+                if self.use_tracemalloc:
+                    after = tracemalloc.take_snapshot()
+                    _, peak = tracemalloc.get_traced_memory()
+                    if started_tracing:
+                        tracemalloc.stop()
+                    self._reports.append(self._allocation_report(before, after, peak, elapsed))
+                self._batches += 1
+                if self._batches >= self.batches_per_file:
+                    self.flush()
+        finally:
+            self._active.release()
+
+    def _allocation_report(
+            self,
+            before: tracemalloc.Snapshot,
+            after: tracemalloc.Snapshot,
+            peak: int,
+            elapsed: float,
+    ) -> str:
+        statistics = after.compare_to(before, "lineno")
+        lines = [
+            f"Drain {self._batches + 1} of {self.stream_name}: {elapsed:.3f}s, "
+            f"peak traced memory {peak / 2 ** 20:.1f} MiB",
+        ]
+        lines.extend(f"  {stat}" for stat in statistics[:TOP_ALLOCATIONS])
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """Write the results of the drains profiled since the last file."""
+        if not self._batches:
+            return
+        file_stream_name = re.sub(r"[^\w.-]", "_", self.stream_name)
+        base_name = os.path.join(
+            self.directory, f"{file_stream_name}-{os.getpid()}-{self.files_written:04d}"
+        )
+        if self._profile is not None:
+            self._profile.dump_stats(f"{base_name}.prof")
+            self._profile = None
+        if self._reports:
+            with open(f"{base_name}.tracemalloc.txt", "w", encoding="utf-8") as f:
+                f.write("\n".join(self._reports))
+            self._reports = []
+        self.files_written += 1
+        self._batches = 0
+
+
+def get_drain_profiler(
+        config: t.Mapping[str, t.Any],
+        stream_name: str,
+) -> t.Optional[DrainProfiler]:
+    """Return the profiler of a stream from the config, or None if it isn't profiled.
+
+    Streams are profiled when `profile_path` is set and `profile_streams`
+    lists them, or is ``["*"]``.
+    """
+    directory = config.get("profile_path")
+    streams = config.get("profile_streams") or []
+    if not directory or not (stream_name in streams or "*" in streams):
+        return None
+    every = config.get("profile_every")
+    sample_rate = config.get("profile_sample_rate")
+    return DrainProfiler(
+        directory,
+        stream_name,
+        config.get("profile_mode") or "cprofile",
+        DEFAULT_PROFILE_EVERY if every is None else every,
+        DEFAULT_PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate,
+    )
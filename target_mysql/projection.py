@@ -0,0 +1,145 @@
+"""Compiled projection of Singer records onto table rows."""
+
+from __future__ import annotations
+
+import json
+import typing as t
+
+if t.TYPE_CHECKING:
+    from sqlalchemy import Column
+
+
+def schema_fingerprint(schema: dict) -> str:
+    """Return a stable fingerprint of a JSON schema."""
+    return json.dumps(schema, sort_keys=True, default=str)
+
+
+class RecordProjection:
+    """Turns raw records into positional rows for one schema version.
+
+    The projection is compiled once from the stream schema: raw property
+    names are resolved to conformed column names up front, and each column
+    that needs it gets a value converter chosen from its SQL type.
+    Projecting a record is then a single pass over the columns, with no
+    name conforming per record.
+    """
+
+    def __init__(
+            self,
+            property_names: t.Sequence[str],
+            column_names: t.Sequence[str],
+            converters: t.Sequence[t.Tuple[int, t.Callable[[t.Any], t.Any]]] = (),
+            key_positions: t.Sequence[int] = (),
+    ) -> None:
+        """Initialize the projection.
+
+        Args:
+            property_names: Raw property names, in column order.
+            column_names: Conformed column names, in the same order.
+            converters: (position, converter) pairs applied to non-null values.
+            key_positions: Positions of the key property columns.
+        """
+        self.property_names = tuple(property_names)
+        self.column_names = tuple(column_names)
+        self.converters = tuple(converters)
+        self.key_positions = tuple(key_positions)
+
+    def project(self, record: dict) -> tuple:
+        """Return the row for `record`, in column order.
+
+        Raises:
+            TypeError: If a value can't be converted for its column.
+        """
+        row = list(map(record.get, self.property_names))
+        for position, convert in self.converters:
+            value = row[position]
+            if value is not None:
+                try:
+                    row[position] = convert(value)
+                except TypeError as e:
+                    raise TypeError(
+                        f"Could not convert value for column "
+                        f"{self.column_names[position]}: {e}"
+                    ) from e
+        return tuple(row)
+
+    def project_all(self, records: t.Iterable[dict]) -> t.List[tuple]:
+        """Return the rows for all `records`."""
+        return list(map(self.project, records))
+
+    def deduplicate(self, records: t.Iterable[dict]) -> t.List[dict]:
+        """Keep only the last record of each key.
+
+        The kept records are in the order of their last occurrence, so
+        applying them in order gives the same result as applying every
+        record. Records are returned unchanged if there are no key columns
+        or a key value is not hashable.
+        """
+        records = records if isinstance(records, list) else list(records)
+        key_names = [self.property_names[i] for i in self.key_positions]
+        if not key_names:
+            return records
+
+        latest: dict = {}
+        try:
+            if len(key_names) == 1:
+                key_name = key_names[0]
+                for record in records:
+                    key = record.get(key_name)
+                    latest.pop(key, None)
+                    latest[key] = record
+            else:
+                for record in records:
+                    key = tuple(map(record.get, key_names))
+                    latest.pop(key, None)
+                    latest[key] = record
+        except TypeError:
+            return records
+        return list(latest.values())
+
+    def key_values(self, row: t.Sequence[t.Any]) -> dict:
+        """Return the key columns of a projected row, for logging."""
+        return {self.column_names[i]: row[i] for i in self.key_positions}
+
+
+class InsertPlan:
+    """Everything needed to load one table that only changes with the schema.
+
+    Built once per schema version by `MySQLSink.get_insert_plan` and reused
+    by every batch until a new SCHEMA message changes the stream.
+    """
+
+    def __init__(
+            self,
+            schema: dict,
+            fingerprint: str,
+            columns: t.List[Column],
+            projection: RecordProjection,
+            insert_sql: str,
+            upsert_clause: str,
+    ) -> None:
+        """Initialize the plan.
+
+        Args:
+            schema: The raw schema the plan was built from.
+            fingerprint: The `schema_fingerprint` of `schema`.
+            columns: The table columns, with their SQL types.
+            projection: The record projection onto `columns`.
+            insert_sql: The single-row INSERT statement, upsert clause included.
+            upsert_clause: The `ON DUPLICATE KEY UPDATE` clause, or "".
+        """
+        self.schema = schema
+        self.fingerprint = fingerprint
+        self.columns = columns
+        self.projection = projection
+        self.insert_sql = insert_sql
+        self.upsert_clause = upsert_clause
+
+    @property
+    def column_names(self) -> t.Tuple[str, ...]:
+        """The conformed column names, in row order."""
+        return self.projection.column_names
+
+    def matches(self, schema: dict) -> bool:
+        """Return True if the plan is still valid for `schema`."""
+        return schema is self.schema or schema_fingerprint(schema) == self.fingerprint
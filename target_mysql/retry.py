@@ -0,0 +1,121 @@
+"""Classification of database errors and retry with exponential backoff."""
+
+from __future__ import annotations
+
+import random
+import time
+import typing as t
+
+import sqlalchemy
+
+# Lock wait timeout, deadlock, server has gone away, lost connection during query.
+TRANSIENT_ERRORS = (1205, 1213, 2006, 2013)
+
+# Errors about the values of a row: column can't be null, duplicate key,
+# foreign key fails (1216, 1452), out of range, data truncated, incorrect
+# date-time, incorrect value, data too long, invalid JSON. Drivers map them
+# to different DBAPI exception classes.
+ROW_ERRORS = (1048, 1062, 1216, 1264, 1265, 1292, 1366, 1406, 1452, 3140)
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BACKOFF_SECONDS = 1.0
+MAX_RETRY_BACKOFF_SECONDS = 60.0
+
+T = t.TypeVar("T")
+
+
+def error_code(error: BaseException) -> t.Optional[int]:
+    """Return the MySQL error code of a driver error wrapped by SQLAlchemy, if any."""
+    orig = getattr(error, "orig", None)
+    if orig is not None and orig.args and isinstance(orig.args[0], int):
+        return orig.args[0]
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True if the statement may succeed when the transaction is retried."""
+    if not isinstance(error, sqlalchemy.exc.DBAPIError):
+        return False
+    return error.connection_invalidated or error_code(error) in TRANSIENT_ERRORS
+
+
+def is_row_error(error: BaseException) -> bool:
+    """Return True if the error may be caused by some of the rows of a batch.
+
+    Only data and integrity errors, or the `ROW_ERRORS` codes, are. Schema,
+    permission and server errors, such as an unknown column, a denied
+    command or a read-only server, fail every row alike, so isolating rows
+    would only dead-letter all of them.
+    """
+    return (
+        isinstance(error, (sqlalchemy.exc.DataError, sqlalchemy.exc.IntegrityError))
+        or (isinstance(error, sqlalchemy.exc.DBAPIError) and error_code(error) in ROW_ERRORS)
+    ) and not is_transient(error)
+
+
+class RetryPolicy:
+    """How often and how long to wait before retrying transient errors."""
+
+    def __init__(
+            self,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+            backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+            max_backoff_seconds: float = MAX_RETRY_BACKOFF_SECONDS,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first failure; 0 disables retrying.
+            backoff_seconds: Wait before the first retry, doubled for each next one.
+            max_backoff_seconds: Upper bound of a single wait.
+        """
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+    @classmethod
+    def from_config(cls, config: t.Mapping[str, t.Any]) -> "RetryPolicy":
+        """Build the policy from the `max_retries` and `retry_backoff_seconds` settings."""
+        max_retries = config.get("max_retries")
+        backoff_seconds = config.get("retry_backoff_seconds")
+        return cls(
+            DEFAULT_MAX_RETRIES if max_retries is None else max_retries,
+            DEFAULT_RETRY_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds,
+        )
+
+    def delay(self, attempt: int) -> float:
+        """Return the wait before retry number `attempt`, starting at 1.
+
+        The exponential delay is jittered between half and all of its value,
+        so sinks that deadlocked on each other don't retry in lockstep.
+        """
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def call(
+            self,
+            operation: t.Callable[[], T],
+            on_retry: t.Optional[t.Callable[[BaseException, int, float], None]] = None,
+    ) -> T:
+        """Call `operation`, retrying it after transient errors.
+
+        Args:
+            operation: The operation, which must be safe to run again.
+            on_retry: Called with the error, the retry number and the wait
+                before each retry.
+
+        Returns:
+            The result of the operation.
+        """
+        attempt = 0
+        while True:
+            try:
+                return operation()
+            except sqlalchemy.exc.DBAPIError as e:
+                attempt += 1
+                if not is_transient(e) or attempt > self.max_retries:
+                    raise
+                delay = self.delay(attempt)
+                if on_retry:
+                    on_retry(e, attempt, delay)
+                time.sleep(delay)
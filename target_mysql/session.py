@@ -0,0 +1,153 @@
+"""Session variables set on the connections of the target, per session profile."""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import typing as t
+
+SESSION_PROFILES = ("default", "bulk_load", "custom")
+ISOLATION_LEVELS = ("READ-UNCOMMITTED", "READ-COMMITTED", "REPEATABLE-READ", "SERIALIZABLE")
+
+# Session variables of the bulk_load profile, before the session_* settings.
+BULK_LOAD_VARIABLES: t.Dict[str, t.Any] = {
+    "unique_checks": 0,
+    "foreign_key_checks": 0,
+    "transaction_isolation": "READ-COMMITTED",
+    "innodb_lock_wait_timeout": 120,
+}
+
+# Access denied; you need (at least one of) the SUPER privilege(s) for this operation.
+SPECIFIC_ACCESS_DENIED_ERROR = 1227
+
+_VARIABLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _literal(value: t.Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+class SessionProfile:
+    """Session variables applied to each connection before it is first used.
+
+    The variables are set with one ``SET SESSION`` statement when a
+    connection is checked out of the pool for the first time, and the pool
+    record remembers it. A reused connection is checked against that mark
+    instead of being set again; connections the pool opens anew, after a
+    failed pre-ping or a recycle, are set again.
+
+    ``sql_log_bin`` needs the SUPER or SYSTEM_VARIABLES_ADMIN privilege.
+    When the server refuses it, it is left out with a warning and the
+    other variables are still set.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            variables: t.Mapping[str, t.Any],
+            logger: t.Optional[logging.Logger] = None,
+    ) -> None:
+        """Initialize the profile.
+
+        Args:
+            name: The profile, used in logs and as the pool record mark.
+            variables: Session variable names and values.
+            logger: Where a refused ``sql_log_bin`` is reported.
+
+        Raises:
+            ValueError: If a variable name is not a plain identifier.
+        """
+        for variable in variables:
+            if not _VARIABLE_NAME.match(variable):
+                raise ValueError(f"Invalid session variable name '{variable}'")
+        self.name = name
+        self.variables = dict(variables)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    @property
+    def set_statement(self) -> t.Optional[str]:
+        """The ``SET SESSION`` statement of the variables, or None if there are none."""
+        if not self.variables:
+            return None
+        assignments = ", ".join(
+            f"{name} = {_literal(value)}" for name, value in self.variables.items()
+        )
+        return f"SET SESSION {assignments}"
+
+    def apply(self, dbapi_connection: t.Any) -> None:
+        """Set the variables on a DBAPI connection."""
+        while True:
+            statement = self.set_statement
+            if statement is None:
+                return
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(statement)
+                return
+            except Exception as e:
+                args = getattr(e, "args", ())
+                if not (args and args[0] == SPECIFIC_ACCESS_DENIED_ERROR
+                        and "sql_log_bin" in self.variables):
+                    raise
+                with self._lock:
+                    self.variables.pop("sql_log_bin", None)
+                self.logger.warning(
+                    f"Not allowed to set sql_log_bin ({e}); loading with binary logging"
+                )
+            finally:
+                cursor.close()
+
+    def on_checkout(self, dbapi_connection: t.Any, connection_record: t.Any, connection_proxy: t.Any) -> None:
+        """Pool `checkout` event handler: set the variables unless this connection has them."""
+        if connection_record.info.get("session_profile") != self.set_statement:
+            self.apply(dbapi_connection)
+            connection_record.info["session_profile"] = self.set_statement
+
+    def describe(self) -> str:
+        """Return the profile and its statement, for logging."""
+        return f"{self.name} ({self.set_statement or 'server defaults'})"
+
+
+def get_session_profile(
+        config: t.Mapping[str, t.Any],
+        logger: t.Optional[logging.Logger] = None,
+) -> SessionProfile:
+    """Return the session profile of the config.
+
+    ``default`` sets nothing. ``bulk_load`` sets `BULK_LOAD_VARIABLES`, and
+    ``custom`` only what the settings below give. For both, the
+    `session_isolation_level`, `session_lock_wait_timeout`,
+    `session_disable_binlog` and `session_variables` settings apply, in that
+    order.
+
+    Raises:
+        ValueError: If the profile or the isolation level is unknown.
+    """
+    name = config.get("session_profile") or "default"
+    if name not in SESSION_PROFILES:
+        raise ValueError(f"Unknown session_profile '{name}', expected one of {SESSION_PROFILES}")
+    variables: t.Dict[str, t.Any] = {}
+    if name == "bulk_load":
+        variables.update(BULK_LOAD_VARIABLES)
+    if name != "default":
+        isolation_level = config.get("session_isolation_level")
+        if isolation_level:
+            if isolation_level not in ISOLATION_LEVELS:
+                raise ValueError(
+                    f"Unknown session_isolation_level '{isolation_level}', "
+                    f"expected one of {ISOLATION_LEVELS}"
+                )
+            variables["transaction_isolation"] = isolation_level
+        if config.get("session_lock_wait_timeout") is not None:
+            variables["innodb_lock_wait_timeout"] = config["session_lock_wait_timeout"]
+        if config.get("session_disable_binlog"):
+            variables["sql_log_bin"] = 0
+        variables.update(config.get("session_variables") or {})
+    return SessionProfile(name, variables, logger)
@@ -2,28 +2,122 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import functools
 import logging
+import os
 import re
 import string
+import tempfile
+import threading
 import time
 import typing as t
-from decimal import Decimal
-from typing import Any, Dict, Iterable, List, Optional, cast
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, cast
 
 import sqlalchemy
+from dateutil import parser
 from singer_sdk.connectors import SQLConnector
 from singer_sdk.helpers._conformers import replace_leading_digit
-from singer_sdk.helpers._typing import get_datelike_property_type
+from singer_sdk.helpers._typing import (
+    DatetimeErrorTreatmentEnum,
+    get_datelike_property_type,
+    handle_invalid_timestamp_in_record,
+)
 from singer_sdk.sinks import SQLSink
 from sqlalchemy import Column
 from sqlalchemy.dialects import mysql
 from sqlalchemy.engine import Engine, URL
 from sqlalchemy.schema import PrimaryKeyConstraint
 
+from target_mysql import columnar, load_data
+from target_mysql.async_writer import AsyncWriter, WriteJob
+from target_mysql.batching import AdaptiveBatchSize
+from target_mysql.buffering import MemoryBudget, SpillFiles
+from target_mysql.catalog import CatalogColumn, TableCatalog
+from target_mysql.commit import CommitPolicy
+from target_mysql.ddl import (
+    ALTER_NOT_SUPPORTED_ERRORS,
+    ColumnChange,
+    alter_table_options,
+    build_alter_statement,
+)
+from target_mysql.datetimes import (
+    DATELIKE_TYPES,
+    DEFAULT_DATETIME_CACHE_SIZE,
+    DatetimeConverter,
+    get_time_zone,
+)
+from target_mysql.dead_letter import DeadLetterQueue, RejectedRow, get_dead_letter_queue
+from target_mysql.drivers import (
+    DEFAULT_DRIVER_NAME,
+    DriverProfile,
+    describe_driver_path,
+    get_driver_profile,
+)
+from target_mysql.json_engine import JsonEngine, get_json_engine
+from target_mysql.metrics import StreamMetrics
+from target_mysql.pipeline import prefetch
+from target_mysql.profiling import get_drain_profiler
+from target_mysql.projection import InsertPlan, RecordProjection, schema_fingerprint
+from target_mysql.retry import RetryPolicy, error_code, is_row_error, is_transient
+from target_mysql.session import SessionProfile, get_session_profile
+
 if t.TYPE_CHECKING:
     from sqlalchemy.engine.reflection import Inspector
 
+DEFAULT_MAX_ALLOWED_PACKET = 4194304
+# Same as the SDK's default drain parallelism.
+DEFAULT_MAX_PARALLEL_STREAMS = 8
+# Connections allowed beyond one per parallel stream, for DDL and reflection.
+POOL_MAX_OVERFLOW = 2
+# Statement batches built ahead of the one executing.
+DEFAULT_PIPELINE_DEPTH = 2
+# Execution time aimed at by adaptive batch sizes, in seconds.
+DEFAULT_BATCH_TARGET_SECONDS = 1.0
+# Bytes kept free in each packet for the protocol header and statement overhead.
+PACKET_HEADROOM = 1024
+# InnoDB limit on the length of an index key, and bytes per utf8mb4 character.
+MAX_KEY_BYTES = 3072
+BYTES_PER_CHARACTER = 4
+# Key bytes assumed for a primary key column that isn't a string.
+FIXED_KEY_COLUMN_BYTES = 8
+STAGING_TABLE_SUFFIX = "__staging"
+UNIQUE_KEYS_QUERY = (
+    "SELECT COUNT(*) FROM information_schema.STATISTICS "
+    "WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s AND NON_UNIQUE = 0"
+)
+# Characters the driver escapes with a backslash when quoting strings.
+ESCAPED_CHARACTERS = ("\\", "'", '"', "\n", "\r", "\0", "\x1a")
+
+
+class StatementBatch(NamedTuple):
+    """A statement and its parameters, ready for `exec_driver_sql`."""
+
+    statement: str
+    params: Any  # A tuple for one execution, or a list of tuples for executemany.
+    row_count: int
+    byte_count: int
+    rows: Sequence[Sequence[Any]]  # The rows in the statement, in column order.
+
+    @property
+    def last_row(self) -> Optional[Sequence[Any]]:
+        """The last row of the batch."""
+        return self.rows[-1] if self.rows else None
+
+
+def literal_size(value: Any) -> int:
+    """Return an upper bound of the bytes `value` takes as an SQL literal."""
+    if value is None:
+        return 4
+    if isinstance(value, str):
+        size = len(value.encode("utf-8")) + 2
+        for character in ESCAPED_CHARACTERS:
+            size += value.count(character)
+        return size
+    if isinstance(value, bytes):
+        return 2 * len(value) + 3
+    return len(str(value)) + 2
+
 
 class MySQLConnector(SQLConnector):
     """The connector for MySQL.
@@ -38,11 +132,28 @@ class MySQLConnector(SQLConnector):
     allow_temp_tables: bool = True  # Whether temp tables are supported.
     table_name_pattern: str = "${TABLE_NAME}"  # The pattern to use for temp table names.
 
+    # Engines are shared by all sinks with the same URL, so parallel drains
+    # draw from one bounded connection pool.
+    _shared_engines: Dict[str, Engine] = {}
+    _shared_engines_lock = threading.Lock()
+    # The session profile of each shared engine, by the same key.
+    _session_profiles: Dict[str, SessionProfile] = {}
+    # DDL on a table is serialized across sinks draining in parallel.
+    _table_locks: Dict[str, threading.RLock] = {}
+    _table_locks_lock = threading.Lock()
+    # Table columns are reflected once per database URL and shared by all sinks.
+    _catalogs: Dict[str, TableCatalog] = {}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # self.logger.setLevel(logging.DEBUG)
 
         self.allow_column_alter = super().config.get("allow_column_alter", False)
+        self._local_infile_enabled: bool | None = None
+        self._max_allowed_packet: int | None = None
+        self._unique_keys: Dict[str, bool] = {}
+        # Shared with the other connectors of the engine; set by create_engine.
+        self.session_profile: SessionProfile | None = None
 
     def get_sqlalchemy_url(self, config: dict) -> URL:
         """Generates a SQLAlchemy URL for MySQL.
@@ -55,14 +166,329 @@ class MySQLConnector(SQLConnector):
             return config["sqlalchemy_url"]
 
         return sqlalchemy.engine.url.URL.create(
-            drivername="mysql",
-            username=config["user"],
+            drivername=config.get("driver_name") or DEFAULT_DRIVER_NAME,
+            # `username` is the declared setting; `user` is what the README used to document.
+            username=config.get("username") or config.get("user"),
             password=config["password"],
             host=config["host"],
             port=config["port"],
             database=config["database"],
         )
 
+    def create_engine(self) -> Engine:
+        """Creates and returns a new engine. Do not call outside of _engine.
+
+        Connectors with the same URL and settings share one engine, whose pool
+        holds `pool_size` connections (by default one per parallel stream)
+        plus a small overflow for DDL and reflection. Enables the client side
+        of `LOAD DATA LOCAL INFILE` when the `load_data` load method is
+        configured, and sets the session variables of the session profile on
+        each connection when it is first checked out.
+        """
+        driver = self.driver_profile
+        connect_args = dict(driver.connect_args)
+        if self.config.get("load_method") == "load_data":
+            connect_args.update(driver.local_infile_args)
+
+        session_profile = get_session_profile(self.config, self.logger)
+        pool_size = (
+            self.config.get("pool_size")
+            or self.config.get("max_parallel_streams")
+            or DEFAULT_MAX_PARALLEL_STREAMS
+        )
+        pool_pre_ping = bool(self.config.get("pool_pre_ping"))
+        pool_recycle = self.config.get("pool_recycle")
+        if pool_recycle is None:
+            pool_recycle = -1
+        engine_key = (
+            f"{self.sqlalchemy_url}|{sorted(connect_args.items())}|{pool_size}"
+            f"|{pool_pre_ping}|{pool_recycle}|{session_profile.set_statement}"
+        )
+
+        with self._shared_engines_lock:
+            engine = self._shared_engines.get(engine_key)
+            if engine is None:
+                engine = sqlalchemy.create_engine(
+                    self.sqlalchemy_url,
+                    echo=False,
+                    connect_args=connect_args,
+                    pool_size=pool_size,
+                    max_overflow=POOL_MAX_OVERFLOW,
+                    pool_pre_ping=pool_pre_ping,
+                    pool_recycle=pool_recycle,
+                )
+                sqlalchemy.event.listen(engine, "checkout", session_profile.on_checkout)
+                self._shared_engines[engine_key] = engine
+                self._session_profiles[engine_key] = session_profile
+                self.logger.info(f"Using the {driver.drivername} driver: {describe_driver_path(driver)}")
+                self.logger.info(f"Using the {session_profile.describe()} session profile")
+            self.session_profile = self._session_profiles[engine_key]
+
+        return engine
+
+    @property
+    def driver_profile(self) -> DriverProfile:
+        """How the driver of the configured URL is used."""
+        return get_driver_profile(sqlalchemy.engine.make_url(self.sqlalchemy_url).drivername)
+
+    def table_lock(self, full_table_name: str) -> threading.RLock:
+        """Return the lock that serializes DDL on `full_table_name`."""
+        key = str(full_table_name).lower()
+        with self._table_locks_lock:
+            lock = self._table_locks.get(key)
+            if lock is None:
+                lock = self._table_locks[key] = threading.RLock()
+        return lock
+
+    def prepare_table(
+            self,
+            full_table_name: str,
+            schema: dict,
+            primary_keys: list[str],
+            partition_keys: list[str] | None = None,
+            as_temp_table: bool = False,
+    ) -> None:
+        """Adapt target table to provided schema if possible.
+
+        Holds the table's DDL lock, so sinks for the same table never create
+        or alter it at the same time. Columns of an existing table are added
+        and converted with a single ALTER TABLE statement.
+        """
+        with self.table_lock(full_table_name):
+            if not self.table_exists(full_table_name=full_table_name):
+                self.create_empty_table(
+                    full_table_name=full_table_name,
+                    schema=schema,
+                    primary_keys=primary_keys,
+                    partition_keys=partition_keys,
+                    as_temp_table=as_temp_table,
+                )
+                return
+
+            changes = self.plan_schema_changes(full_table_name, schema)
+            if changes:
+                self.apply_schema_changes(full_table_name, changes)
+
+    def plan_schema_changes(self, full_table_name: str, schema: dict) -> List[ColumnChange]:
+        """Return the column changes needed for the table to hold `schema`.
+
+        Args:
+            full_table_name: The target table name.
+            schema: The JSON schema of the stream.
+        """
+        changes = []
+        for property_name, property_def in schema["properties"].items():
+            change = self.plan_column_change(
+                full_table_name, property_name, self.to_sql_type(property_def)
+            )
+            if change:
+                changes.append(change)
+        return changes
+
+    def plan_column_change(
+            self,
+            full_table_name: str,
+            column_name: str,
+            sql_type: sqlalchemy.types.TypeEngine,
+    ) -> Optional[ColumnChange]:
+        """Return the change needed for the column to hold `sql_type`, if any.
+
+        Missing columns are added if `allow_column_add`. Existing columns are
+        widened to the type `merge_sql_types` finds compatible with both, if
+        `allow_column_alter` and the schema isn't frozen.
+
+        Args:
+            full_table_name: The target table name.
+            column_name: The target column name.
+            sql_type: The SQLAlchemy type of the stream property.
+        """
+        if not self.column_exists(full_table_name, column_name):
+            if not self.allow_column_add:
+                return None
+            return ColumnChange("ADD", column_name, sql_type)
+
+        if self.config.get('freeze_schema') or not self.allow_column_alter:
+            return None
+
+        current_type = self._get_column_type(full_table_name, column_name)
+
+        # Check if the existing column type and the sql type are the same
+        if str(sql_type) == str(current_type):
+            return None
+
+        # Not the same type, generic type or compatible types
+        # calling merge_sql_types for assistnace
+        compatible_sql_type = self.merge_sql_types([current_type, sql_type])
+
+        if str(compatible_sql_type).split(" ")[0] == str(current_type).split(" ")[0]:
+            return None
+
+        return ColumnChange("MODIFY", column_name, compatible_sql_type, current_type)
+
+    def apply_schema_changes(
+            self,
+            full_table_name: str,
+            changes: Sequence[ColumnChange],
+    ) -> None:
+        """Apply column changes to a table with one ALTER TABLE statement.
+
+        The statement asks for the `alter_algorithm` and `alter_lock` options.
+        If the server refuses them for these changes, it is run again with the
+        weaker options of `alter_table_options`, down to none at all.
+
+        Raises:
+            RuntimeError: If the table can't be altered.
+        """
+        options = alter_table_options(
+            self.config.get("alter_algorithm"), self.config.get("alter_lock")
+        )
+        for attempt, option in enumerate(options, start=1):
+            alter_sql = build_alter_statement(full_table_name, changes, option)
+            self.logger.info("Altering with SQL: %s", alter_sql)
+            try:
+                with self._connect() as connection:
+                    connection.exec_driver_sql(alter_sql)
+                break
+            except sqlalchemy.exc.DBAPIError as e:
+                if error_code(e) in ALTER_NOT_SUPPORTED_ERRORS and attempt < len(options):
+                    self.logger.warning(
+                        f"Server refused '{option.lstrip(', ')}' for {full_table_name}: "
+                        f"{e.orig}. Retrying with weaker options."
+                    )
+                    continue
+                raise RuntimeError(
+                    f"Could not alter table '{full_table_name}' to "
+                    + ", ".join(change.describe() for change in changes)
+                    + "."
+                ) from e
+
+        _, schema_name, table_name = self.parse_full_table_name(full_table_name)
+        for change in changes:
+            self.catalog.set_column(
+                schema_name, table_name, CatalogColumn(change.column_name, change.sql_type)
+            )
+
+    @property
+    def catalog(self) -> TableCatalog:
+        """The column catalog of the target database."""
+        catalog_key = str(self._engine.url)
+        with self._shared_engines_lock:
+            return self._catalogs.setdefault(catalog_key, TableCatalog())
+
+    def get_catalog_columns(self, full_table_name: str) -> Optional[Dict[str, CatalogColumn]]:
+        """Return the cataloged columns of a table, or None if it doesn't exist."""
+        _, schema_name, table_name = self.parse_full_table_name(full_table_name)
+        return self.catalog.get_columns(self._connect, schema_name, table_name)
+
+    def table_exists(self, full_table_name: str) -> bool:
+        """Determine if the target table already exists, from the catalog."""
+        return self.get_catalog_columns(full_table_name) is not None
+
+    def column_exists(self, full_table_name: str, column_name: str) -> bool:
+        """Determine if the target column already exists, from the catalog."""
+        return column_name in (self.get_catalog_columns(full_table_name) or {})
+
+    def get_table_columns(
+            self,
+            full_table_name: str,
+            column_names: list[str] | None = None,
+    ) -> dict[str, sqlalchemy.Column]:
+        """Return the table columns from the catalog.
+
+        Args:
+            full_table_name: Fully qualified table name.
+            column_names: A list of column names to filter to.
+
+        Returns:
+            An ordered dict of new column objects.
+        """
+        wanted = {name.casefold() for name in column_names or ()}
+        return {
+            column.name: sqlalchemy.Column(column.name, column.type, nullable=column.nullable)
+            for column in (self.get_catalog_columns(full_table_name) or {}).values()
+            if not wanted or column.name.casefold() in wanted
+        }
+
+    def _get_column_type(
+            self,
+            full_table_name: str,
+            column_name: str,
+    ) -> sqlalchemy.types.TypeEngine:
+        """Get the SQL type of the declared column, from the catalog.
+
+        Raises:
+            KeyError: If the provided column name does not exist.
+        """
+        try:
+            return (self.get_catalog_columns(full_table_name) or {})[column_name].type
+        except KeyError as ex:
+            raise KeyError(
+                f"Column `{column_name}` does not exist in table `{full_table_name}`."
+            ) from ex
+
+    def has_unique_key(self, full_table_name: str) -> bool:
+        """Return True if the table has a primary or unique key.
+
+        Read once per table for the life of the connector.
+        """
+        if full_table_name not in self._unique_keys:
+            _, schema_name, table_name = self.parse_full_table_name(full_table_name)
+            with self._connect() as connection:
+                count = connection.exec_driver_sql(UNIQUE_KEYS_QUERY, (schema_name, table_name)).scalar()
+            self._unique_keys[full_table_name] = bool(count)
+        return self._unique_keys[full_table_name]
+
+    def local_infile_enabled(self) -> bool:
+        """Return True if the server accepts `LOAD DATA LOCAL INFILE`.
+
+        The result is cached for the life of the connector, and is reset to
+        False by `disable_local_infile` if a load is refused.
+        """
+        if self._local_infile_enabled is None:
+            try:
+                with self._connect() as connection:
+                    value = connection.exec_driver_sql(
+                        "SELECT @@GLOBAL.local_infile"
+                    ).scalar()
+                self._local_infile_enabled = str(value).upper() in ("1", "ON")
+            except sqlalchemy.exc.DBAPIError as e:
+                self.logger.warning(f"Could not read local_infile setting: {e}")
+                self._local_infile_enabled = False
+
+            if not self._local_infile_enabled:
+                self.logger.warning(
+                    "Server has local_infile disabled, "
+                    "falling back to INSERT statements."
+                )
+
+        return self._local_infile_enabled
+
+    def disable_local_infile(self) -> None:
+        """Stop using `LOAD DATA LOCAL INFILE` for this connector."""
+        self._local_infile_enabled = False
+
+    @property
+    def max_allowed_packet(self) -> int:
+        """Return the server's `max_allowed_packet` in bytes.
+
+        Read once per connector. Falls back to the MySQL default of 4 MiB if
+        the variable can't be read.
+        """
+        if self._max_allowed_packet is None:
+            try:
+                with self._connect() as connection:
+                    value = connection.exec_driver_sql(
+                        "SELECT @@max_allowed_packet"
+                    ).scalar()
+                self._max_allowed_packet = int(value)
+            except (sqlalchemy.exc.DBAPIError, TypeError, ValueError) as e:
+                self.logger.warning(f"Could not read max_allowed_packet: {e}")
+                self._max_allowed_packet = DEFAULT_MAX_ALLOWED_PACKET
+
+            self.logger.info(f"Server max_allowed_packet: {self._max_allowed_packet}")
+
+        return self._max_allowed_packet
+
     def get_fully_qualified_name(
             self,
             table_name: str | None = None,
@@ -155,20 +581,10 @@ class MySQLConnector(SQLConnector):
             column_name: the target column name.
             sql_type: the SQLAlchemy type.
         """
-        if not self.column_exists(full_table_name, column_name):
-            self._create_empty_column(
-                full_table_name=full_table_name,
-                column_name=column_name,
-                sql_type=sql_type,
-            )
-            return
-
-        if not self.config.get('freeze_schema'):
-            self._adapt_column_type(
-                full_table_name,
-                column_name=column_name,
-                sql_type=sql_type,
-            )
+        with self.table_lock(full_table_name):
+            change = self.plan_column_change(full_table_name, column_name, sql_type)
+            if change:
+                self.apply_schema_changes(full_table_name, [change])
 
 
     def to_sql_type(self, jsonschema_type: dict) -> sqlalchemy.types.TypeEngine:  # noqa
@@ -292,47 +708,10 @@ class MySQLConnector(SQLConnector):
             # raise NotImplementedError("Adding columns is not supported.")
             return
 
-        # if column_name.startswith("_"):
-        #     column_name = f"x{column_name}"
-
-        create_column_clause = sqlalchemy.schema.CreateColumn(
-            sqlalchemy.Column(
-                column_name,
-                sql_type,
-                quote=False
-            )
+        self.apply_schema_changes(
+            full_table_name, [ColumnChange("ADD", column_name, sql_type)]
         )
 
-        try:
-            alter_sql = f"""ALTER TABLE {str(full_table_name)}
-                ADD COLUMN {str(create_column_clause)} """
-            self.logger.info("Altering with SQL: %s", alter_sql)
-            self.connection.execute(alter_sql)
-        except Exception as e:
-            raise RuntimeError(
-                f"Could not create column '{create_column_clause}' "
-                f"on table '{full_table_name}'."
-            ) from e
-
-    # def create_temp_table_from_table(self, from_table_name, temp_table_name):
-    #     """Temp table from another table."""
-    #
-    #     try:
-    #         self.connection.execute(
-    #             f"""DROP TABLE {temp_table_name}"""
-    #         )
-    #     except Exception as e:
-    #         pass
-    #
-    #     ddl = f"""
-    #         CREATE TABLE {temp_table_name} AS (
-    #             SELECT * FROM {from_table_name}
-    #             WHERE 1=0
-    #         )
-    #     """
-    #
-    #     self.connection.execute(ddl)
-
     def create_empty_table(
             self,
             full_table_name: str,
@@ -356,8 +735,6 @@ class MySQLConnector(SQLConnector):
             raise NotImplementedError("Temporary tables are not supported.")
 
         _ = partition_keys  # Not supported in generic implementation.
-        # Ignore primary keys completely
-        _ = primary_keys  # Not used since we're removing PK constraints
 
         _, schema_name, table_name = self.parse_full_table_name(full_table_name)
         meta = sqlalchemy.MetaData(schema=schema_name)
@@ -369,17 +746,115 @@ class MySQLConnector(SQLConnector):
                 f"Schema for '{full_table_name}' does not define properties: {schema}"
             )
 
+        # Tables only get a primary key when asked to, as before.
+        key_types: dict = {}
+        if primary_keys and self.config.get("create_primary_keys"):
+            key_types = self.get_primary_key_types(full_table_name, properties, primary_keys)
+
         for property_name, property_jsonschema in properties.items():
             columns.append(
                 sqlalchemy.Column(
                     property_name,
-                    self.to_sql_type(property_jsonschema)
+                    key_types.get(property_name) or self.to_sql_type(property_jsonschema),
+                    nullable=property_name not in key_types,
+                    autoincrement=False,
                 )
             )
 
-        # Always create table without primary key constraint
-        _ = sqlalchemy.Table(table_name, meta, *columns)
+        constraints = []
+        if key_types:
+            constraints.append(PrimaryKeyConstraint(*primary_keys))
+        _ = sqlalchemy.Table(table_name, meta, *columns, *constraints)
         meta.create_all(self._engine)
+        self.catalog.set_table(
+            schema_name,
+            table_name,
+            [CatalogColumn(column.name, column.type, column.nullable) for column in columns],
+        )
+
+    def get_primary_key_types(
+            self,
+            full_table_name: str,
+            properties: dict,
+            primary_keys: list[str],
+    ) -> dict:
+        """Return the SQL types of the primary key columns of a new table.
+
+        String keys become VARCHAR columns short enough for the whole key to
+        fit in an InnoDB index key (3072 bytes of utf8mb4), splitting what the
+        other key columns leave between them.
+
+        Args:
+            full_table_name: the target table name.
+            properties: the JSON schema properties of the new table.
+            primary_keys: list of key properties.
+
+        Returns:
+            The SQL type of each key column, or an empty dict if the keys
+            can't form a primary key.
+        """
+        key_types = {}
+        for key in primary_keys:
+            if key not in properties:
+                self.logger.warning(
+                    f"Key property '{key}' is not in the schema of '{full_table_name}', "
+                    "creating the table without a primary key"
+                )
+                return {}
+            key_types[key] = self.to_sql_type(properties[key])
+            if isinstance(key_types[key], mysql.JSON):
+                self.logger.warning(
+                    f"Key property '{key}' of '{full_table_name}' is a JSON column, "
+                    "creating the table without a primary key"
+                )
+                return {}
+
+        string_keys = [
+            key for key, sql_type in key_types.items()
+            if isinstance(sql_type, sqlalchemy.types.String)
+        ]
+        if string_keys:
+            fixed_bytes = FIXED_KEY_COLUMN_BYTES * (len(key_types) - len(string_keys))
+            max_length = (MAX_KEY_BYTES - fixed_bytes) // BYTES_PER_CHARACTER // len(string_keys)
+            for key in string_keys:
+                length = key_types[key].length or max_length
+                if length > max_length:
+                    self.logger.warning(
+                        f"Key column '{key}' of '{full_table_name}' is limited to "
+                        f"VARCHAR({max_length}) to fit in the primary key"
+                    )
+                key_types[key] = mysql.VARCHAR(min(length, max_length))
+
+        return key_types
+
+    def create_staging_table(self, full_table_name: str) -> str:
+        """Create an empty copy of a table, with its keys, to merge batches from.
+
+        An existing staging table is dropped first, so the copy always has
+        the target table's current columns.
+
+        Args:
+            full_table_name: the target table name.
+
+        Returns:
+            The name of the staging table.
+        """
+        staging_table_name = f"{full_table_name}{STAGING_TABLE_SUFFIX}"
+        with self.table_lock(full_table_name), self._connect() as connection:
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {staging_table_name}")
+            connection.exec_driver_sql(
+                f"CREATE TABLE {staging_table_name} LIKE {full_table_name}"
+            )
+        _, schema_name, table_name = self.parse_full_table_name(staging_table_name)
+        self.catalog.forget(schema_name, table_name)
+        return staging_table_name
+
+    def drop_table(self, full_table_name: str) -> None:
+        """Drop a table if it exists."""
+        with self._connect() as connection:
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {full_table_name}")
+        _, schema_name, table_name = self.parse_full_table_name(full_table_name)
+        self.catalog.forget(schema_name, table_name)
 
     def merge_sql_types(  # noqa
             self, sql_types: list[sqlalchemy.types.TypeEngine]
@@ -479,35 +954,12 @@ class MySQLConnector(SQLConnector):
         Raises:
             NotImplementedError: if altering columns is not supported.
         """
-        current_type: sqlalchemy.types.TypeEngine = self._get_column_type(
-            full_table_name, column_name
-        )
-
-        # Check if the existing column type and the sql type are the same
-        if str(sql_type) == str(current_type):
-            # The current column and sql type are the same
-            # Nothing to do
-            return
-
-        # Not the same type, generic type or compatible types
-        # calling merge_sql_types for assistnace
-        compatible_sql_type = self.merge_sql_types([current_type, sql_type])
-
-        if str(compatible_sql_type).split(" ")[0] == str(current_type).split(" ")[0]:
-            # Nothing to do
+        if not self.column_exists(full_table_name, column_name):
             return
 
-        if self.allow_column_alter:
-            try:
-                alter_sql = f"""ALTER TABLE {str(full_table_name)}
-                    MODIFY {str(column_name)} {str(compatible_sql_type)}"""
-                self.logger.info("Altering with SQL: %s", alter_sql)
-                self.connection.execute(alter_sql)
-            except Exception as e:
-                raise RuntimeError(
-                    f"Could not convert column '{full_table_name}.{column_name}' "
-                    f"from '{current_type}' to '{compatible_sql_type}'."
-                ) from e
+        change = self.plan_column_change(full_table_name, column_name, sql_type)
+        if change:
+            self.apply_schema_changes(full_table_name, [change])
 
 
 class MySQLSink(SQLSink):
@@ -520,9 +972,6 @@ class MySQLSink(SQLSink):
     soft_delete_column_name = "x_sdc_deleted_at"
     version_column_name = "x_sdc_table_version"
 
-    start_time_global = time.time()
-    inserted_records = 0
-
     # @property
     # def schema_name(self) -> Optional[str]:
     #     """Return the schema name or `None` if using names with no schema part.
@@ -544,9 +993,101 @@ class MySQLSink(SQLSink):
     #     return None
 
     def __init__(self, *args, **kwargs):
+        self._conformed_names: Dict[str, str] = {}
+        self._insert_plans: Dict[str, InsertPlan] = {}
+        self._json_engine: Optional[JsonEngine] = None
+        self._batch_sizers: Dict[str, AdaptiveBatchSize] = {}
+        self._dead_letter_queue: Optional[DeadLetterQueue] = None
+        # Whether the table has a key merge upserts can match on; read on first merge.
+        self._can_merge: Optional[bool] = None
+        self._datelike_properties: Optional[Dict[str, str]] = None
         super().__init__(*args, **kwargs)
+        cache_size = self.config.get("datetime_cache_size")
+        self.datetime_converter = DatetimeConverter(
+            get_time_zone(self.config.get("datetime_time_zone")),
+            DEFAULT_DATETIME_CACHE_SIZE if cache_size is None else cache_size,
+        )
+        # Replaced by the target with the stream's metrics, which outlive its sinks.
+        self.metrics = StreamMetrics(self.stream_name)
+        self.profiler = get_drain_profiler(self.config, self.stream_name)
+        # Set by the target when max_buffer_bytes is configured.
+        self.memory_budget: Optional[MemoryBudget] = None
+        self.spill_files: Optional[SpillFiles] = None
+        # Set by the target when write_engine is async.
+        self.async_writer: Optional[AsyncWriter] = None
+        if self.config.get("spill_path"):
+            self.spill_files = SpillFiles(self.config["spill_path"], self.stream_name)
         # self.logger.setLevel(logging.DEBUG)
 
+    @property
+    def json_engine(self) -> JsonEngine:
+        """The engine that encodes JSON columns, from the `json_engine` setting."""
+        if self._json_engine is None:
+            self._json_engine = get_json_engine(self.config.get("json_engine"))
+        return self._json_engine
+
+    @property
+    def dead_letter_queue(self) -> Optional[DeadLetterQueue]:
+        """Where rejected rows go, from the `dead_letter_path` and `dead_letter_table` settings."""
+        if self._dead_letter_queue is None:
+            self._dead_letter_queue = get_dead_letter_queue(self.config, self.connector)
+        return self._dead_letter_queue
+
+    def clean_up(self) -> None:
+        """Write the results of profiled drains that aren't in a file yet."""
+        if self.profiler:
+            self.profiler.flush()
+        super().clean_up()
+
+    @property
+    def datelike_properties(self) -> Dict[str, str]:
+        """The date-time, date and time properties of the schema, with their type."""
+        if self._datelike_properties is None:
+            self._datelike_properties = {}
+            for name, property_schema in self.schema["properties"].items():
+                datelike_type = get_datelike_property_type(property_schema)
+                if datelike_type in DATELIKE_TYPES:
+                    self._datelike_properties[name] = datelike_type
+        return self._datelike_properties
+
+    def _parse_timestamps_in_record(
+            self,
+            record: dict,
+            schema: dict,
+            treatment: DatetimeErrorTreatmentEnum,
+    ) -> None:
+        """Replace date-like strings with their MySQL literals.
+
+        Only the date-like properties are visited, and ISO-8601 strings are
+        converted by `datetime_converter`. Other strings are parsed with
+        dateutil, and values it can't parse are handled per `treatment`,
+        as the SDK does.
+        """
+        for key, datelike_type in self.datelike_properties.items():
+            value = record.get(key)
+            if value is None:
+                continue
+            try:
+                record[key] = self.datetime_converter.to_literal(datelike_type, value)
+                continue
+            except (ValueError, TypeError):
+                pass
+            try:
+                record[key] = self.datetime_converter.format(datelike_type, parser.parse(value))
+            except (parser.ParserError, TypeError, OverflowError) as ex:
+                # The replacement, if any, is already a literal.
+                record[key] = handle_invalid_timestamp_in_record(
+                    record, [key], value, datelike_type, ex, treatment, self.logger
+                )
+
+    def setup(self) -> None:
+        """Set up the sink and read server limits used while loading."""
+        super().setup()
+        if self.config.get("load_method") == "multi_insert":
+            _ = self.connector.max_allowed_packet
+        if self.dead_letter_queue is not None:
+            self.dead_letter_queue.prepare()
+
     def process_batch(self, context: dict) -> None:
         """Process a batch with the given batch context.
         Writes a batch to the SQL target. Developers may override this method
@@ -554,212 +1095,886 @@ class MySQLSink(SQLSink):
         Args:
             context: Stream partition or context dictionary.
         """
-        # First we need to be sure the main table is already created
-        conformed_records = (
-            [self.conform_record(record) for record in context["records"]]
-            if isinstance(context["records"], list)
-            else (self.conform_record(record) for record in context["records"])
-        )
-
-        join_keys = [self.conform_name(key, "column") for key in self.key_properties]
-        schema = self.conform_schema(self.schema)
+        # Drains of profiled streams are sampled by cProfile and tracemalloc.
+        with self.profiler.profile() if self.profiler else contextlib.nullcontext():
+            # Batches spilled to disk are older than the buffered records.
+            if self.spill_files:
+                for records in self.spill_files.read_batches():
+                    self.write_records(records)
+            if context.get("records"):
+                self.write_records(context["records"])
+
+    def write_records(self, records: List[Dict[str, Any]]) -> None:
+        """Write a batch of records, deduplicated and merged as configured."""
+        # Records are conformed to table rows by the compiled projection in
+        # bulk_insert_records, so they are passed on as they came in.
+        if self.key_properties and self.config.get("deduplicate_records"):
+            records = self.deduplicate_records(self.full_table_name, self.schema, records)
+
+        if self.key_properties and self.config.get("upsert_method") == "merge" and self.can_merge():
+            if self.async_writer:
+                self.async_writer.wait(self.full_table_name)
+            self.merge_records(
+                full_table_name=self.full_table_name,
+                schema=self.schema,
+                records=records,
+            )
+            return
 
         self.bulk_insert_records(
             full_table_name=self.full_table_name,
-            schema=schema,
-            records=conformed_records,
+            schema=self.schema,
+            records=records,
         )
 
-        # if self.key_properties:
-        #     self.logger.info(f"Preparing table {self.full_table_name}")
-        #     self.connector.prepare_table(
-        #         full_table_name=self.full_table_name,
-        #         schema=schema,
-        #         primary_keys=self.key_properties,
-        #         as_temp_table=False,
-        #     )
-        #
-        #     tmp_table_name = self.full_table_name + "_temp"
-        #
-        #     # Create a temp table (Creates from the table above)
-        #     self.logger.info(f"Creating temp table {self.full_table_name}")
-        #     self._connector.create_temp_table_from_table(
-        #         from_table_name=self.full_table_name,
-        #         temp_table_name=tmp_table_name
-        #     )
-        #
-        #     # Insert into temp table
-        #     self.bulk_insert_records(
-        #         full_table_name=tmp_table_name,
-        #         schema=schema,
-        #         records=conformed_records,
-        #     )
-        #     # Merge data from Temp table to main table
-        #     self.logger.info(f"Merging data from temp table to {self.full_table_name}")
-        #     self.merge_upsert_from_table(
-        #         from_table_name=tmp_table_name,
-        #         to_table_name=self.full_table_name,
-        #         join_keys=join_keys,
-        #     )
-        #
-        # else:
-        #     self.bulk_insert_records(
-        #         full_table_name=self.full_table_name,
-        #         schema=schema,
-        #         records=conformed_records,
-        #     )
-
-    # def merge_upsert_from_table(self,
-    #                             from_table_name: str,
-    #                             to_table_name: str,
-    #                             join_keys: List[str],
-    #                             ) -> Optional[int]:
-    #
-    #     """Merge upsert data from one table to another.
-    #     Args:
-    #         from_table_name: The source table name.
-    #         to_table_name: The destination table name.
-    #         join_keys: The merge upsert keys, or `None` to append.
-    #         schema: Singer Schema message.
-    #     Return:
-    #         The number of records copied, if detectable, or `None` if the API does not
-    #         report number of records affected/inserted.
-    #     """
-    #     # TODO think about sql injeciton,
-    #     # issue here https://github.com/MeltanoLabs/target-postgres/issues/22
-    #
-    #     join_keys = [self.conform_name(key, "column") for key in join_keys]
-    #     schema = self.conform_schema(self.schema)
-    #
-    #     join_condition = " and ".join(
-    #         [f"temp.{key} = target.{key}" for key in join_keys]
-    #     )
-    #
-    #     upsert_on_condition = ", ".join(
-    #         [f"{to_table_name}.{key} = temp.{key}" for key in join_keys]
-    #     )
-    #
-    #     merge_sql = f"""
-    #         INSERT INTO {to_table_name} ({", ".join(schema["properties"].keys())})
-    #             SELECT {", ".join(schema["properties"].keys())}
-    #             FROM
-    #                 {from_table_name} temp
-    #         ON DUPLICATE KEY UPDATE
-    #             {upsert_on_condition}
-    #     """
-    #
-    #     self.logger.debug("Merging with SQL: %s", merge_sql)
-    #
-    #     self.connection.execute(merge_sql)
-    #
-    #     self.connection.execute("COMMIT")
-    #
-    #     self.connection.execute(f"DROP TABLE {from_table_name}")
-    #
-    #     self.logger.info(f"Dropped temp table '{from_table_name}'")
+    def spill(self) -> int:
+        """Move the buffered records to a compressed file, loaded at the next drain.
 
-    def bulk_insert_records(
+        The records still count toward `current_size`, so the SDK drains the
+        sink when they and the records buffered after them fill it.
+
+        Returns:
+            The number of records spilled.
+        """
+        records = (self._pending_batch or {}).get("records")
+        if not records or self.spill_files is None:
+            return 0
+        count = len(records)
+        path = self.spill_files.write(records)
+        records.clear()
+        if self.memory_budget:
+            self.memory_budget.release(self.stream_name)
+        self.logger.info(f"Spilled {count} records of '{self.stream_name}' to {path}")
+        return count
+
+    def mark_drained(self) -> None:
+        """Reset the batch tracking, and release the drained records from the memory budget."""
+        super().mark_drained()
+        if self.memory_budget:
+            self.memory_budget.release(self.stream_name)
+
+    def deduplicate_records(
+            self,
+            full_table_name: str,
+            schema: dict,
+            records: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Drop all but the last record of each key from a batch.
+
+        Upserting every version of a key only rewrites the same row, so
+        only the last version is sent.
+
+        Args:
+            full_table_name: The target table name.
+            schema: The raw JSON schema of the stream.
+            records: The records of the batch.
+
+        Returns:
+            The deduplicated records, in the order of each key's last version.
+        """
+        projection = self.get_insert_plan(full_table_name, schema).projection
+        deduplicated = projection.deduplicate(records)
+        removed = len(records) - len(deduplicated)
+        if removed:
+            self.logger.info(
+                f"Removed {removed} duplicate records of {len(deduplicated)} keys "
+                f"from the batch for '{full_table_name}'"
+            )
+        return deduplicated
+
+    def can_merge(self) -> bool:
+        """Return True if the table has a key for merge upserts to match rows on.
+
+        Without a primary or unique key, `ON DUPLICATE KEY UPDATE` never
+        matches and merging would append every version of every row. Such a
+        table is loaded with `direct` upserts instead, with a warning once.
+        """
+        if self._can_merge is None:
+            self._can_merge = self.connector.has_unique_key(self.full_table_name)
+            if not self._can_merge:
+                self.logger.warning(
+                    f"Table '{self.full_table_name}' has no primary or unique key, so "
+                    "upsert_method 'merge' can't match existing rows; loading it with "
+                    "'direct' upserts, which append rows too. Set create_primary_keys "
+                    "for new tables, or add a key to the table."
+                )
+        return self._can_merge
+
+    def merge_records(
             self,
             full_table_name: str,
             schema: dict,
             records: Iterable[Dict[str, Any]],
     ) -> Optional[int]:
-        """Bulk insert records with batching to handle connection timeouts."""
-        insert_sql = self.generate_insert_statement(
-            full_table_name,
-            schema,
+        """Load records into a staging table, then merge them into the target.
+
+        The batch is bulk loaded into an empty copy of the target table with
+        the configured load method, then merged with a single set-based
+        `INSERT ... SELECT ... ON DUPLICATE KEY UPDATE`. Only used for tables
+        with a primary or unique key (see `can_merge`); the staging table has
+        the same keys, so when a batch holds a key more than once the last
+        record wins there already.
+
+        Args:
+            full_table_name: The target table name.
+            schema: The raw JSON schema of the stream.
+            records: The records of the batch.
+
+        Returns:
+            The number of records merged.
+        """
+        staging_table_name = self.connector.create_staging_table(full_table_name)
+        try:
+            records_staged = self.bulk_insert_records(staging_table_name, schema, records)
+            column_names = self.get_insert_plan(full_table_name, schema).column_names
+            self.merge_upsert_from_table(staging_table_name, full_table_name, column_names)
+        finally:
+            self.connector.drop_table(staging_table_name)
+        return records_staged
+
+    def merge_upsert_from_table(
+            self,
+            from_table_name: str,
+            to_table_name: str,
+            column_names: Sequence[str],
+    ) -> None:
+        """Merge upsert all rows of one table into another.
+
+        Args:
+            from_table_name: The source (staging) table name.
+            to_table_name: The destination table name.
+            column_names: The columns to copy.
+        """
+        columns = ", ".join(column_names)
+        merge_sql = (
+            f"INSERT INTO {to_table_name} ({columns}) "
+            f"SELECT {columns} FROM {from_table_name}"
+            + self.generate_upsert_clause(column_names)
         )
-        if self.key_properties:
-            join_keys = [self.conform_name(key, "column") for key in self.key_properties]
-            upsert_on_condition = ", ".join(
-                [f"{key}=VALUES({key})" for key in join_keys]
+        self.logger.debug("Merging with SQL: %s", merge_sql)
+
+        def merge() -> None:
+            with self.connector._connect() as connection, connection.begin():
+                connection.exec_driver_sql(merge_sql)
+
+        def log_retry(error: BaseException, attempt: int, delay: float) -> None:
+            self.metrics.add_retry()
+            self.logger.warning(
+                f"Transient error merging into '{to_table_name}' ({getattr(error, 'orig', error)}), "
+                f"retrying in {delay:.1f}s"
             )
-            insert_sql += f" ON DUPLICATE KEY UPDATE {upsert_on_condition}"
 
-        if isinstance(insert_sql, str):
-            insert_sql = sqlalchemy.text(insert_sql)
+        started_at = time.perf_counter()
+        with self.metrics.timed("execute"):
+            RetryPolicy.from_config(self.config).call(merge, on_retry=log_retry)
+        self.logger.info(
+            f"Merged '{from_table_name}' into '{to_table_name}' "
+            f"in {time.perf_counter() - started_at:.3f}s"
+        )
+
+    def bulk_insert_records(
+            self,
+            full_table_name: str,
+            schema: dict,
+            records: Iterable[Dict[str, Any]],
+    ) -> Optional[int]:
+        """Bulk insert records with batching to handle connection timeouts."""
+        load_method = self.config.get("load_method", "insert")
+        if load_method == "load_data" and self.connector.local_infile_enabled():
+            records = list(records) if not isinstance(records, list) else records
+            if self.async_writer:
+                # Earlier batches that fell back to INSERT may still be in flight.
+                self.async_writer.wait(full_table_name)
+            records_loaded = self.load_data_records(full_table_name, schema, records)
+            if records_loaded is not None:
+                self.log_stats(full_table_name, records_loaded)
+                return records_loaded
+
+        plan = self.get_insert_plan(full_table_name, schema)
+        commit_policy = CommitPolicy.from_config(self.config)
+        batch_sizer = None
 
-        self.logger.debug("Inserting with SQL: %s", insert_sql)
-        columns = self.column_representation(schema)
-        
         # Convert iterable records to a list so we can process in batches
         record_list = list(records) if not isinstance(records, list) else records
         total_records = len(record_list)
-        batch_size = self.config.get("batch_size", 100)  # Default to 100 if not specified
-        
-        self.logger.info(f"Processing {total_records} records in batches of {batch_size}")
-        
-        records_inserted = 0
-        last_successful_record = None
-        
-        # Process in batches
-        for i in range(0, total_records, batch_size):
-            batch = record_list[i:i+batch_size]
-            insert_records = []
-            
-            for record in batch:
-                insert_record = {}
-                conformed_record = self.conform_record(record)
-                for column in columns:
-                    val = conformed_record.get(column.name)
-                    if isinstance(val, (dict, list)):
-                        try:
-                            # JSON encoder to handle Decimal
-                            class DecimalEncoder(json.JSONEncoder):
-                                def default(self, obj):
-                                    if isinstance(obj, Decimal):
-                                        return str(obj)
-                                    return super().default(obj)
-                            
-                            val = json.dumps(val, cls=DecimalEncoder)
-                        except TypeError as e:
-                            self.logger.error(f"JSON serialization error found for column {column.name}: {e}")
-                            self.logger.error(f"Value causing error: {val}")
-                            raise
-
-                    insert_record[column.name] = val
-                insert_records.append(insert_record)
-            
-            try:
-                # Execute the batch
-                self.connection.execute(insert_sql, insert_records)
-                self.connection.execute("COMMIT")
-                
-                # Track progress
-                records_inserted += len(batch)
-                self.inserted_records += len(batch)
-                
-                # Store the last successful record for logging purposes
-                if batch:
-                    last_successful_record = batch[-1]
-                    # Log every batch completion with key information
-                    if self.key_properties:
-                        key_info = {k: last_successful_record.get(k) for k in self.key_properties if k in last_successful_record}
-                        self.logger.info(f"Successfully inserted batch ending with record: {key_info}")
-                
-                # Log overall progress
-                self.logger.info(f"Progress: {records_inserted}/{total_records} records inserted")
-                
-            except Exception as e:
-                self.logger.error(f"Error inserting batch: {e}")
-                # Log the last successful record before the error
-                if last_successful_record and self.key_properties:
-                    key_info = {k: last_successful_record.get(k) for k in self.key_properties if k in last_successful_record}
-                    self.logger.error(f"Last successfully inserted record before error: {key_info}")
-                self.logger.error(f"Stopped at {records_inserted}/{total_records} records")
-                break  # Exit the loop on error
-        
-        # Log final stats
-        elapsed_time_global = time.time() - self.start_time_global
-        avg_per_minute = (self.inserted_records / elapsed_time_global) * 60 if elapsed_time_global > 0 else 0
+
+        if load_method == "multi_insert":
+            self.logger.info(
+                f"Processing {total_records} records in statements of up to "
+                f"{self.connector.max_allowed_packet} bytes"
+            )
+            statements = self.generate_multi_row_insert_statements(
+                full_table_name,
+                list(plan.column_names),
+                map(plan.projection.project, record_list),
+                self.connector.max_allowed_packet - PACKET_HEADROOM,
+            )
+        else:
+            batch_size = self.config.get("batch_size", 100)  # Default to 100 if not specified
+            batch_sizer = self.get_batch_sizer(full_table_name)
+            self.logger.debug("Inserting with SQL: %s", plan.insert_sql)
+            if batch_sizer:
+                self.logger.info(
+                    f"Processing {total_records} records in adaptive batches, "
+                    f"starting at {batch_sizer.describe()}"
+                )
+            else:
+                self.logger.info(f"Processing {total_records} records in batches of {batch_size}")
+            statements = self.generate_insert_batches(
+                plan,
+                record_list,
+                batch_size,
+                measure_bytes=(
+                    commit_policy.tracks_bytes
+                    or batch_sizer is not None
+                    or bool(self.config.get("metrics_path"))
+                ),
+                batch_sizer=batch_sizer,
+            )
+
+        statements = self.metrics.time_iterator("serialize", statements)
+
+        # A staging table is merged and dropped as soon as this returns, so
+        # it is loaded synchronously.
+        if self.async_writer and not full_table_name.endswith(STAGING_TABLE_SUFFIX):
+            return self.submit_async_write(
+                full_table_name, list(statements), plan, commit_policy, total_records
+            )
+
+        # Build the next batches on another thread while the current one executes
+        pipeline_depth = self.config.get("pipeline_depth", DEFAULT_PIPELINE_DEPTH)
+        if pipeline_depth:
+            statements = prefetch(statements, pipeline_depth)
+
+        records_inserted = self.execute_statements(
+            full_table_name,
+            statements,
+            plan,
+            commit_policy,
+            total_records,
+            batch_sizer=batch_sizer,
+        )
+        if batch_sizer:
+            self.logger.info(f"Adaptive batch size for '{full_table_name}': {batch_sizer.describe()}")
+
+        self.log_stats(full_table_name, records_inserted)
+        return records_inserted
+
+    def submit_async_write(
+            self,
+            full_table_name: str,
+            batches: List[StatementBatch],
+            plan: InsertPlan,
+            commit_policy: CommitPolicy,
+            total_records: int,
+    ) -> int:
+        """Hand the statement batches of a drain to the async writer.
+
+        The batches are committed in one transaction after the earlier ones
+        of the table. The target waits for them before it emits STATE.
+
+        Returns:
+            The number of records submitted.
+        """
+        self.async_writer.submit(
+            WriteJob(
+                full_table_name,
+                batches,
+                self.metrics,
+                functools.partial(
+                    self.execute_statements,
+                    full_table_name,
+                    batches,
+                    plan,
+                    commit_policy,
+                    total_records,
+                ),
+            )
+        )
+        self.logger.info(
+            f"Queued {total_records} records for '{full_table_name}' "
+            f"in {len(batches)} batches for an async write"
+        )
+        return total_records
+
+    def log_stats(self, full_table_name: str, records_inserted: int) -> None:
+        """Log the stream's totals, then its metrics as METRIC lines."""
+        metrics = self.metrics
+        elapsed_time = time.time() - metrics.started_at
+        avg_per_minute = (metrics.rows / elapsed_time) * 60 if elapsed_time > 0 else 0
+        stage_times = ", ".join(
+            f"{stage} {seconds:.3f}s" for stage, seconds in metrics.seconds.items()
+        )
 
         self.logger.info(f"Table '{full_table_name}'")
-        self.logger.info(f"  - Total inserted records: {format(int(self.inserted_records), ',')} ")
+        self.logger.info(f"  - Total inserted records: {format(int(metrics.rows), ',')} ")
         self.logger.info(f"  - Records inserted in this run: {records_inserted}")
-        self.logger.info(f"  - Total time elapsed: {self.format_time(elapsed_time_global)}")
+        self.logger.info(f"  - Total time elapsed: {self.format_time(elapsed_time)}")
         self.logger.info(f"  - Average processed per minute: {format(int(avg_per_minute), ',')}")
+        self.logger.info(f"  - Time spent: {stage_times} in {metrics.batches} batches")
+        metrics.log()
 
-        return records_inserted
+    def execute_statements(
+            self,
+            full_table_name: str,
+            statements: Iterable[StatementBatch],
+            plan: InsertPlan,
+            commit_policy: CommitPolicy,
+            total_records: Optional[int] = None,
+            batch_sizer: Optional[AdaptiveBatchSize] = None,
+    ) -> int:
+        """Execute statement batches on one connection, committing per `commit_policy`.
+
+        Rows only count as inserted once the transaction holding them is
+        committed, and the last transaction is committed before returning, so
+        the target only emits STATE for rows that are durable.
+
+        Transient errors (lock wait timeout, deadlock, lost connection) roll
+        back the open transaction. It is replayed on a new connection after
+        an exponential backoff, up to `max_retries` times. A batch that fails
+        with an error its rows may cause is split up by `insert_bisected`: the
+        other rows are loaded, and the failing ones go to the dead-letter
+        queue, a table in the same transaction or a file once it commits.
+
+        Args:
+            full_table_name: The target table name, for logging.
+            statements: The statement batches to execute.
+            plan: The insert plan the rows were built with.
+            commit_policy: Decides when to commit.
+            total_records: The number of records in the drain, if known.
+            batch_sizer: Adaptive batch size to report statement latencies to.
+
+        Returns:
+            The number of records committed.
+
+        Raises:
+            sqlalchemy.exc.DBAPIError: If retries run out, the error can't be
+                caused by single rows, or rows are rejected and there is no
+                dead-letter queue.
+        """
+        retry_policy = RetryPolicy.from_config(self.config)
+        projection = plan.projection
+        records_committed = 0
+        # Batches applied in the open transaction, replayed if it is retried.
+        pending: List[StatementBatch] = []
+        # Rows rejected in the open transaction.
+        rejected: List[RejectedRow] = []
+        last_committed_row = None
+        connection = None
+        transaction = None
+
+        def restart(new_connection: bool = True) -> None:
+            """Roll back the open transaction and replay the pending batches in a new one."""
+            nonlocal connection, transaction
+            if new_connection:
+                close()
+                connection = self.connector._engine.connect()
+            else:
+                transaction.rollback()
+            transaction = connection.begin()
+            for done in pending:
+                connection.exec_driver_sql(done.statement, done.params)
+
+        def close() -> None:
+            if connection is not None:
+                try:
+                    connection.close()
+                except sqlalchemy.exc.DBAPIError:
+                    pass  # The connection is already broken.
+
+        def with_retries(operation: Callable[[], Any], restart_first: bool = False) -> Any:
+            """Run `operation` in the open transaction, replaying it after transient errors."""
+
+            def run() -> Any:
+                nonlocal restart_first
+                if restart_first:
+                    restart()
+                restart_first = True
+                return operation()
+
+            def log_retry(error: BaseException, attempt: int, delay: float) -> None:
+                self.metrics.add_retry()
+                self.logger.warning(
+                    f"Transient error writing to '{full_table_name}' ({getattr(error, 'orig', error)}), "
+                    f"replaying {len(pending)} uncommitted batches in {delay:.1f}s "
+                    f"(retry {attempt}/{retry_policy.max_retries})"
+                )
+
+            return retry_policy.call(run, on_retry=log_retry)
+
+        def apply(batch: StatementBatch) -> StatementBatch:
+            """Execute a new batch and return what was applied of it."""
+            self.metrics.add_batch(batch.row_count)
+            started_at = time.perf_counter()
+            try:
+                with self.metrics.timed("execute"):
+                    connection.exec_driver_sql(batch.statement, batch.params)
+            except sqlalchemy.exc.DBAPIError as e:
+                if not is_row_error(e):
+                    raise
+                self.logger.warning(
+                    f"Batch of {batch.row_count} records to '{full_table_name}' failed "
+                    f"({e.orig}), isolating the failing records"
+                )
+                # The failed statement may have applied part of the batch.
+                restart(new_connection=False)
+                with self.metrics.timed("execute"):
+                    accepted, failed = self.insert_bisected(connection, plan, batch.rows)
+                if self.dead_letter_queue is None:
+                    for row in failed:
+                        self.logger.error(f"Rejected record {row.record}: {row.error}")
+                    self.logger.error(
+                        f"{len(failed)} records were rejected by '{full_table_name}'. "
+                        "Set dead_letter_path or dead_letter_table to load the other records."
+                    )
+                    raise
+                rejected.extend(failed)
+                return StatementBatch(
+                    plan.insert_sql,
+                    accepted,
+                    len(accepted),
+                    batch.byte_count * len(accepted) // max(batch.row_count, 1),
+                    accepted,
+                )
+            if batch_sizer:
+                batch_sizer.record(
+                    batch.row_count, batch.byte_count, time.perf_counter() - started_at
+                )
+            return batch
+
+        def commit() -> None:
+            nonlocal transaction
+            if rejected and self.dead_letter_queue.in_transaction:
+                self.dead_letter_queue.write(full_table_name, rejected, connection)
+            transaction.commit()
+            transaction = connection.begin()
+
+        def committed(elapsed: float) -> None:
+            nonlocal records_committed, last_committed_row
+            pending_records = sum(batch.row_count for batch in pending)
+            records_committed += pending_records
+            self.metrics.add_time("commit", elapsed)
+            self.metrics.add_rows(pending_records, sum(batch.byte_count for batch in pending))
+            last_row = next((batch.last_row for batch in reversed(pending) if batch.rows), None)
+            last_committed_row = last_row or last_committed_row
+            self.logger.info(
+                f"Committed {pending_records} records to '{full_table_name}' "
+                f"in {elapsed:.3f}s ({commit_policy.policy} policy)"
+            )
+            # Log every commit with key information
+            if self.key_properties and last_row:
+                key_info = projection.key_values(last_row)
+                self.logger.info(f"Successfully inserted batch ending with record: {key_info}")
+            if rejected:
+                self.metrics.add_rejected(len(rejected))
+                if not self.dead_letter_queue.in_transaction:
+                    self.dead_letter_queue.write(full_table_name, rejected)
+                self.logger.warning(
+                    f"Sent {len(rejected)} rejected records to "
+                    f"{self.dead_letter_queue.describe(full_table_name)}"
+                )
+            self.logger.info(f"Progress: {records_committed}/{total_records or '?'} records inserted")
+
+            pending.clear()
+            rejected.clear()
+            commit_policy.reset()
+
+        try:
+            with_retries(lambda: None, restart_first=True)
+            commit_policy.reset()
+            for batch in statements:
+                applied = with_retries(lambda: apply(batch))
+                if applied.rows:
+                    pending.append(applied)
+                commit_policy.add(batch.row_count, batch.byte_count)
+
+                if commit_policy.due() and (pending or rejected):
+                    started_at = time.perf_counter()
+                    with_retries(commit)
+                    committed(time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            with_retries(commit)
+            if pending or rejected:
+                committed(time.perf_counter() - started_at)
+        except Exception as e:
+            self.logger.error(f"Error inserting batch: {e}")
+            # Log the last successful record before the error
+            if last_committed_row and self.key_properties:
+                key_info = projection.key_values(last_committed_row)
+                self.logger.error(f"Last successfully inserted record before error: {key_info}")
+            self.logger.error(f"Stopped at {records_committed}/{total_records or '?'} records")
+            raise
+        finally:
+            close()
+
+        return records_committed
+
+    def insert_bisected(
+            self,
+            connection: sqlalchemy.engine.Connection,
+            plan: InsertPlan,
+            rows: Sequence[Sequence[Any]],
+    ) -> Tuple[List[Sequence[Any]], List[RejectedRow]]:
+        """Insert rows in ever smaller parts until the failing rows are isolated.
+
+        Each part runs in its own savepoint. A part that fails is rolled back
+        and split in half, down to single rows, so one bad row costs about
+        log2(len(rows)) extra statements.
+
+        Args:
+            connection: The connection, inside a transaction.
+            plan: The insert plan of the table.
+            rows: The rows of the failed batch.
+
+        Returns:
+            The inserted rows, in order, and the rejected rows with their errors.
+        """
+        accepted: List[Sequence[Any]] = []
+        rejected: List[RejectedRow] = []
+        parts = [list(rows)]
+        while parts:
+            part = parts.pop()
+            savepoint = connection.begin_nested()
+            try:
+                connection.exec_driver_sql(plan.insert_sql, part)
+            except sqlalchemy.exc.DBAPIError as e:
+                if not is_row_error(e):
+                    raise
+                savepoint.rollback()
+                if len(part) == 1:
+                    record = dict(zip(plan.column_names, part[0]))
+                    rejected.append(RejectedRow(record, str(e.orig)))
+                else:
+                    middle = len(part) // 2
+                    parts.append(part[middle:])
+                    parts.append(part[:middle])
+                continue
+            savepoint.commit()
+            accepted.extend(part)
+        return accepted, rejected
+
+    def generate_insert_batches(
+            self,
+            plan: InsertPlan,
+            records: List[Dict[str, Any]],
+            batch_size: int,
+            measure_bytes: bool = False,
+            batch_sizer: Optional[AdaptiveBatchSize] = None,
+    ) -> Iterable[StatementBatch]:
+        """Split records into `batch_size` executemany batches of the plan's INSERT.
+
+        Args:
+            plan: The insert plan of the target table.
+            records: The raw records to insert.
+            batch_size: The number of rows per statement batch.
+            measure_bytes: Whether to estimate the byte size of each batch.
+            batch_sizer: Adaptive batch size that overrides `batch_size`,
+                read again before each batch.
+
+        Yields:
+            One statement batch per `batch_size` records.
+        """
+        i = 0
+        while i < len(records):
+            size = batch_sizer.size if batch_sizer else batch_size
+            rows = plan.projection.project_all(records[i:i+size])
+            i += size
+            byte_count = 0
+            if measure_bytes:
+                byte_count = sum(sum(map(literal_size, row)) for row in rows)
+            yield StatementBatch(plan.insert_sql, rows, len(rows), byte_count, rows)
+
+    def get_batch_sizer(self, full_table_name: str) -> Optional[AdaptiveBatchSize]:
+        """Return the adaptive batch size of a table, or None if batches are fixed.
+
+        The size is kept per table across drains, starting from `batch_size`
+        and bounded by the server's `max_allowed_packet`.
+        """
+        if not self.config.get("adaptive_batch_size"):
+            return None
+
+        batch_sizer = self._batch_sizers.get(full_table_name)
+        if batch_sizer is None:
+            batch_sizer = self._batch_sizers[full_table_name] = AdaptiveBatchSize(
+                self.config.get("batch_size", 100),
+                target_seconds=self.config.get("batch_target_seconds", DEFAULT_BATCH_TARGET_SECONDS),
+                max_bytes=self.connector.max_allowed_packet - PACKET_HEADROOM,
+                max_size=self.MAX_SIZE_DEFAULT,
+            )
+        return batch_sizer
+
+    def get_insert_plan(self, full_table_name: str, schema: dict) -> InsertPlan:
+        """Return the insert plan for a table, building it when the schema changes.
+
+        The plan holds the column list, the record projection with its value
+        converters and the INSERT statement. It is cached per table and only
+        rebuilt when `schema` differs from the one it was built from.
+
+        Args:
+            full_table_name: The target table name.
+            schema: The raw JSON schema of the stream.
+
+        Returns:
+            The insert plan for the table.
+        """
+        plan = self._insert_plans.get(full_table_name)
+        if plan is not None and plan.matches(schema):
+            return plan
+
+        columns = self.column_representation(schema)
+        projection = self.compile_projection(schema, columns)
+        upsert_clause = self.generate_upsert_clause(projection.column_names)
+        plan = InsertPlan(
+            schema=schema,
+            fingerprint=schema_fingerprint(schema),
+            columns=columns,
+            projection=projection,
+            insert_sql=self.generate_insert_statement(full_table_name, schema) + upsert_clause,
+            upsert_clause=upsert_clause,
+        )
+        self._insert_plans[full_table_name] = plan
+        self.logger.debug(f"Built insert plan for '{full_table_name}': {plan.insert_sql}")
+        driver = self.connector.driver_profile
+        if driver.rewrites_executemany(plan.insert_sql) is False:
+            self.logger.warning(
+                f"{driver.package} won't rewrite the INSERT statements of '{full_table_name}' "
+                "into multi-row ones; batches are sent a row per statement"
+            )
+        return plan
+
+    def compile_projection(self, schema: dict, columns: List[Column]) -> RecordProjection:
+        """Compile the projection of raw records onto `columns`.
+
+        Args:
+            schema: The raw JSON schema of the stream.
+            columns: The table columns from `column_representation`, in
+                property order.
+
+        Returns:
+            The projection from raw records to rows in column order.
+        """
+        property_names = list(schema["properties"].keys())
+        column_names = [column.name for column in columns]
+
+        converters = []
+        for position, column in enumerate(columns):
+            converter = self.get_value_converter(column.type)
+            if converter is not None:
+                converters.append((position, converter))
+
+        key_positions = [
+            column_names.index(key) for key in self.key_properties if key in column_names
+        ]
+
+        return RecordProjection(
+            property_names,
+            column_names,
+            converters,
+            key_positions,
+        )
+
+    def get_value_converter(
+            self,
+            sql_type: sqlalchemy.types.TypeEngine,
+    ) -> Optional[Callable[[Any], Any]]:
+        """Return the function that prepares non-null values for a column type.
+
+        Args:
+            sql_type: The column's SQL type, from `MySQLConnector.to_sql_type`.
+
+        Returns:
+            A converter, or None if values are passed to the driver as they are.
+        """
+        # Objects and arrays are stored as JSON text; untyped properties map to TEXT.
+        if isinstance(sql_type, (mysql.JSON, sqlalchemy.types.Text)):
+            return self.json_engine.encode_json
+        return None
+
+    def generate_insert_statement(
+            self,
+            full_table_name: str,
+            schema: dict,
+    ) -> str:
+        """Generate a positional insert statement for rows from `compile_projection`.
+
+        The statement uses the driver's `%s` placeholders, so projected rows
+        are executed with `exec_driver_sql` without building a dict per row.
+        """
+        column_names = [self.conform_name(name, "column") for name in schema["properties"]]
+        return (
+            f"INSERT INTO {full_table_name} ({', '.join(column_names)}) "
+            f"VALUES ({', '.join(['%s'] * len(column_names))})"
+        )
+
+    def generate_upsert_clause(self, column_names: Sequence[str]) -> str:
+        """Return the `ON DUPLICATE KEY UPDATE` clause for streams with keys.
+
+        Rows that match an existing key overwrite its other columns. A table
+        made only of key columns just keeps the existing row.
+
+        Args:
+            column_names: The inserted columns.
+        """
+        if not self.key_properties:
+            return ""
+
+        join_keys = [self.conform_name(key, "column") for key in self.key_properties]
+        update_columns = [name for name in column_names if name not in join_keys] or join_keys
+        upsert_on_condition = ", ".join(
+            [f"{name}=VALUES({name})" for name in update_columns]
+        )
+        return f" ON DUPLICATE KEY UPDATE {upsert_on_condition}"
+
+    def generate_multi_row_insert_statements(
+            self,
+            full_table_name: str,
+            column_names: List[str],
+            rows: Iterable[Sequence[Any]],
+            max_statement_bytes: int,
+    ) -> Iterable[StatementBatch]:
+        """Build multi-row `INSERT ... VALUES (...),(...)` statements.
+
+        Rows are packed into each statement until the estimated size of the
+        statement, once the driver has quoted the values, would exceed
+        `max_statement_bytes`. A row that is larger than the limit on its own
+        is sent in a statement by itself.
+
+        Args:
+            full_table_name: The target table name.
+            column_names: The target columns, in row order.
+            rows: Rows of driver-ready values, in column order.
+            max_statement_bytes: The size limit of a single statement.
+
+        Yields:
+            One statement batch per statement, with a flat parameter tuple.
+        """
+        prefix = f"INSERT INTO {full_table_name} ({', '.join(column_names)}) VALUES "
+        suffix = self.generate_upsert_clause(column_names)
+        row_placeholder = f"({', '.join(['%s'] * len(column_names))})"
+        fixed_size = len(prefix.encode("utf-8")) + len(suffix.encode("utf-8"))
+        # Separator and parentheses around each row.
+        row_overhead = 3 + 2 * len(column_names)
+
+        def statement_batch() -> StatementBatch:
+            return StatementBatch(
+                prefix + ", ".join([row_placeholder] * row_count) + suffix,
+                tuple(params),
+                row_count,
+                statement_size,
+                batch_rows,
+            )
+
+        params: List[Any] = []
+        batch_rows: List[Sequence[Any]] = []
+        row_count = 0
+        statement_size = fixed_size
+        for row in rows:
+            row_size = row_overhead + sum(map(literal_size, row))
+            if row_count and statement_size + row_size > max_statement_bytes:
+                yield statement_batch()
+                params = []
+                batch_rows = []
+                row_count = 0
+                statement_size = fixed_size
+
+            params.extend(row)
+            batch_rows.append(row)
+            row_count += 1
+            statement_size += row_size
+
+        if row_count:
+            yield statement_batch()
+
+    def load_data_records(
+            self,
+            full_table_name: str,
+            schema: dict,
+            records: List[Dict[str, Any]],
+    ) -> Optional[int]:
+        """Load records with `LOAD DATA LOCAL INFILE`.
+
+        The batch is written to a temporary tab separated file and loaded in a
+        single statement. Streams with key properties replace existing rows
+        unless `load_data_duplicates` is set to `ignore`.
+
+        Returns:
+            The number of records loaded, or None if the server refused the
+            load or it failed, and the INSERT path should be used instead.
+        """
+        plan = self.get_insert_plan(full_table_name, schema)
+        projection = plan.projection
+        duplicates = None
+        if self.key_properties:
+            duplicates = self.config.get("load_data_duplicates", "replace")
+
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            newline="",
+            prefix="target_mysql_",
+            suffix=".tsv",
+            delete=False,
+        ) as buffer, self.metrics.timed("serialize"):
+            file_path = buffer.name
+            if self.config.get("batch_format") == "arrow":
+                total_records, vectorized = columnar.write_columns(
+                    buffer,
+                    projection,
+                    [column.type for column in plan.columns],
+                    records,
+                )
+                self.logger.debug(
+                    f"Formatted {vectorized} of {len(plan.columns)} columns "
+                    f"of '{full_table_name}' with Arrow"
+                )
+            else:
+                total_records = load_data.write_rows(
+                    buffer,
+                    map(projection.project, records),
+                )
+
+        load_sql = load_data.build_load_data_statement(
+            file_path.replace(os.sep, "/"),
+            full_table_name,
+            projection.column_names,
+            duplicates,
+        )
+        self.logger.debug("Loading with SQL: %s", load_sql)
+
+        file_size = os.path.getsize(file_path)
+        started_at = time.perf_counter()
+        try:
+            with self.connector._connect() as connection, connection.begin():
+                connection.exec_driver_sql(load_sql)
+        except sqlalchemy.exc.DBAPIError as e:
+            if error_code(e) in load_data.LOCAL_INFILE_DISABLED_ERRORS:
+                self.logger.warning(
+                    f"LOAD DATA LOCAL INFILE refused ({e.orig}), "
+                    "falling back to INSERT statements."
+                )
+                self.connector.disable_local_infile()
+                return None
+            if not (is_transient(e) or is_row_error(e)):
+                raise
+            # The INSERT path retries transient errors and isolates bad rows.
+            self.logger.warning(
+                f"LOAD DATA into '{full_table_name}' failed ({e.orig}), "
+                "loading this batch with INSERT statements."
+            )
+            return None
+        finally:
+            os.remove(file_path)
+
+        elapsed = time.perf_counter() - started_at
+        self.metrics.add_time("execute", elapsed)
+        self.metrics.add_batch(total_records)
+        self.metrics.add_rows(total_records, file_size)
+        self.logger.info(
+            f"Loaded and committed {total_records} records into '{full_table_name}' "
+            f"with LOAD DATA in {elapsed:.3f}s"
+        )
+        return total_records
 
     def column_representation(
             self,
@@ -800,6 +2015,14 @@ class MySQLSink(SQLSink):
         Returns:
             The name transformed to snake case.
         """
+        conformed_name = self._conformed_names.get(name)
+        if conformed_name is None:
+            conformed_name = self._conform_name(name)
+            self._conformed_names[name] = conformed_name
+        return conformed_name
+
+    def _conform_name(self, name: str) -> str:
+        """Apply the configured name transformations, without caching."""
         if self.config.get("move_leading_underscores", True):
             name = self.move_leading_underscores(name)
         
@@ -2,14 +2,29 @@
 
 from __future__ import annotations
 
-import io
-import simplejson as json
-
 from singer_sdk import typing as th
+from singer_sdk.sinks import Sink
 from singer_sdk.target_base import SQLTarget
 import typing as t
 
+from target_mysql.async_writer import (
+    ASYNC_DRIVERS,
+    DEFAULT_ASYNC_MAX_IN_FLIGHT,
+    DEFAULT_ASYNC_POOL_SIZE,
+    WRITE_ENGINES,
+    AsyncWriter,
+    get_async_writer,
+)
+from target_mysql.buffering import MemoryBudget
+from target_mysql.columnar import BATCH_FORMATS, check_batch_format
+from target_mysql.datetimes import DEFAULT_DATETIME_CACHE_SIZE, get_time_zone
+from target_mysql.journal import DEFAULT_JOURNAL_SEGMENT_BYTES, Journal
+from target_mysql.json_engine import JSON_ENGINES, get_json_engine
+from target_mysql.metrics import StreamMetrics, write_prometheus
+from target_mysql.profiling import PROFILE_MODES, DrainProfiler
+from target_mysql.session import ISOLATION_LEVELS, SESSION_PROFILES, get_session_profile
 from target_mysql.sinks import (
+    DEFAULT_MAX_PARALLEL_STREAMS,
     MySQLSink,
 )
 
@@ -32,7 +47,9 @@ class TargetMySQL(SQLTarget):
             "driver_name",
             th.StringType,
             default="mysql",
-            description="SQLAlchemy driver name",
+            description="SQLAlchemy dialect and driver: mysql or mysql+mysqldb (mysqlclient), "
+                        "mysql+mysqlconnector (mysql-connector) or mysql+pymysql (PyMySQL); "
+                        "not used when sqlalchemy_url is set",
         ),
         th.Property(
             "username",
@@ -80,6 +97,17 @@ class TargetMySQL(SQLTarget):
             description="Allow column alter",
             default=False
         ),
+        th.Property(
+            "alter_algorithm",
+            th.StringType(allowed_values=["INSTANT", "INPLACE", "COPY"]),
+            description="ALGORITHM requested for schema changes; INSTANT falls back "
+                        "to INPLACE, and both to the server default, when refused",
+        ),
+        th.Property(
+            "alter_lock",
+            th.StringType(allowed_values=["NONE", "SHARED", "EXCLUSIVE"]),
+            description="LOCK requested for schema changes, dropped when refused",
+        ),
         th.Property(
             "replace_null",
             th.BooleanType,
@@ -92,45 +120,480 @@ class TargetMySQL(SQLTarget):
             description="Number of records to insert in a single batch",
             default=100
         ),
+        th.Property(
+            "create_primary_keys",
+            th.BooleanType,
+            description="Create new tables with the stream's key properties as "
+                        "their primary key",
+            default=False
+        ),
+        th.Property(
+            "upsert_method",
+            th.StringType(allowed_values=["direct", "merge"]),
+            description="How streams with key properties are upserted: "
+                        "ON DUPLICATE KEY UPDATE on every insert, or a bulk load "
+                        "into a staging table merged with one INSERT ... SELECT",
+            default="direct"
+        ),
+        th.Property(
+            "deduplicate_records",
+            th.BooleanType,
+            description="Send only the last record of each key in a batch, for "
+                        "streams with key properties",
+            default=False
+        ),
+        th.Property(
+            "adaptive_batch_size",
+            th.BooleanType,
+            description="Size INSERT batches from measured row width and latency, "
+                        "starting at batch_size and capped by max_allowed_packet",
+            default=False
+        ),
+        th.Property(
+            "batch_target_seconds",
+            th.NumberType,
+            description="Execution time aimed at for each batch when "
+                        "adaptive_batch_size is enabled",
+            default=1.0
+        ),
+        th.Property(
+            "load_method",
+            th.StringType(allowed_values=["insert", "multi_insert", "load_data"]),
+            description="How batches are written: parameterized INSERT statements, "
+                        "multi-row INSERT statements sized to max_allowed_packet "
+                        "or LOAD DATA LOCAL INFILE",
+            default="insert"
+        ),
+        th.Property(
+            "load_data_duplicates",
+            th.StringType(allowed_values=["replace", "ignore"]),
+            description="How LOAD DATA handles rows with duplicate keys "
+                        "for streams with key properties",
+            default="replace"
+        ),
+        th.Property(
+            "commit_policy",
+            th.StringType(allowed_values=["batch", "rows", "bytes", "seconds", "drain"]),
+            description="When to commit while loading: after every statement batch, "
+                        "every commit_interval rows, bytes or seconds, or once per drain",
+            default="batch"
+        ),
+        th.Property(
+            "max_parallel_streams",
+            th.IntegerType,
+            description="Number of streams drained concurrently, and the size of "
+                        "the shared connection pool",
+            default=8
+        ),
+        th.Property(
+            "pipeline_depth",
+            th.IntegerType,
+            description="Number of statement batches built on a background thread "
+                        "while the current batch executes; 0 disables the pipeline",
+            default=2
+        ),
+        th.Property(
+            "json_engine",
+            th.StringType(allowed_values=list(JSON_ENGINES)),
+            description="JSON library used to parse input and encode JSON columns: "
+                        "auto (orjson when installed), orjson or stdlib",
+            default="auto"
+        ),
+        th.Property(
+            "batch_format",
+            th.StringType(allowed_values=list(BATCH_FORMATS)),
+            description="How LOAD DATA batches are formatted: rows, one record at a "
+                        "time, or arrow, a column at a time with vectorized type "
+                        "coercion (requires pyarrow)",
+            default="rows"
+        ),
+        th.Property(
+            "datetime_time_zone",
+            th.StringType,
+            description="Time zone, such as UTC or Europe/Berlin, that date-time values "
+                        "with a UTC offset are converted to before loading; when unset, "
+                        "the offset is dropped and the wall time kept",
+        ),
+        th.Property(
+            "datetime_cache_size",
+            th.IntegerType,
+            description="Date-like strings whose MySQL literals are cached per stream "
+                        "and type; 0 disables the cache",
+            default=DEFAULT_DATETIME_CACHE_SIZE
+        ),
+        th.Property(
+            "write_engine",
+            th.StringType(allowed_values=list(WRITE_ENGINES)),
+            description="How INSERT batches are written: sync, on the draining thread, or "
+                        "async, several drains in flight over an async connection pool "
+                        "(requires asyncmy or aiomysql)",
+            default="sync"
+        ),
+        th.Property(
+            "async_driver",
+            th.StringType(allowed_values=list(ASYNC_DRIVERS)),
+            description="Async MySQL driver of the async write engine: auto (asyncmy when "
+                        "installed, else aiomysql), asyncmy or aiomysql",
+            default="auto"
+        ),
+        th.Property(
+            "async_pool_size",
+            th.IntegerType,
+            description="Connections of the async write engine's pool",
+            default=DEFAULT_ASYNC_POOL_SIZE
+        ),
+        th.Property(
+            "async_max_in_flight",
+            th.IntegerType,
+            description="Drains the async write engine has in flight at most; reading "
+                        "input waits while there are more",
+            default=DEFAULT_ASYNC_MAX_IN_FLIGHT
+        ),
+        th.Property(
+            "pool_size",
+            th.IntegerType,
+            description="Connections of the shared connection pool; defaults to "
+                        "max_parallel_streams",
+        ),
+        th.Property(
+            "pool_pre_ping",
+            th.BooleanType,
+            description="Test each connection when it is checked out of the pool and "
+                        "replace it if the server closed it",
+            default=False
+        ),
+        th.Property(
+            "pool_recycle",
+            th.IntegerType,
+            description="Seconds after which a pooled connection is replaced; when "
+                        "unset, connections are kept",
+        ),
+        th.Property(
+            "session_profile",
+            th.StringType(allowed_values=list(SESSION_PROFILES)),
+            description="Session variables set on each connection: default (the "
+                        "server's), bulk_load (unique and foreign key checks off, READ "
+                        "COMMITTED, a longer lock wait timeout) or custom "
+                        "(session_variables only)",
+            default="default"
+        ),
+        th.Property(
+            "session_isolation_level",
+            th.StringType(allowed_values=list(ISOLATION_LEVELS)),
+            description="transaction_isolation of the bulk_load and custom session profiles",
+        ),
+        th.Property(
+            "session_lock_wait_timeout",
+            th.IntegerType,
+            description="innodb_lock_wait_timeout, in seconds, of the bulk_load and "
+                        "custom session profiles",
+        ),
+        th.Property(
+            "session_disable_binlog",
+            th.BooleanType,
+            description="Set sql_log_bin=0 in the bulk_load and custom session profiles, "
+                        "where the user is allowed to",
+            default=False
+        ),
+        th.Property(
+            "session_variables",
+            th.ObjectType(),
+            description="Session variables, by name, set by the bulk_load and custom "
+                        "session profiles after the other session settings",
+        ),
+        th.Property(
+            "max_retries",
+            th.IntegerType,
+            description="Retries of a transaction after a lock wait timeout, deadlock "
+                        "or lost connection",
+            default=5
+        ),
+        th.Property(
+            "retry_backoff_seconds",
+            th.NumberType,
+            description="Wait before the first retry, doubled for each next one",
+            default=1.0
+        ),
+        th.Property(
+            "dead_letter_path",
+            th.StringType,
+            description="Directory where rows rejected by MySQL are written, "
+                        "as one <table>.jsonl file per table",
+        ),
+        th.Property(
+            "dead_letter_table",
+            th.StringType,
+            description="Table where rows rejected by MySQL are inserted; takes "
+                        "precedence over dead_letter_path",
+        ),
+        th.Property(
+            "metrics_path",
+            th.StringType,
+            description="File rewritten with per-stream metrics in the Prometheus "
+                        "text format after every drain",
+        ),
+        th.Property(
+            "profile_path",
+            th.StringType,
+            description="Directory where the profiles of drains of profile_streams are written",
+        ),
+        th.Property(
+            "profile_streams",
+            th.ArrayType(th.StringType),
+            description="Streams whose drains are profiled, or [\"*\"] for all of them",
+        ),
+        th.Property(
+            "profile_mode",
+            th.StringType(allowed_values=list(PROFILE_MODES)),
+            description="Profile drains with cProfile, tracemalloc or both",
+            default="cprofile"
+        ),
+        th.Property(
+            "profile_every",
+            th.IntegerType,
+            description="Profiled drains written to each profile file",
+            default=10
+        ),
+        th.Property(
+            "profile_sample_rate",
+            th.NumberType,
+            description="Fraction of the drains of profiled streams that are profiled",
+            default=0.1
+        ),
+        th.Property(
+            "max_buffer_bytes",
+            th.IntegerType,
+            description="Bytes of input JSON buffered by all streams together before "
+                        "the largest buffer is drained, or spilled to spill_path",
+        ),
+        th.Property(
+            "spill_path",
+            th.StringType,
+            description="Directory where buffers over max_buffer_bytes are spilled "
+                        "as compressed files, loaded at the stream's next drain",
+        ),
+        th.Property(
+            "journal_path",
+            th.StringType,
+            description="Directory of the write-ahead journal. Input is journaled before "
+                        "it is loaded, STATE is emitted once journaled, and a restart "
+                        "replays what wasn't loaded",
+        ),
+        th.Property(
+            "journal_segment_bytes",
+            th.IntegerType,
+            description="Size of the journal segment files",
+            default=DEFAULT_JOURNAL_SEGMENT_BYTES
+        ),
+        th.Property(
+            "commit_interval",
+            th.NumberType,
+            description="Rows, bytes or seconds between commits for the rows, bytes "
+                        "and seconds commit policies",
+        ),
     ).to_dict()
 
-    schema_properties = {}
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sinks of different streams drain in this many threads, sharing the
+        # connector's connection pool. STATE is written once all of them finish.
+        self.max_parallelism = self.config.get("max_parallel_streams") or DEFAULT_MAX_PARALLEL_STREAMS
+        # Per stream: property name -> factory of the value that replaces null.
+        self._null_replacements: t.Dict[str, t.Dict[str, t.Callable[[], t.Any]]] = {}
+        self.json_engine = get_json_engine(self.config.get("json_engine"))
+        self.logger.info(f"Using the {self.json_engine.name} JSON engine")
+        check_batch_format(self.config.get("batch_format"))
+        get_time_zone(self.config.get("datetime_time_zone"))
+        get_session_profile(self.config)
+        # Per stream, kept across the sinks that replace each other on schema changes.
+        self.stream_metrics: t.Dict[str, StreamMetrics] = {}
+        self.stream_profilers: t.Dict[str, t.Optional[DrainProfiler]] = {}
+        # Bytes of input buffered by all sinks, if max_buffer_bytes is set.
+        self.memory_budget: t.Optional[MemoryBudget] = None
+        if self.config.get("max_buffer_bytes"):
+            self.memory_budget = MemoryBudget(self.config["max_buffer_bytes"])
+        self._last_line_bytes = 0
+        self.journal: t.Optional[Journal] = None
+        if self.config.get("journal_path"):
+            self.journal = Journal(
+                self.config["journal_path"],
+                self.config.get("journal_segment_bytes") or DEFAULT_JOURNAL_SEGMENT_BYTES,
+            )
+        self._replaying = False
+        self._journal_replayed = False
+        # Shared by all sinks when write_engine is async; started with the first sink.
+        self.async_writer: t.Optional[AsyncWriter] = None
+
+    def deserialize_json(self, line: str) -> dict:
+        """Deserialize a line of json with the configured JSON engine."""
+        self._last_line_bytes = len(line)
+        try:
+            return self.json_engine.loads(line)
+        except ValueError:
+            self.logger.error(f"Unable to parse:\n{line}")
+            raise
+
+    @staticmethod
+    def get_null_replacements(schema: dict) -> t.Dict[str, t.Callable[[], t.Any]]:
+        """Return the null replacement factory of each non-nullable property.
 
-    def _process_lines(self, file_input: t.IO[str]) -> t.Counter[str]:
+        https://json-schema.org/understanding-json-schema/reference/type.html
+        """
+        replacements = {}
+        for key, property_schema in schema.get("properties", {}).items():
+            _type = property_schema.get("type")
+            data_types = _type if isinstance(_type, list) else [_type]
+
+            if _type is None or "null" in data_types:
+                continue
+            if "string" in data_types:
+                replacements[key] = str
+            elif "object" in data_types:
+                replacements[key] = dict
+            elif "array" in data_types:
+                replacements[key] = list
+            elif "boolean" in data_types:
+                replacements[key] = bool
+            else:
+                replacements[key] = int
+
+        return replacements
+
+    def add_sink(
+        self,
+        stream_name: str,
+        schema: dict,
+        key_properties: t.Optional[t.List[str]] = None,
+    ) -> Sink:
+        """Create a sink and register it.
+
+        The sink gets the stream's metrics and profiler, which outlive it, and
+        the memory budget and async writer shared by all sinks.
+        """
+        sink = super().add_sink(stream_name, schema, key_properties)
+        sink.metrics = self.stream_metrics.setdefault(stream_name, sink.metrics)
+        sink.profiler = self.stream_profilers.setdefault(stream_name, sink.profiler)
+        sink.memory_budget = self.memory_budget
+        if self.async_writer is None:
+            session_profile = sink.connector.session_profile
+            self.async_writer = get_async_writer(
+                self.config,
+                sink.connector.sqlalchemy_url,
+                self.logger,
+                session_profile.set_statement if session_profile is not None else None,
+            )
+            if self.async_writer is not None:
+                self.logger.info(
+                    f"Writing INSERT batches with the {self.async_writer.driver} async engine"
+                )
+        sink.async_writer = self.async_writer
+        return sink
+
+    def _write_state_message(self, state: dict) -> None:
+        """Wait for async writes, write the metrics textfile, then emit the state.
+
+        Called at the end of every drain, once all sinks are drained. In
+        journal mode, STATE was already emitted when it was journaled, so the
+        journal is marked applied instead.
+        """
+        if self.async_writer is not None:
+            # Raises if a write failed, so STATE is only emitted for committed records.
+            self.async_writer.wait()
+        metrics_path = self.config.get("metrics_path")
+        if metrics_path:
+            try:
+                write_prometheus(metrics_path, self.stream_metrics.values())
+            except OSError as e:
+                self.logger.warning(f"Could not write metrics to '{metrics_path}': {e}")
+        if self.journal is not None:
+            self.journal.mark_applied()
+            return
+        super()._write_state_message(state)
+
+    def _process_endofpipe(self) -> None:
+        super()._process_endofpipe()
+        if self.async_writer is not None:
+            self.async_writer.close()
+
+    def replay_journal(self) -> None:
+        """Load the lines an earlier run journaled but didn't load, up to its last STATE."""
+        self.logger.info(
+            f"Replaying {len(self.journal.unapplied_on_start)} unapplied journal segments "
+            f"from '{self.journal.directory}'"
+        )
+        self._replaying = True
+        self._journal_replayed = True
+        try:
+            counter = self._process_lines(self.journal.replay_lines())
+        finally:
+            self._replaying = False
+        self.logger.info(f"Replayed journal: {dict(counter)}")
+        self.drain_all()
+
+    def _process_lines(self, file_input: t.Iterable[str]) -> t.Counter[str]:
+        """Journal the input lines as they are read, after replaying an earlier run's journal.
+
+        `listen` is final in the SDK, so the replay hooks in here, before the
+        first line of input.
+        """
+        if self.journal is not None and not self._replaying:
+            if self.journal.unapplied_on_start and not self._journal_replayed:
+                self.replay_journal()
+            file_input = self.journal.record(file_input)
+        return super()._process_lines(file_input)
+
+    def _process_state_message(self, message_dict: dict) -> None:
+        changed = message_dict.get("value") != self._latest_state
+        super()._process_state_message(message_dict)
+        if self.journal is not None and changed and not self._replaying:
+            # The records before this STATE are on disk, so it can be acknowledged now.
+            self.journal.sync()
+            super()._write_state_message(message_dict["value"])
+
+    def _process_schema_message(self, message_dict: dict) -> None:
         if self.config.get("replace_null", False):
-            processed_input = io.StringIO()
-            for line in file_input:
-                data = self.deserialize_json(line.strip())
-
-                if data.get('type', '') == 'SCHEMA':
-                    self.schema_properties = data['schema']['properties']
-                elif data.get('type', '') == 'RECORD':
-                    for key, value in data.get('record', {}).items():
-                        if value is not None:
-                            continue
-
-                        # https://json-schema.org/understanding-json-schema/reference/type.html
-                        _type = self.schema_properties[key]['type']
-                        data_types = _type if isinstance(_type, list) else [_type]
-
-                        if "null" in data_types:
-                            continue
-                        if "string" in data_types:
-                            data['record'][key] = ""
-                        elif "object" in data_types:
-                            data['record'][key] = {}
-                        elif "array" in data_types:
-                            data['record'][key] = []
-                        elif "boolean" in data_types:
-                            data['record'][key] = False
-                        else:
-                            data['record'][key] = 0
-
-                processed_input.write(json.dumps(data) + '\n')
-            processed_input.seek(0)
-            return super()._process_lines(processed_input)
-        else:
-            return super()._process_lines(file_input)
+            self._null_replacements[message_dict["stream"]] = self.get_null_replacements(
+                message_dict["schema"]
+            )
+        super()._process_schema_message(message_dict)
+
+    def _process_record_message(self, message_dict: dict) -> None:
+        replacements = self._null_replacements.get(message_dict.get("stream"))
+        if replacements:
+            record = message_dict.get("record", {})
+            for key, replacement in replacements.items():
+                if key in record and record[key] is None:
+                    record[key] = replacement()
+        super()._process_record_message(message_dict)
+        if self.memory_budget is not None:
+            self.enforce_memory_budget(message_dict["stream"])
+
+    def enforce_memory_budget(self, stream_name: str) -> None:
+        """Account for the record just read, then empty the largest buffers while over budget.
+
+        A buffer is spilled to disk when `spill_path` is set, and drained otherwise.
+
+        Args:
+            stream_name: The stream of the record.
+        """
+        budget = self.memory_budget
+        for stream_map in self.mapper.stream_maps[stream_name]:
+            sink = self._sinks_active.get(stream_map.stream_alias)
+            # A sink the record filled was drained, record included.
+            if sink is not None and sink.current_size:
+                budget.add(sink.stream_name, self._last_line_bytes)
+
+        while budget.exceeded:
+            largest = budget.largest()
+            sink = self._sinks_active.get(largest)
+            if sink is not None:
+                self.logger.info(
+                    f"Buffered records exceed max_buffer_bytes ({budget.total} bytes), "
+                    f"emptying the buffer of '{largest}' ({budget.buffered(largest)} bytes)"
+                )
+                if not sink.spill():
+                    self.drain_one(sink)
+            budget.release(largest)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+""" Tests for the async write engine, with an in-memory pool. """
+import asyncio
+import contextlib
+
+import pytest
+
+from target_mysql.async_writer import AsyncWriter, WriteJob, is_transient_driver_error
+from target_mysql.metrics import StreamMetrics
+from target_mysql.retry import RetryPolicy
+from target_mysql.sinks import StatementBatch
+
+
+class FakeCursor:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, statement, params):
+        await asyncio.sleep(self.pool.delays.get(statement, 0))
+        if self.pool.failures:
+            raise self.pool.failures.pop(0)
+        self.pool.executed.append((statement, params))
+
+    async def execute(self, statement, params):
+        await self.run(statement, params)
+
+    async def executemany(self, statement, params):
+        await self.run(statement, params)
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self):
+        return FakeCursor(self.pool)
+
+    async def commit(self):
+        self.pool.commits += 1
+
+    async def rollback(self):
+        self.pool.rollbacks += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.executed = []
+        self.failures = []
+        self.delays = {}
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.kwargs = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+def make_writer(pool):
+    async def create_pool(**kwargs):
+        pool.kwargs = kwargs
+        return pool
+    return AsyncWriter(
+        {"host": "db", "database": "warehouse"},
+        pool_size=2,
+        max_in_flight=4,
+        retry_policy=RetryPolicy(max_retries=2, backoff_seconds=0),
+        create_pool=create_pool,
+    )
+
+
+def job(table, rows, metrics, fallback=lambda: pytest.fail("unexpected fallback")):
+    statement = f"INSERT INTO {table} (id) VALUES (%s)"
+    batches = [StatementBatch(statement, [(row,) for row in rows], len(rows), 10 * len(rows), rows)]
+    return WriteJob(table, batches, metrics, fallback)
+
+
+def test_jobs_of_a_table_commit_in_order():
+    pool = FakePool()
+    writer = make_writer(pool)
+    metrics = StreamMetrics("users")
+    # The first job of `slow` takes longest; `fast` doesn't wait for it.
+    pool.delays["INSERT INTO slow (id) VALUES (%s)"] = 0.05
+    writer.submit(job("slow", [1, 2], metrics))
+    writer.submit(job("fast", [3], metrics))
+    writer.submit(job("slow", [4], metrics))
+
+    assert writer.wait() == 4
+    writer.close()
+
+    assert [params for _, params in pool.executed if "slow" in _] == [[(1,), (2,)], [(4,)]]
+    assert pool.executed[0][1] == [(3,)]
+    assert pool.commits == 3
+    assert metrics.rows == 4
+    assert pool.kwargs["maxsize"] == 2 and pool.kwargs["autocommit"] is False
+    assert pool.closed
+
+
+def test_transient_errors_are_retried():
+    pool = FakePool()
+    pool.failures.append(Exception(1213, "Deadlock found when trying to get lock"))
+    writer = make_writer(pool)
+    metrics = StreamMetrics("users")
+    writer.submit(job("users", [1], metrics))
+
+    assert writer.wait("users") == 1
+    writer.close()
+    assert metrics.retries == 1
+    assert pool.rollbacks == 1
+
+
+def test_other_errors_fall_back_to_sync_engine():
+    pool = FakePool()
+    pool.failures.append(Exception(1366, "Incorrect integer value"))
+    writer = make_writer(pool)
+    writer.submit(job("users", [1, 2], StreamMetrics("users"), fallback=lambda: 1))
+
+    assert writer.wait() == 1
+    writer.close()
+    assert pool.rollbacks == 1
+    assert pool.commits == 0
+
+
+def test_failed_write_stops_later_writes_of_its_table():
+    pool = FakePool()
+    writer = make_writer(pool)
+
+    def fallback():
+        raise ValueError("rejected rows and no dead-letter queue")
+
+    pool.failures.append(Exception(1366, "Incorrect integer value"))
+    writer.submit(job("users", [1], StreamMetrics("users"), fallback=fallback))
+    writer.submit(job("users", [2], StreamMetrics("users")))
+
+    with pytest.raises(ValueError):
+        writer.wait()
+    writer.close()
+    assert pool.executed == []
+
+
+def test_is_transient_driver_error():
+    assert is_transient_driver_error(Exception(2013, "Lost connection"))
+    assert is_transient_driver_error(ConnectionResetError())
+    assert not is_transient_driver_error(Exception(1062, "Duplicate entry"))
+    assert not is_transient_driver_error(Exception("no code"))
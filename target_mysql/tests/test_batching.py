@@ -0,0 +1,26 @@
+""" Tests for adaptive batch sizing. """
+from target_mysql.batching import AdaptiveBatchSize
+
+
+def test_grows_toward_target_latency_at_most_twofold():
+    sizer = AdaptiveBatchSize(100, target_seconds=1.0)
+    assert sizer.record(100, 10000, 0.01) == 200
+    assert sizer.record(200, 20000, 0.02) == 400
+
+
+def test_shrinks_when_slow():
+    sizer = AdaptiveBatchSize(1000, target_seconds=1.0)
+    assert sizer.record(1000, 100000, 4.0) == 500
+    assert sizer.record(500, 50000, 2.0) == 250
+
+
+def test_byte_budget_is_a_hard_cap():
+    sizer = AdaptiveBatchSize(100, target_seconds=1.0, max_bytes=50000)
+    assert sizer.record(100, 100000, 0.001) == 50
+    assert "bytes/row" in sizer.describe()
+
+
+def test_bounds():
+    sizer = AdaptiveBatchSize(10, target_seconds=1.0, min_size=5, max_size=15)
+    assert sizer.record(10, 100, 0.0) == 15
+    assert sizer.record(0, 0, 1.0) == 15
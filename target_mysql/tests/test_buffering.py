@@ -0,0 +1,48 @@
+""" Tests for the shared memory budget and spill files. """
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from target_mysql.buffering import MemoryBudget, SpillFiles
+
+
+def test_memory_budget():
+    budget = MemoryBudget(100)
+    budget.add("users", 60)
+    budget.add("orders", 30)
+    assert not budget.exceeded
+    budget.add("orders", 40)
+    assert budget.exceeded
+    assert budget.largest() == "orders"
+
+    budget.release("orders")
+    assert budget.total == 60
+    assert budget.largest() == "users"
+    budget.release("users")
+    assert budget.largest() is None
+
+
+def test_spill_files_round_trip(tmp_path):
+    spill_files = SpillFiles(str(tmp_path), "public-users")
+    first = [{"id": 1, "amount": Decimal("1.10"), "at": datetime.datetime(2023, 1, 1)}]
+    spill_files.write(first)
+    spill_files.write([{"id": 2}])
+    assert len(spill_files) == 2
+    assert all(p.name.startswith("public-users-") for p in tmp_path.iterdir())
+
+    assert list(spill_files.read_batches()) == [first, [{"id": 2}]]
+    assert len(spill_files) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_file_is_kept_when_loading_it_fails(tmp_path):
+    spill_files = SpillFiles(str(tmp_path), "users")
+    spill_files.write([{"id": 1}])
+
+    with pytest.raises(RuntimeError):
+        for _ in spill_files.read_batches():
+            raise RuntimeError("load failed")
+
+    assert len(spill_files) == 1
+    assert list(spill_files.read_batches()) == [[{"id": 1}]]
@@ -0,0 +1,78 @@
+""" Tests for the table catalog. """
+import contextlib
+import threading
+
+from target_mysql.catalog import CatalogColumn, TableCatalog, parse_column_type
+
+
+def test_parse_column_type():
+    assert repr(parse_column_type("varchar(255)")) == "VARCHAR(length=255)"
+    assert repr(parse_column_type("decimal(10,2)")) == "DECIMAL(precision=10, scale=2)"
+    assert repr(parse_column_type("int unsigned")) == "INTEGER(unsigned=True)"
+    assert repr(parse_column_type("datetime(6)")) == "DATETIME(fsp=6)"
+    assert repr(parse_column_type("enum('a','b''c')")) == "ENUM('a', \"b'c\")"
+    assert str(parse_column_type("geometry")) == "NULL"
+
+
+class Connection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def exec_driver_sql(self, statement, params):
+        self.queries += 1
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_catalog_reflects_each_table_once():
+    connection = Connection([("users", "id", "bigint", "NO"), ("users", "name", "varchar(50)", "YES")])
+    catalog = TableCatalog()
+
+    def connect():
+        return contextlib.nullcontext(connection)
+
+    columns = catalog.get_columns(connect, None, "users")
+    assert list(columns) == ["id", "name"]
+    assert not columns["id"].nullable
+    assert catalog.get_columns(connect, None, "users") is columns
+    assert connection.queries == 1
+
+    catalog.set_column(None, "users", CatalogColumn("age", parse_column_type("int")))
+    assert "age" in catalog.get_columns(connect, None, "users")
+
+    connection.rows = []
+    assert catalog.get_columns(connect, None, "orders") is None
+    catalog.set_table(None, "orders", [CatalogColumn("id", parse_column_type("int"))])
+    assert list(catalog.get_columns(connect, None, "orders")) == ["id"]
+    assert connection.queries == 2
+
+    catalog.forget(None, "orders")
+    assert catalog.get_columns(connect, None, "orders") is None
+    assert connection.queries == 3
+
+
+def test_catalog_reflects_tables_concurrently():
+    catalog = TableCatalog()
+    orders_reflected = threading.Event()
+
+    class BlockingConnection(Connection):
+        def exec_driver_sql(self, statement, params):
+            if params[1] == "users":
+                # Holds the users query open until orders is reflected beside it.
+                assert orders_reflected.wait(timeout=5)
+            else:
+                orders_reflected.set()
+            return super().exec_driver_sql(statement, params)
+
+    def connect():
+        return contextlib.nullcontext(BlockingConnection([("users", "id", "bigint", "NO")]))
+
+    reflected = []
+    users = threading.Thread(target=lambda: reflected.append(catalog.get_columns(connect, None, "users")))
+    users.start()
+    assert catalog.get_columns(connect, None, "orders") is None
+    users.join(timeout=5)
+    assert [list(columns) for columns in reflected] == [["id"]]
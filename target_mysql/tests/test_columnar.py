@@ -0,0 +1,102 @@
+""" Tests for the columnar LOAD DATA formatting. """
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from target_mysql import load_data
+from target_mysql.projection import RecordProjection
+
+pytest.importorskip("pyarrow")
+
+from target_mysql import columnar  # noqa: E402
+
+SQL_TYPES = [
+    mysql.BIGINT(),
+    mysql.VARCHAR(100),
+    mysql.BOOLEAN(),
+    mysql.DATETIME(),
+    mysql.DATE(),
+    mysql.JSON(),
+]
+PROJECTION = RecordProjection(
+    ["id", "name", "active", "updated_at", "day", "payload"],
+    ["id", "name", "active", "updated_at", "day", "payload"],
+    [(5, load_data._json_encoder.encode)],
+)
+
+
+def write(records, sql_types=SQL_TYPES, projection=PROJECTION):
+    buffer = io.StringIO()
+    result = columnar.write_columns(buffer, projection, sql_types, records)
+    return buffer.getvalue(), result
+
+
+def write_rows(records, projection=PROJECTION):
+    buffer = io.StringIO()
+    load_data.write_rows(buffer, map(projection.project, records))
+    return buffer.getvalue()
+
+
+def test_write_columns_matches_write_rows():
+    records = [
+        {
+            "id": 1,
+            "name": "a\tb\nc\\d\re\0",
+            "active": True,
+            "updated_at": datetime.datetime(2023, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2023, 1, 2),
+            "payload": {"a": [1, 2]},
+        },
+        {
+            "id": 2,
+            "name": None,
+            "active": False,
+            "updated_at": datetime.datetime(2023, 1, 2, 3, 4, 5, 600),
+            "payload": None,
+        },
+        {"id": None, "name": "ü", "active": None, "updated_at": None, "day": None},
+    ]
+    text, (count, vectorized) = write(records)
+    assert count == 3
+    assert vectorized == 5
+    assert text == write_rows(records)
+
+
+def test_write_columns_falls_back_per_column():
+    offset = datetime.timezone(datetime.timedelta(hours=2))
+    records = [
+        {"id": "not a number", "name": 7, "updated_at": datetime.datetime(2023, 1, 2, tzinfo=offset)},
+        {"id": 2, "name": "b", "updated_at": datetime.datetime(2023, 1, 2)},
+    ]
+    text, (count, vectorized) = write(records)
+    assert count == 2
+    # Only the all-null boolean and date columns are vectorized.
+    assert vectorized == 2
+    assert text == write_rows(records)
+    assert text.splitlines()[0].split("\t")[3] == "2023-01-02 00:00:00"
+
+
+def test_write_columns_numbers():
+    projection = RecordProjection(["amount"], ["amount"])
+    records = [{"amount": Decimal("1.5")}, {"amount": Decimal("-2.25")}, {"amount": None}]
+    text, (_, vectorized) = write(records, [mysql.FLOAT()], projection)
+    assert vectorized == 1
+    assert text == "1.5\n-2.25\n\\N\n"
+
+    text, (_, vectorized) = write(records, [mysql.DECIMAL()], projection)
+    assert vectorized == 0
+    assert text == write_rows(records, projection)
+
+
+def test_write_columns_empty_batch():
+    assert write([]) == ("", (0, 0))
+
+
+def test_check_batch_format():
+    assert columnar.check_batch_format(None) == "rows"
+    assert columnar.check_batch_format("arrow") == "arrow"
+    with pytest.raises(ValueError):
+        columnar.check_batch_format("numpy")
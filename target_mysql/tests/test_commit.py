@@ -0,0 +1,55 @@
+""" Tests for the commit policy. """
+import pytest
+
+from target_mysql.commit import CommitPolicy
+
+
+def test_batch_policy_always_due():
+    policy = CommitPolicy("batch")
+    policy.add(1)
+    assert policy.due()
+
+
+def test_rows_policy():
+    policy = CommitPolicy("rows", 100)
+    policy.add(60)
+    assert not policy.due()
+    policy.add(60)
+    assert policy.due()
+    policy.reset()
+    assert not policy.due()
+
+
+def test_bytes_policy():
+    policy = CommitPolicy("bytes", 1000)
+    assert policy.tracks_bytes
+    policy.add(1, 999)
+    assert not policy.due()
+    policy.add(1, 1)
+    assert policy.due()
+
+
+def test_seconds_policy():
+    policy = CommitPolicy("seconds", 5)
+    assert not policy.due()
+    policy.started_at -= 10
+    assert policy.due()
+
+
+def test_drain_policy_never_due():
+    policy = CommitPolicy("drain")
+    policy.add(10 ** 9, 10 ** 12)
+    assert not policy.due()
+
+
+def test_from_config_defaults():
+    policy = CommitPolicy.from_config({"commit_policy": "rows"})
+    assert policy.interval == 10000
+    assert CommitPolicy.from_config({}).policy == "batch"
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        CommitPolicy("sometimes")
+    with pytest.raises(ValueError):
+        CommitPolicy("rows", 0)
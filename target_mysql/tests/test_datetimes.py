@@ -0,0 +1,73 @@
+""" Tests for the date-like string conversion. """
+import logging
+from types import SimpleNamespace
+
+import pytest
+from singer_sdk.helpers._typing import DatetimeErrorTreatmentEnum
+
+from target_mysql.datetimes import DatetimeConverter, get_time_zone
+from target_mysql.sinks import MySQLSink
+
+
+def test_datetime_literals_keep_wall_time_without_zone():
+    converter = DatetimeConverter()
+    assert converter.to_literal("date-time", "2023-01-02T03:04:05Z") == "2023-01-02 03:04:05"
+    assert converter.to_literal("date-time", "2023-01-02T03:04:05.25+02:00") == (
+        "2023-01-02 03:04:05.250000"
+    )
+    assert converter.to_literal("date-time", "2023-01-02") == "2023-01-02 00:00:00"
+
+
+def test_datetime_literals_convert_to_zone():
+    converter = DatetimeConverter(get_time_zone("UTC"))
+    assert converter.to_literal("date-time", "2023-01-02T03:04:05+02:00") == "2023-01-02 01:04:05"
+    # Naive values are taken to be in the zone already.
+    assert converter.to_literal("date-time", "2023-01-02T03:04:05") == "2023-01-02 03:04:05"
+
+    berlin = DatetimeConverter(get_time_zone("Europe/Berlin"))
+    assert berlin.to_literal("date-time", "2023-07-01T12:00:00Z") == "2023-07-01 14:00:00"
+
+
+def test_date_and_time_literals():
+    converter = DatetimeConverter(get_time_zone("UTC"))
+    assert converter.to_literal("date", "2023-01-02") == "2023-01-02"
+    assert converter.to_literal("date", "2023-01-02T23:00:00-05:00") == "2023-01-02"
+    assert converter.to_literal("time", "12:34:56") == "12:34:56"
+    assert converter.to_literal("time", "12:34:56.5+01:00") == "12:34:56.500000"
+
+
+def test_literals_are_cached():
+    converter = DatetimeConverter(cache_size=2)
+    for value in ("2023-01-01T00:00:00Z", "2023-01-01T00:00:00Z", "2023-01-02T00:00:00Z"):
+        converter.to_literal("date-time", value)
+    info = converter.cache_info()["date-time"]
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    uncached = DatetimeConverter(cache_size=0)
+    uncached.to_literal("date-time", "2023-01-01T00:00:00Z")
+    assert uncached.cache_info()["date-time"].currsize == 0
+
+
+def test_unknown_time_zone():
+    assert get_time_zone(None) is None
+    with pytest.raises(ValueError):
+        get_time_zone("Mars/Olympus_Mons")
+
+
+def test_sink_parses_only_datelike_properties():
+    sink = SimpleNamespace(
+        datelike_properties={"updated_at": "date-time", "day": "date"},
+        datetime_converter=DatetimeConverter(),
+        logger=logging.getLogger("test"),
+    )
+    record = {"id": "2023-01-01", "updated_at": "Jan 2 2023 10:00", "day": None}
+    MySQLSink._parse_timestamps_in_record(sink, record, {}, DatetimeErrorTreatmentEnum.ERROR)
+    assert record == {"id": "2023-01-01", "updated_at": "2023-01-02 10:00:00", "day": None}
+
+    record = {"updated_at": "not a date"}
+    MySQLSink._parse_timestamps_in_record(sink, record, {}, DatetimeErrorTreatmentEnum.NULL)
+    assert record == {"updated_at": None}
+    with pytest.raises(ValueError):
+        MySQLSink._parse_timestamps_in_record(
+            sink, {"updated_at": "not a date"}, {}, DatetimeErrorTreatmentEnum.ERROR
+        )
@@ -0,0 +1,28 @@
+""" Tests for consolidated ALTER TABLE statements. """
+from sqlalchemy.dialects import mysql
+
+from target_mysql.ddl import ColumnChange, alter_table_options, build_alter_statement
+
+
+def test_alter_table_options_fall_back():
+    assert alter_table_options() == [""]
+    assert alter_table_options("instant", "none") == [
+        ", ALGORITHM=INSTANT",
+        ", ALGORITHM=INPLACE, LOCK=NONE",
+        "",
+    ]
+    assert alter_table_options("INPLACE") == [", ALGORITHM=INPLACE", ""]
+    assert alter_table_options(lock="SHARED") == [", LOCK=SHARED", ""]
+
+
+def test_build_alter_statement():
+    changes = [
+        ColumnChange("ADD", "age", mysql.BIGINT()),
+        ColumnChange("MODIFY", "name", mysql.VARCHAR(500), mysql.VARCHAR(50)),
+    ]
+    assert build_alter_statement("db.users", changes, ", ALGORITHM=INSTANT") == (
+        "ALTER TABLE db.users\n"
+        "    ADD COLUMN age BIGINT,\n"
+        "    MODIFY name VARCHAR(500), ALGORITHM=INSTANT"
+    )
+    assert changes[1].describe() == "convert 'name' from 'VARCHAR(50)' to 'VARCHAR(500)'"
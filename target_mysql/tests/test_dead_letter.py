@@ -0,0 +1,57 @@
+""" Tests for dead-letter destinations. """
+import contextlib
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+
+from target_mysql.dead_letter import DeadLetterFile, DeadLetterTable, RejectedRow, get_dead_letter_queue
+
+
+def test_dead_letter_file_appends_json_lines(tmp_path):
+    queue = DeadLetterFile(str(tmp_path / "rejected"))
+    queue.write("users", [RejectedRow({"id": 1, "amount": Decimal("1.5")}, "too long")])
+    queue.write("users", [RejectedRow({"id": 2, "amount": None}, "null")])
+
+    lines = (tmp_path / "rejected" / "users.jsonl").read_text().splitlines()
+    assert [json.loads(line)["record"] for line in lines] == [
+        {"id": 1, "amount": "1.5"},
+        {"id": 2, "amount": None},
+    ]
+    assert json.loads(lines[0])["error"] == "too long"
+
+
+def test_get_dead_letter_queue(tmp_path):
+    assert get_dead_letter_queue({}, None) is None
+    assert isinstance(get_dead_letter_queue({"dead_letter_path": str(tmp_path)}, None), DeadLetterFile)
+    queue = get_dead_letter_queue({"dead_letter_path": str(tmp_path), "dead_letter_table": "rejected"}, None)
+    assert queue.describe("users") == "table 'rejected'"
+
+
+class Connection:
+    def __init__(self):
+        self.executed = []
+
+    def exec_driver_sql(self, statement, params=None):
+        self.executed.append((statement.split(" (")[0], params))
+
+    def begin(self):
+        return contextlib.nullcontext()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_dead_letter_table_inserts_on_the_given_connection():
+    own = Connection()
+    queue = DeadLetterTable(SimpleNamespace(_connect=lambda: own), "rejected")
+    queue.prepare()
+    queue.prepare()
+    assert own.executed == [("CREATE TABLE IF NOT EXISTS rejected", None)]
+
+    loading = Connection()
+    queue.write("users", [RejectedRow({"id": 1}, "null")], loading)
+    assert loading.executed == [("INSERT INTO rejected", [("users", "null", '{"id": 1}')])]
+    assert len(own.executed) == 1
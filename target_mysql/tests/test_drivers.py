@@ -0,0 +1,50 @@
+""" Tests for the driver profiles. """
+import pytest
+
+from target_mysql.drivers import (
+    MYSQL_CONNECTOR,
+    MYSQLCLIENT,
+    PYMYSQL,
+    describe_driver_path,
+    get_driver_profile,
+)
+from target_mysql.sinks import MySQLConnector
+
+CONFIG = {"host": "db", "port": 3306, "username": "loader", "password": "secret", "database": "warehouse"}
+INSERT_SQL = "INSERT INTO warehouse.users (id, name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE name=VALUES(name)"
+
+
+@pytest.mark.parametrize(
+    "driver_name, drivername",
+    [(None, "mysql"), ("mysql+pymysql", "mysql+pymysql"), ("mysql+mysqlconnector", "mysql+mysqlconnector")],
+)
+def test_url_uses_driver_name(driver_name, drivername):
+    url = MySQLConnector.get_sqlalchemy_url(MySQLConnector, {**CONFIG, "driver_name": driver_name})
+    assert url.drivername == drivername
+    assert (url.username, url.host, url.database) == ("loader", "db", "warehouse")
+
+
+def test_url_accepts_user():
+    config = {key: value for key, value in CONFIG.items() if key != "username"}
+    url = MySQLConnector.get_sqlalchemy_url(MySQLConnector, {**config, "user": "legacy"})
+    assert url.username == "legacy"
+
+
+def test_driver_profiles():
+    assert get_driver_profile("mysql") is MYSQLCLIENT
+    assert get_driver_profile("mysql+mysqldb") is MYSQLCLIENT
+    assert get_driver_profile("mysql+pymysql") is PYMYSQL
+    assert get_driver_profile("mysql+mysqlconnector") is MYSQL_CONNECTOR
+    assert MYSQL_CONNECTOR.local_infile_args == {"allow_local_infile": True}
+
+    other = get_driver_profile("mysql+asyncmy")
+    assert other.local_infile_args == MYSQLCLIENT.local_infile_args
+    assert other.rewrites_executemany(INSERT_SQL) is None
+    assert "generic" in describe_driver_path(other)
+
+
+@pytest.mark.parametrize("profile, module", [(PYMYSQL, "pymysql"), (MYSQL_CONNECTOR, "mysql.connector")])
+def test_rewrites_executemany(profile, module):
+    pytest.importorskip(module)
+    assert profile.rewrites_executemany(INSERT_SQL) is True
+    assert profile.rewrites_executemany("UPDATE warehouse.users SET name = %s") is False
@@ -0,0 +1,64 @@
+""" Tests for the JSON engines. """
+from decimal import Decimal
+
+import pytest
+
+from target_mysql import json_engine
+from target_mysql.json_engine import JsonEngine, get_json_engine
+
+orjson_only = pytest.mark.skipif(json_engine.orjson is None, reason="orjson is not installed")
+
+
+def engines():
+    yield JsonEngine()
+    if json_engine.orjson is not None:
+        yield json_engine.OrjsonEngine()
+
+
+@pytest.mark.parametrize("engine", list(engines()), ids=lambda engine: engine.name)
+def test_loads_keeps_decimals_exact(engine):
+    message = engine.loads('{"type": "RECORD", "record": {"id": 1, "amount": 0.1000000000000000055511}}')
+    assert message["record"]["id"] == 1
+    assert message["record"]["amount"] == Decimal("0.1000000000000000055511")
+
+
+@pytest.mark.parametrize("engine", list(engines()), ids=lambda engine: engine.name)
+def test_encode_json(engine):
+    encoded = engine.encode_json({"a": Decimal("1.10"), "b": [1, "x"]})
+    assert engine.loads(encoded) == {"a": "1.10", "b": [1, "x"]}
+    assert engine.encode_json("text") == "text"
+
+
+def test_get_json_engine():
+    assert get_json_engine("stdlib").name == "stdlib"
+    assert get_json_engine(None).name == ("orjson" if json_engine.orjson else "stdlib")
+    with pytest.raises(ValueError):
+        get_json_engine("ujson")
+
+
+@orjson_only
+def test_orjson_falls_back_for_floats(monkeypatch):
+    engine = json_engine.OrjsonEngine()
+    assert engine.loads('{"a": [1, {"b": 2}]}') == {"a": [1, {"b": 2}]}
+    assert engine.loads('{"a": [1, {"b": 2.5}]}') == {"a": [1, {"b": Decimal("2.5")}]}
+
+
+@pytest.mark.parametrize("engine", list(engines()), ids=lambda engine: engine.name)
+def test_loads_keeps_wide_integers_exact(engine):
+    message = engine.loads('{"id": 123456789012345678901234567890, "n": -9223372036854775809}')
+    assert message == {"id": 123456789012345678901234567890, "n": -9223372036854775809}
+
+
+@pytest.mark.parametrize("engine", list(engines()), ids=lambda engine: engine.name)
+def test_encode_json_keeps_wide_integers(engine):
+    value = {"x": 123456789012345678901234567890, "y": [Decimal("1.5"), -9223372036854775809]}
+    encoded = engine.encode_json(value)
+    assert engine.loads(encoded) == {"x": 123456789012345678901234567890, "y": ["1.5", -9223372036854775809]}
+
+
+@pytest.mark.parametrize("engine", list(engines()), ids=lambda engine: engine.name)
+def test_loads_accepts_nan_and_infinity(engine):
+    message = engine.loads('{"a": NaN, "b": Infinity, "c": 1}')
+    assert message["a"] != message["a"]
+    assert message["b"] == float("inf")
+    assert message["c"] == 1
@@ -0,0 +1,43 @@
+""" Tests for the LOAD DATA file format. """
+import datetime
+import io
+from decimal import Decimal
+
+from target_mysql import load_data
+
+
+def test_format_field_escapes_special_characters():
+    assert load_data.format_field("a\tb\nc\\d\re\0") == "a\\tb\\nc\\\\d\\re\\0"
+
+
+def test_format_field_types():
+    assert load_data.format_field(None) == "\\N"
+    assert load_data.format_field(True) == "1"
+    assert load_data.format_field(False) == "0"
+    assert load_data.format_field(12) == "12"
+    assert load_data.format_field(Decimal("1E+2")) == "100"
+    assert load_data.format_field(Decimal("0.000001")) == "0.000001"
+    assert load_data.format_field(
+        datetime.datetime(2023, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    ) == "2023-01-02 03:04:05"
+    assert load_data.format_field(datetime.date(2023, 1, 2)) == "2023-01-02"
+    assert load_data.format_field({"a": Decimal("1.10"), "b": "x\ty"}) == (
+        '{"a": "1.10", "b": "x\\\\ty"}'
+    )
+
+
+def test_write_rows():
+    buffer = io.StringIO()
+    count = load_data.write_rows(buffer, [(1, "a"), (None, "b\nc")])
+    assert count == 2
+    assert buffer.getvalue() == "1\ta\n\\N\tb\\nc\n"
+
+
+def test_build_load_data_statement():
+    statement = load_data.build_load_data_statement(
+        "/tmp/batch.tsv", "test.users", ["id", "name"], "replace"
+    )
+    assert statement.startswith(
+        "LOAD DATA LOCAL INFILE '/tmp/batch.tsv' REPLACE INTO TABLE test.users"
+    )
+    assert statement.endswith("(id, name)")
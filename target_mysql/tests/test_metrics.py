@@ -0,0 +1,48 @@
+""" Tests for per-stream metrics. """
+import json
+import logging
+
+from target_mysql.metrics import StreamMetrics, format_prometheus, write_prometheus
+
+
+def test_stream_metrics_points(caplog):
+    metrics = StreamMetrics("users")
+    metrics.add_batch(1)
+    metrics.add_batch(500)
+    metrics.add_rows(501, 12000)
+    metrics.add_retry()
+    assert list(metrics.time_iterator("serialize", [1, 2])) == [1, 2]
+    with metrics.timed("commit"):
+        pass
+
+    points = {point["metric"]: point for point in metrics.points()}
+    assert points["rows_loaded"]["value"] == 501
+    assert points["bytes_loaded"]["tags"] == {"stream": "users"}
+    assert points["retry_count"]["value"] == 1
+    assert points["serialize_duration"]["type"] == "timer"
+    assert points["batch_size"]["value"]["count"] == 2
+    assert points["batch_size"]["value"]["buckets"]["1"] == 1
+    assert points["batch_size"]["value"]["buckets"]["1000"] == 1
+
+    with caplog.at_level(logging.INFO):
+        metrics.log(logging.getLogger("test"))
+    line = caplog.records[0].getMessage()
+    assert line.startswith("METRIC: ")
+    assert json.loads(line[len("METRIC: "):])["metric"] == "rows_loaded"
+
+
+def test_prometheus_textfile(tmp_path):
+    metrics = StreamMetrics('say "hi"')
+    metrics.add_batch(50)
+    metrics.add_rows(50)
+    text = format_prometheus([metrics])
+    assert '# TYPE target_mysql_batch_size histogram' in text
+    assert 'target_mysql_rows_loaded_total{stream="say \\"hi\\""} 50' in text
+    assert 'target_mysql_batch_size_bucket{stream="say \\"hi\\"",le="10"} 0' in text
+    assert 'target_mysql_batch_size_bucket{stream="say \\"hi\\"",le="+Inf"} 1' in text
+    assert 'target_mysql_stage_seconds_total{stream="say \\"hi\\"",stage="execute"} 0.0' in text
+
+    path = tmp_path / "target_mysql.prom"
+    write_prometheus(str(path), [metrics])
+    assert path.read_text() == text
+    assert [p.name for p in tmp_path.iterdir()] == ["target_mysql.prom"]
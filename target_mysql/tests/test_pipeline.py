@@ -0,0 +1,39 @@
+""" Tests for the batch prefetch pipeline. """
+import threading
+
+import pytest
+
+from target_mysql.pipeline import prefetch
+
+
+def test_prefetch_keeps_order():
+    assert list(prefetch(iter(range(100)), 2)) == list(range(100))
+    assert list(prefetch(iter(range(5)), 0)) == list(range(5))
+
+
+def test_prefetch_reraises_producer_errors():
+    def items():
+        yield 1
+        raise ValueError("bad record")
+
+    consumed = []
+    with pytest.raises(ValueError, match="bad record"):
+        for item in prefetch(items(), 2):
+            consumed.append(item)
+    assert consumed == [1]
+
+
+def test_prefetch_stops_producer_when_consumer_stops():
+    produced = []
+
+    def items():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    iterator = prefetch(items(), 2)
+    assert next(iterator) == 0
+    iterator.close()
+
+    assert len(produced) <= 4
+    assert not any(thread.name == "batch-prefetch" for thread in threading.enumerate())
@@ -0,0 +1,44 @@
+""" Tests for sampled drain profiling. """
+import os
+import pstats
+
+from target_mysql.profiling import DrainProfiler, get_drain_profiler
+
+
+def drain():
+    return [str(i) * 10 for i in range(1000)]
+
+
+def test_profiler_writes_a_file_every_n_drains(tmp_path):
+    profiler = DrainProfiler(str(tmp_path), "public-users", "both", batches_per_file=2, sample_rate=1)
+    for _ in range(3):
+        with profiler.profile():
+            drain()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"public-users-{os.getpid()}-0000.prof",
+        f"public-users-{os.getpid()}-0000.tracemalloc.txt",
+    ]
+
+    profiler.flush()
+    assert profiler.files_written == 2
+    prof = next(tmp_path.glob("*-0001.prof"))
+    assert "drain" in {key[2] for key in pstats.Stats(str(prof)).stats}
+    report = next(tmp_path.glob("*-0000.tracemalloc.txt")).read_text()
+    assert report.count("Drain ") == 2
+    assert "peak traced memory" in report
+
+
+def test_unsampled_drains_are_not_profiled(tmp_path):
+    profiler = DrainProfiler(str(tmp_path), "users", batches_per_file=1, sample_rate=0)
+    with profiler.profile():
+        drain()
+    profiler.flush()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_drain_profiler(tmp_path):
+    config = {"profile_path": str(tmp_path), "profile_streams": ["users"]}
+    assert get_drain_profiler(config, "users").sample_rate == 0.1
+    assert get_drain_profiler(config, "orders") is None
+    assert get_drain_profiler({**config, "profile_streams": ["*"]}, "orders") is not None
+    assert get_drain_profiler({"profile_streams": ["*"]}, "users") is None
@@ -0,0 +1,78 @@
+""" Tests for the compiled record projection. """
+from decimal import Decimal
+
+import pytest
+
+from target_mysql.json_engine import get_json_engine
+from target_mysql.projection import InsertPlan, RecordProjection
+
+encode_json = get_json_engine("stdlib").encode_json
+
+
+def test_project_orders_and_encodes_values():
+    projection = RecordProjection(
+        ["userId", "payload", "name"],
+        ["user_id", "payload", "name"],
+        converters=[(1, encode_json)],
+        key_positions=[0],
+    )
+
+    row = projection.project({"name": "a", "userId": 1, "payload": {"x": Decimal("1.10")}})
+
+    assert row == (1, '{"x": "1.10"}', "a")
+    assert projection.key_values(row) == {"user_id": 1}
+
+
+def test_project_missing_properties_are_null():
+    projection = RecordProjection(["a", "b"], ["a", "b"])
+
+    assert projection.project_all([{"a": 1}, {}]) == [(1, None), (None, None)]
+
+
+def test_project_reports_column_on_json_error():
+    projection = RecordProjection(["data"], ["data"], converters=[(0, encode_json)])
+
+    with pytest.raises(TypeError, match="column data"):
+        projection.project({"data": {"x": object()}})
+
+
+def test_insert_plan_matches_equal_schemas():
+    schema = {"properties": {"a": {"type": "integer"}}}
+    plan = InsertPlan(
+        schema=schema,
+        fingerprint='{"properties": {"a": {"type": "integer"}}}',
+        columns=[],
+        projection=RecordProjection(["a"], ["a"]),
+        insert_sql="",
+        upsert_clause="",
+    )
+
+    assert plan.matches(schema)
+    assert plan.matches({"properties": {"a": {"type": "integer"}}})
+    assert not plan.matches({"properties": {"a": {"type": "string"}}})
+
+
+def test_deduplicate_keeps_last_record_of_each_key():
+    projection = RecordProjection(["id", "name"], ["id", "name"], key_positions=[0])
+    records = [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+        {"id": 1, "name": "c"},
+        {"id": 3, "name": "d"},
+    ]
+
+    assert projection.deduplicate(records) == [
+        {"id": 2, "name": "b"},
+        {"id": 1, "name": "c"},
+        {"id": 3, "name": "d"},
+    ]
+
+
+def test_deduplicate_composite_and_unhashable_keys():
+    projection = RecordProjection(["a", "b"], ["a", "b"], key_positions=[0, 1])
+    records = [{"a": 1, "b": 1}, {"a": 1, "b": 2}, {"a": 1, "b": 1}]
+    assert projection.deduplicate(records) == [{"a": 1, "b": 2}, {"a": 1, "b": 1}]
+
+    unhashable = [{"a": [1], "b": 1}, {"a": [1], "b": 1}]
+    assert projection.deduplicate(unhashable) == unhashable
+    assert RecordProjection(["a"], ["a"]).deduplicate(records) == records
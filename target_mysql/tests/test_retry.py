@@ -0,0 +1,59 @@
+""" Tests for error classification and retries. """
+import pytest
+import sqlalchemy
+
+from target_mysql.retry import RetryPolicy, is_row_error, is_transient
+
+
+class DriverError(Exception):
+    pass
+
+
+def dbapi_error(code, error_class=sqlalchemy.exc.OperationalError):
+    return error_class("INSERT", (), DriverError(code, "message"))
+
+
+def test_classification():
+    assert is_transient(dbapi_error(1213))
+    assert is_transient(dbapi_error(2006))
+    assert not is_transient(dbapi_error(1406))
+    assert is_row_error(dbapi_error(1406, sqlalchemy.exc.DataError))
+    assert not is_row_error(dbapi_error(1213))
+    assert not is_row_error(dbapi_error(1054, sqlalchemy.exc.ProgrammingError))
+    assert is_row_error(dbapi_error(1062, sqlalchemy.exc.IntegrityError))
+    assert is_row_error(dbapi_error(1366, sqlalchemy.exc.InternalError))
+    # Unknown column, denied command, read-only server: every row fails alike.
+    assert not is_row_error(dbapi_error(1054))
+    assert not is_row_error(dbapi_error(1142))
+    assert not is_row_error(dbapi_error(1290))
+    assert not is_row_error(ValueError())
+
+
+def test_delay_grows_exponentially_with_jitter():
+    policy = RetryPolicy(backoff_seconds=1.0, max_backoff_seconds=5.0)
+    assert 0.5 <= policy.delay(1) <= 1.0
+    assert 2.0 <= policy.delay(3) <= 4.0
+    assert 2.5 <= policy.delay(10) <= 5.0
+
+
+def test_call_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    failures = [dbapi_error(1205), dbapi_error(2013)]
+    retries = []
+
+    def operation():
+        if failures:
+            raise failures.pop(0)
+        return "done"
+
+    policy = RetryPolicy(max_retries=2)
+    assert policy.call(operation, lambda e, attempt, delay: retries.append(attempt)) == "done"
+    assert retries == [1, 2]
+
+    failures.extend([dbapi_error(1205)] * 3)
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        policy.call(operation)
+
+    failures[:] = [dbapi_error(1406, sqlalchemy.exc.DataError)]
+    with pytest.raises(sqlalchemy.exc.DataError):
+        policy.call(operation)
@@ -0,0 +1,113 @@
+""" Tests for the session profiles. """
+import pytest
+
+from target_mysql.session import SPECIFIC_ACCESS_DENIED_ERROR, get_session_profile
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, statement):
+        self.connection.executed.append(statement)
+        if self.connection.failures:
+            raise self.connection.failures.pop(0)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, *failures):
+        self.executed = []
+        self.failures = list(failures)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakeRecord:
+    def __init__(self):
+        self.info = {}
+
+
+def test_default_profile_sets_nothing():
+    profile = get_session_profile({"session_lock_wait_timeout": 5})
+    assert profile.set_statement is None
+
+    connection = FakeConnection()
+    profile.on_checkout(connection, FakeRecord(), None)
+    assert connection.executed == []
+
+
+def test_bulk_load_profile():
+    profile = get_session_profile({"session_profile": "bulk_load"})
+    assert profile.set_statement == (
+        "SET SESSION unique_checks = 0, foreign_key_checks = 0, "
+        "transaction_isolation = 'READ-COMMITTED', innodb_lock_wait_timeout = 120"
+    )
+
+
+def test_settings_override_the_profile():
+    profile = get_session_profile({
+        "session_profile": "bulk_load",
+        "session_isolation_level": "REPEATABLE-READ",
+        "session_lock_wait_timeout": 300,
+        "session_disable_binlog": True,
+        "session_variables": {"foreign_key_checks": 1, "sql_mode": "NO_ENGINE_SUBSTITUTION"},
+    })
+    assert profile.variables == {
+        "unique_checks": 0,
+        "foreign_key_checks": 1,
+        "transaction_isolation": "REPEATABLE-READ",
+        "innodb_lock_wait_timeout": 300,
+        "sql_log_bin": 0,
+        "sql_mode": "NO_ENGINE_SUBSTITUTION",
+    }
+
+    custom = get_session_profile({"session_profile": "custom", "session_variables": {"sql_mode": "it's"}})
+    assert custom.set_statement == "SET SESSION sql_mode = 'it\\'s'"
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"session_profile": "fast"},
+        {"session_profile": "custom", "session_isolation_level": "READ COMMITTED"},
+        {"session_profile": "custom", "session_variables": {"sql_mode = ''; DROP TABLE users; --": 1}},
+    ],
+)
+def test_invalid_settings(config):
+    with pytest.raises(ValueError):
+        get_session_profile(config)
+
+
+def test_set_once_per_connection():
+    profile = get_session_profile({"session_profile": "bulk_load"})
+    connection, record = FakeConnection(), FakeRecord()
+    profile.on_checkout(connection, record, None)
+    profile.on_checkout(connection, record, None)
+    assert connection.executed == [profile.set_statement]
+
+    # The pool clears the record's info when it replaces the connection.
+    record.info.clear()
+    profile.on_checkout(connection, record, None)
+    assert len(connection.executed) == 2
+
+
+def test_sql_log_bin_dropped_without_privilege():
+    profile = get_session_profile({"session_profile": "bulk_load", "session_disable_binlog": True})
+    denied = Exception(SPECIFIC_ACCESS_DENIED_ERROR, "Access denied; you need the SUPER privilege")
+    connection, record = FakeConnection(denied), FakeRecord()
+    profile.on_checkout(connection, record, None)
+
+    assert "sql_log_bin" in connection.executed[0]
+    assert "sql_log_bin" not in connection.executed[1]
+    assert record.info["session_profile"] == connection.executed[1]
+    assert "sql_log_bin" not in profile.variables
+
+
+def test_other_errors_are_raised():
+    profile = get_session_profile({"session_profile": "custom", "session_variables": {"no_such_variable": 1}})
+    with pytest.raises(Exception, match="Unknown system variable"):
+        profile.apply(FakeConnection(Exception(1193, "Unknown system variable 'no_such_variable'")))
@@ -0,0 +1,185 @@
+""" Tests for MySQLSink helpers that don't need a database. """
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy
+
+from target_mysql.sinks import MySQLConnector, MySQLSink, literal_size
+
+
+def test_literal_size_counts_escapes():
+    assert literal_size(None) == 4
+    assert literal_size("abc") == 5
+    assert literal_size("a'b\\c") == 9
+    assert literal_size("é") == 4
+    assert literal_size(12345) == 7
+
+
+def test_multi_row_insert_statements_respect_size_limit():
+    sink = SimpleNamespace(generate_upsert_clause=lambda column_names: " ON DUPLICATE KEY UPDATE id=VALUES(id)")
+    rows = [[i, "x" * 50] for i in range(100)]
+
+    statements = list(
+        MySQLSink.generate_multi_row_insert_statements(sink, "test.t", ["id", "name"], rows, 1000)
+    )
+
+    assert sum(batch.row_count for batch in statements) == 100
+    assert len(statements) > 1
+    assert statements[-1].last_row == [99, "x" * 50]
+    for statement, params, count, byte_count, _ in statements:
+        assert statement.startswith("INSERT INTO test.t (id, name) VALUES (%s, %s), ")
+        assert statement.endswith(" ON DUPLICATE KEY UPDATE id=VALUES(id)")
+        assert statement.count("(%s, %s)") == count
+        assert len(params) == 2 * count
+        assert len(statement) + sum(literal_size(value) for value in params) <= 1000
+        assert byte_count <= 1000
+
+
+def test_multi_row_insert_statements_oversized_row():
+    sink = SimpleNamespace(generate_upsert_clause=lambda column_names: "")
+    rows = [[1, "x" * 500], [2, "y"]]
+
+    statements = list(
+        MySQLSink.generate_multi_row_insert_statements(sink, "t", ["id", "name"], rows, 100)
+    )
+
+    assert [batch.row_count for batch in statements] == [1, 1]
+
+
+def test_table_lock_is_shared_per_table():
+    first = MySQLConnector.table_lock(MySQLConnector, "test.Users")
+    assert MySQLConnector.table_lock(MySQLConnector, "test.users") is first
+    assert MySQLConnector.table_lock(MySQLConnector, "test.orders") is not first
+
+
+def test_primary_key_types_fit_in_index_key():
+    connector = MySQLConnector(config={"create_primary_keys": True})
+    properties = {
+        "id": {"type": "integer"},
+        "region": {"type": "string"},
+        "code": {"type": "string", "maxLength": 20},
+    }
+
+    key_types = connector.get_primary_key_types("t", properties, ["region", "id", "code"])
+
+    assert str(key_types["id"]) == "BIGINT"
+    assert str(key_types["code"]) == "VARCHAR(20)"
+    assert str(key_types["region"]) == "VARCHAR(383)"
+    assert connector.get_primary_key_types("t", {"doc": {"type": "object"}}, ["doc"]) == {}
+
+
+def test_upsert_clause_updates_non_key_columns():
+    sink = SimpleNamespace(key_properties=["id"], conform_name=lambda name, object_type: name)
+
+    assert MySQLSink.generate_upsert_clause(sink, ["id", "name", "age"]) == (
+        " ON DUPLICATE KEY UPDATE name=VALUES(name), age=VALUES(age)"
+    )
+    assert MySQLSink.generate_upsert_clause(sink, ["id"]) == " ON DUPLICATE KEY UPDATE id=VALUES(id)"
+
+
+def test_insert_bisected_isolates_failing_rows():
+    class DriverError(Exception):
+        pass
+
+    class Connection:
+        def __init__(self):
+            self.inserted = []
+            self.statements = 0
+
+        def begin_nested(self):
+            return SimpleNamespace(commit=lambda: None, rollback=lambda: None)
+
+        def exec_driver_sql(self, statement, rows):
+            self.statements += 1
+            if any(row[1] is None for row in rows):
+                raise sqlalchemy.exc.IntegrityError(statement, rows, DriverError(1048, "null"))
+            self.inserted.extend(rows)
+
+    plan = SimpleNamespace(insert_sql="INSERT", column_names=("id", "name"))
+    rows = [(i, None if i in (3, 12) else "x") for i in range(16)]
+    connection = Connection()
+
+    accepted, rejected = MySQLSink.insert_bisected(None, connection, plan, rows)
+
+    assert [row[0] for row in accepted] == [i for i in range(16) if i not in (3, 12)]
+    assert connection.inserted == accepted
+    assert [row.record for row in rejected] == [{"id": 3, "name": None}, {"id": 12, "name": None}]
+    assert rejected[0].error == "(1048, 'null')"
+
+
+def test_merge_stages_synchronously_with_async_writer():
+    from target_mysql.target import TargetMySQL
+    from target_mysql.tests.test_async_writer import FakePool, make_writer
+
+    target = TargetMySQL(config={
+        "host": "db", "port": "3306", "username": "u", "password": "p", "database": "w",
+        "upsert_method": "merge", "pipeline_depth": 0,
+    })
+    schema = {"type": "object", "properties": {"id": {"type": "integer"}, "name": {"type": ["string", "null"]}}}
+    sink = MySQLSink(target, "users", schema, ["id"])
+    pool = FakePool()
+    sink.async_writer = make_writer(pool)
+    events = []
+    sink.connector.has_unique_key = lambda table: True
+    sink.connector.create_staging_table = lambda table: f"{table}__staging"
+    sink.connector.drop_table = lambda table: events.append(("drop", table))
+    sink.merge_upsert_from_table = lambda from_table, to_table, columns: events.append(("merge", from_table))
+
+    def execute_statements(table, statements, *args, **kwargs):
+        rows = sum(batch.row_count for batch in statements)
+        events.append(("insert", table, rows))
+        return rows
+
+    sink.execute_statements = execute_statements
+    try:
+        sink.write_records([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    finally:
+        sink.async_writer.close()
+
+    staging = f"{sink.full_table_name}__staging"
+    assert events == [("insert", staging, 2), ("merge", staging), ("drop", staging)]
+    assert pool.executed == []
+
+
+def test_insert_bisected_raises_errors_of_every_row():
+    class DriverError(Exception):
+        pass
+
+    class Connection:
+        statements = 0
+
+        def begin_nested(self):
+            return SimpleNamespace(commit=lambda: None, rollback=lambda: None)
+
+        def exec_driver_sql(self, statement, rows):
+            self.statements += 1
+            raise sqlalchemy.exc.OperationalError(statement, rows, DriverError(1142, "INSERT command denied"))
+
+    plan = SimpleNamespace(insert_sql="INSERT", column_names=("id",))
+    connection = Connection()
+
+    with pytest.raises(sqlalchemy.exc.OperationalError):
+        MySQLSink.insert_bisected(None, connection, plan, [(i,) for i in range(8)])
+    assert connection.statements == 1
+
+
+def test_merge_falls_back_to_direct_without_a_key():
+    from target_mysql.target import TargetMySQL
+
+    target = TargetMySQL(config={
+        "host": "db", "port": "3306", "username": "u", "password": "p", "database": "w",
+        "upsert_method": "merge",
+    })
+    schema = {"type": "object", "properties": {"id": {"type": "integer"}}}
+    sink = MySQLSink(target, "users", schema, ["id"])
+    lookups = []
+    sink.connector.has_unique_key = lambda table: lookups.append(table) or False
+    sink.merge_records = lambda **kwargs: pytest.fail("merged into a table without a key")
+    inserted = []
+    sink.bulk_insert_records = lambda full_table_name, schema, records: inserted.extend(records)
+
+    sink.write_records([{"id": 1}])
+    sink.write_records([{"id": 1}])
+
+    assert inserted == [{"id": 1}, {"id": 1}]
+    assert lookups == [sink.full_table_name]
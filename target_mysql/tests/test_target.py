@@ -0,0 +1,32 @@
+""" Tests for TargetMySQL message handling that don't need a database. """
+from target_mysql.target import TargetMySQL
+
+
+def test_get_null_replacements():
+    replacements = TargetMySQL.get_null_replacements(
+        {
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string"},
+                "nullable_name": {"type": ["string", "null"]},
+                "data": {"type": "object"},
+                "tags": {"type": ["array"]},
+                "active": {"type": "boolean"},
+                "untyped": {},
+            }
+        }
+    )
+
+    assert {key: factory() for key, factory in replacements.items()} == {
+        "id": 0,
+        "name": "",
+        "data": {},
+        "tags": [],
+        "active": False,
+    }
+
+
+def test_null_replacements_are_fresh_objects():
+    replacements = TargetMySQL.get_null_replacements({"properties": {"data": {"type": "object"}}})
+
+    assert replacements["data"]() is not replacements["data"]()